@@ -13,8 +13,15 @@ import yaml
 from pathlib import Path
 import sys
 
+try:
+    from scripts.atomic_write import VaultWriter
+    from scripts.frontmatter_parser import is_tag_note, read_header
+except ImportError:
+    from atomic_write import VaultWriter
+    from frontmatter_parser import is_tag_note, read_header
 
-def add_hashtag_to_tag_note(tag_note_path: Path, vault_path: Path) -> bool:
+
+def add_hashtag_to_tag_note(tag_note_path: Path, vault_path: Path, writer: VaultWriter = None) -> bool:
     """
     Add tags: field to tag note frontmatter if missing
 
@@ -61,8 +68,10 @@ def add_hashtag_to_tag_note(tag_note_path: Path, vault_path: Path) -> bool:
             f'---\n{new_frontmatter}\n---'
         )
 
-        # Write back
-        tag_note_path.write_text(new_content, encoding='utf-8')
+        # Write back (staged in the batch writer when one is given)
+        if writer is None:
+            writer = VaultWriter(vault_path, fsync="none", journal=False)
+        writer.write_text(tag_note_path, new_content)
 
         print(f"[+] {tag_note_path.name}")
         print(f"    Added: tags: [{tag_id}]")
@@ -84,12 +93,8 @@ def find_tag_notes(vault_path: Path) -> list[Path]:
             continue
 
         # Check if it's a tag note
-        try:
-            content = md_file.read_text(encoding='utf-8')
-            if 'type: tag-note' in content[:500]:
-                tag_notes.append(md_file)
-        except Exception as e:
-            pass
+        if is_tag_note(md_file):
+            tag_notes.append(md_file)
 
     return tag_notes
 
@@ -126,13 +131,14 @@ def main():
     modified = 0
     skipped = 0
 
+    writer = None if args.dry_run else VaultWriter(vault_path)
+
     for tag_note in tag_notes:
         if args.dry_run:
-            # Read to check
-            content = tag_note.read_text(encoding='utf-8')
-            match = re.match(r'^---\n(.*?)\n---', content, re.DOTALL)
-            if match:
-                fm = yaml.safe_load(match.group(1))
+            # Read the header to check
+            header = read_header(tag_note)
+            if header.valid:
+                fm = header.data
                 tag_id = fm.get('tag', '?')
                 has_tags = 'tags' in fm and fm['tags']
 
@@ -142,11 +148,14 @@ def main():
                 else:
                     skipped += 1
         else:
-            if add_hashtag_to_tag_note(tag_note, vault_path):
+            if add_hashtag_to_tag_note(tag_note, vault_path, writer):
                 modified += 1
             else:
                 skipped += 1
 
+    if writer is not None:
+        writer.commit()
+
     print(f"\n{'='*60}")
     print(f"[+] Complete")
     print(f"    Modified: {modified}")
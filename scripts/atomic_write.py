@@ -0,0 +1,427 @@
+#!/usr/bin/env python3
+"""
+Atomic Write
+Crash-safe write layer shared by every script that modifies vault files.
+
+Content is written to a hidden temp file next to the target and renamed over
+it with os.replace, so an interrupted write leaves either the old or the new
+file - never a truncated note.
+
+write_text() / write_json() cover one-off writes; atomic_open() streams a
+large file into place. VaultWriter batches bulk jobs: files are staged as temp
+files, flushed to disk with one grouped sync instead of one fsync per file,
+then renamed into place, and each batch is recorded in
+_system/write-journal.jsonl. A batch that was interrupted after
+its sync is completed by VaultWriter.recover(), which runs whenever a journaled
+VaultWriter is created. clean_temp_files() removes temp files left behind by
+killed processes.
+
+Usage:
+    python scripts/atomic_write.py --recover
+    python scripts/atomic_write.py --recover --min-age 0
+"""
+
+import json
+import os
+import re
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+FSYNC_MODES = ("none", "file", "batch")
+TEMP_FILE_RE = re.compile(r'^\..+\.(\d+)\.tmp$')
+SKIP_DIRS = {'.obsidian', '.git', '.trash'}
+
+
+def _temp_path(path: Path) -> Path:
+    return path.with_name(f".{path.name}.{os.getpid()}.tmp")
+
+
+def _replace(source: Path, target: Path, attempts: int = 5):
+    """os.replace, retried briefly on Windows sharing violations (e.g. a sync client)"""
+    for attempt in range(attempts):
+        try:
+            os.replace(source, target)
+            return
+        except PermissionError:
+            if attempt == attempts - 1:
+                raise
+            time.sleep(0.05 * (attempt + 1))
+
+
+def _fsync_path(path: Path):
+    fd = os.open(str(path), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _fsync_dir(directory: Path):
+    """Persist a rename (POSIX only; Windows cannot open directories)"""
+    if os.name == "nt":
+        return
+    try:
+        _fsync_path(directory)
+    except OSError:
+        pass
+
+
+def _stage(path: Path, content, encoding: str, fsync: bool) -> Path:
+    """Write content (str, or bytes written as-is) to the temp file for `path`"""
+    tmp = _temp_path(path)
+    binary = isinstance(content, bytes)
+    try:
+        with open(tmp, 'wb' if binary else 'w', encoding=None if binary else encoding) as f:
+            f.write(content)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+    except BaseException:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        raise
+    return tmp
+
+
+def write_text(path: Path, content: str, encoding: str = 'utf-8', fsync: bool = False):
+    """
+    Atomically replace a text file
+
+    Args:
+        path: Target file
+        content: New content
+        encoding: Text encoding
+        fsync: Also force the data and the rename to disk before returning
+    """
+    path = Path(path)
+    tmp = _stage(path, content, encoding, fsync)
+    try:
+        _replace(tmp, path)
+    except BaseException:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        raise
+    if fsync:
+        _fsync_dir(path.parent)
+
+
+def write_bytes(path: Path, data: bytes, fsync: bool = False):
+    """Atomically replace a binary file (e.g. a cache)"""
+    write_text(path, data, fsync=fsync)
+
+
+def write_json(path: Path, data, fsync: bool = False, **dump_kwargs):
+    """Atomically replace a JSON file (dump_kwargs go to json.dumps)"""
+    write_text(path, json.dumps(data, **dump_kwargs), fsync=fsync)
+
+
+@contextmanager
+def atomic_open(path: Path, binary: bool = True, encoding: str = 'utf-8'):
+    """
+    Stream a file into place: yields a handle on the temp file, which replaces
+    `path` when the block exits cleanly and is deleted otherwise
+    """
+    path = Path(path)
+    tmp = _temp_path(path)
+    try:
+        with open(tmp, 'wb' if binary else 'w', encoding=None if binary else encoding) as f:
+            yield f
+        _replace(tmp, path)
+    except BaseException:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        raise
+
+
+def clean_temp_files(root: Path, min_age: float = 600) -> List[Path]:
+    """
+    Delete hidden .<name>.<pid>.tmp files left by processes that were killed
+
+    Files of this process and files younger than `min_age` seconds (which may
+    belong to a writer that is still running) are kept.
+
+    Returns:
+        Deleted temp files
+    """
+    removed = []
+    cutoff = time.time() - min_age
+    own_pid = str(os.getpid())
+
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+        for name in filenames:
+            match = TEMP_FILE_RE.match(name)
+            if not match or match.group(1) == own_pid:
+                continue
+            path = Path(dirpath) / name
+            try:
+                if path.stat().st_mtime <= cutoff:
+                    path.unlink()
+                    removed.append(path)
+            except OSError:
+                pass
+
+    return removed
+
+
+class VaultWriter:
+    """
+    Batched atomic writes with grouped syncs and a change journal
+
+    fsync modes:
+        "batch" - stage files, sync once per commit, then rename (default)
+        "file"  - fsync and rename each file as it is written
+        "none"  - rename each file as it is written, never fsync
+
+    In "batch" mode a file keeps its old content until commit(); use
+    read_text() to see staged content. Use as a context manager to commit
+    on exit. A journaled writer first rolls forward any batch an earlier run
+    left unfinished (pass recover=False to skip).
+    """
+
+    def __init__(self, vault_path: Path = None, fsync: str = "batch", journal: bool = True,
+                 batch_size: int = 500, recover: bool = True):
+        if fsync not in FSYNC_MODES:
+            raise ValueError(f"Unknown fsync mode: {fsync} (expected one of {FSYNC_MODES})")
+
+        self.vault_path = Path(vault_path) if vault_path else None
+        self.fsync = fsync
+        self.batch_size = batch_size
+        self.journal_path = None
+        if journal and self.vault_path:
+            self.journal_path = self.vault_path / "_system" / "write-journal.jsonl"
+
+        self._staged = {}   # target -> temp file (batch mode)
+        self._written = []  # targets written directly since the last commit
+        self.files_written = 0
+        self.files_recovered = self.recover() if recover else 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # Staged files are complete new versions; keep them even if the job failed
+        self.commit()
+        return False
+
+    def write_text(self, path: Path, content: str, encoding: str = 'utf-8'):
+        path = Path(path)
+
+        if self.fsync != "batch":
+            write_text(path, content, encoding, fsync=(self.fsync == "file"))
+            self._written.append(path)
+            return
+
+        previous = self._staged.pop(path, None)
+        if previous is not None:
+            previous.unlink()
+        self._staged[path] = _stage(path, content, encoding, fsync=False)
+
+        if len(self._staged) >= self.batch_size:
+            self.commit()
+
+    def write_json(self, path: Path, data, **dump_kwargs):
+        self.write_text(path, json.dumps(data, **dump_kwargs))
+
+    def read_text(self, path: Path, encoding: str = 'utf-8') -> str:
+        """Current content of a file, including writes not yet committed"""
+        path = Path(path)
+        return self._staged.get(path, path).read_text(encoding=encoding)
+
+    def commit(self) -> int:
+        """
+        Make all staged writes durable and visible
+
+        Returns:
+            Number of files committed
+        """
+        if self._written:
+            files = self._written
+            self._written = []
+            self._journal({"event": "written", "fsync": self.fsync, "files": self._rel(files)})
+            self.files_written += len(files)
+            return len(files)
+
+        if not self._staged:
+            return 0
+
+        staged = self._staged
+        self._staged = {}
+
+        # One grouped flush instead of an fsync per file
+        if hasattr(os, "sync"):
+            os.sync()
+        else:
+            for tmp in staged.values():
+                _fsync_path(tmp)
+
+        self._journal({
+            "event": "commit",
+            "files": [{"path": str(target), "temp": str(tmp)} for target, tmp in staged.items()]
+        })
+
+        for target, tmp in staged.items():
+            _replace(tmp, target)
+        for directory in {target.parent for target in staged}:
+            _fsync_dir(directory)
+
+        self._journal({"event": "done", "count": len(staged)})
+        self.files_written += len(staged)
+        return len(staged)
+
+    def discard(self):
+        """Drop staged writes without touching their targets"""
+        for tmp in self._staged.values():
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+        self._staged = {}
+
+    def _rel(self, paths: List[Path]) -> List[str]:
+        rel = []
+        for path in paths:
+            try:
+                rel.append(path.relative_to(self.vault_path).as_posix() if self.vault_path else str(path))
+            except ValueError:
+                rel.append(str(path))
+        return rel
+
+    def _journal(self, record: Dict):
+        if self.journal_path is None:
+            return
+        record = dict(ts=datetime.now().isoformat(timespec="seconds"), **record)
+        self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.journal_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def recover(self, grace: float = 60) -> int:
+        """
+        Finish a batch that was interrupted between its sync and its renames
+
+        A staged file only replaces its target if the target has not been
+        written since; otherwise the stale temp file is deleted.
+
+        Args:
+            grace: Leave batches committed less than this many seconds ago alone
+
+        Returns:
+            Number of files rolled forward
+        """
+        if self.journal_path is None or not self.journal_path.exists():
+            return 0
+
+        unfinished = self._last_batch_record()
+        if unfinished is None or unfinished.get("event") != "commit":
+            return 0
+        try:
+            age = (datetime.now() - datetime.fromisoformat(unfinished["ts"])).total_seconds()
+        except (KeyError, TypeError, ValueError):
+            age = None
+        if age is not None and age < grace:
+            # Another writer may still be renaming this batch
+            return 0
+
+        recovered = 0
+        for entry in unfinished["files"]:
+            tmp, target = Path(entry["temp"]), Path(entry["path"])
+            try:
+                staged_at = tmp.stat().st_mtime_ns
+            except FileNotFoundError:
+                continue
+            try:
+                written_at = target.stat().st_mtime_ns
+            except FileNotFoundError:
+                written_at = None
+
+            if written_at is None or staged_at >= written_at:
+                _replace(tmp, target)
+                recovered += 1
+            else:
+                # The target was written again after this batch (unjournaled); keep it
+                try:
+                    tmp.unlink()
+                except OSError:
+                    pass
+
+        self._journal({"event": "done", "count": recovered, "recovered": True})
+        return recovered
+
+    def _last_batch_record(self, block: int = 65536):
+        """Last commit/done record, read backwards from the end of the journal"""
+        with open(self.journal_path, 'rb') as f:
+            size = f.seek(0, os.SEEK_END)
+            while True:
+                start = max(0, size - block)
+                f.seek(start)
+                lines = f.read(size - start).split(b"\n")
+                if start > 0:
+                    lines = lines[1:]  # first line may be cut
+                for line in reversed(lines):
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    if isinstance(record, dict) and record.get("event") in ("commit", "done"):
+                        return record
+                if start == 0:
+                    return None
+                block *= 4
+
+
+def recover_vault(vault_path: Path, min_age: float = 600, temp_files: bool = True) -> Dict:
+    """
+    Startup recovery for bulk jobs: roll forward an interrupted VaultWriter
+    batch and (optionally, since it walks the vault) delete stray temp files
+
+    Returns:
+        {"recovered": files rolled forward, "removed": deleted temp files}
+    """
+    vault_path = Path(vault_path)
+    recovered = VaultWriter(vault_path, recover=False).recover(grace=min_age)
+    removed = clean_temp_files(vault_path, min_age=min_age) if temp_files else []
+    return {"recovered": recovered, "removed": removed}
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Recover interrupted vault writes")
+    parser.add_argument("--vault", type=str, default="C:/obsidian-memory-vault",
+                       help="Path to vault")
+    parser.add_argument("--recover", action="store_true",
+                       help="Finish an interrupted batch and delete stray temp files")
+    parser.add_argument("--min-age", type=float, default=600,
+                       help="Leave batches and temp files younger than this many seconds alone")
+
+    args = parser.parse_args()
+    if not args.recover:
+        parser.error("nothing to do (use --recover)")
+
+    vault_path = Path(args.vault)
+    if not vault_path.exists():
+        print(f"[X] Vault not found: {vault_path}")
+        sys.exit(1)
+
+    result = recover_vault(vault_path, min_age=args.min_age)
+
+    print(f"\n[OK] Write Recovery")
+    print(f"   Files rolled forward: {result['recovered']}")
+    print(f"   Temp files removed: {len(result['removed'])}")
+    for path in result["removed"]:
+        print(f"   [-] {path}")
+    print()
+
+
+if __name__ == "__main__":
+    main()
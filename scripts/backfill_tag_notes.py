@@ -3,22 +3,113 @@ Backfill Tag Notes - Create tag notes for all existing processed conversations
 
 This script processes all conversations in 00-Inbox/processed/ and creates/updates
 tag notes retroactively, building the initial semantic memory layer.
+
+Runs are resumable: every (conversation, tag note) pair that has been written is
+recorded in _system/backfill-checkpoint.db, so an interrupted run picks up where
+it stopped and a re-run never counts a conversation twice. Conversations are
+parsed in a process pool; updates are then grouped per tag note and each tag
+note is written by exactly one worker.
 """
 
-import re
-import yaml
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Tuple
+from typing import List, Dict, Iterable, Set, Tuple
 import sys
 
 # Import our modules (try both relative and absolute)
 try:
     from scripts.tag_note_manager import TagNoteManager
     from scripts.extract_tag_knowledge import TagKnowledgeExtractor, extract_conversation_body
+    from scripts.frontmatter_parser import read_frontmatter, read_header
+    from scripts.atomic_write import recover_vault
 except ImportError:
     from tag_note_manager import TagNoteManager
     from extract_tag_knowledge import TagKnowledgeExtractor, extract_conversation_body
+    from frontmatter_parser import read_frontmatter, read_header
+    from atomic_write import recover_vault
+
+
+CHECKPOINT_SCHEMA = """
+CREATE TABLE IF NOT EXISTS applied (
+    conversation TEXT NOT NULL,
+    tag_note TEXT NOT NULL,
+    applied_at TEXT NOT NULL,
+    PRIMARY KEY (conversation, tag_note)
+);
+CREATE TABLE IF NOT EXISTS conversations (
+    conversation TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    completed_at TEXT NOT NULL
+);
+"""
+
+
+class BackfillCheckpoint:
+    """Persistent record of which conversations reached which tag notes"""
+
+    def __init__(self, vault_path: Path, db_path: Path = None):
+        if db_path is None:
+            db_path = Path(vault_path) / "_system" / "backfill-checkpoint.db"
+
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path))
+        self._conn.executescript(CHECKPOINT_SCHEMA)
+
+    @staticmethod
+    def read_completed(vault_path: Path, db_path: Path = None) -> Dict[str, int]:
+        """completed() of an existing checkpoint, without creating or locking one (dry runs)"""
+        if db_path is None:
+            db_path = Path(vault_path) / "_system" / "backfill-checkpoint.db"
+        if not Path(db_path).exists():
+            return {}
+
+        conn = sqlite3.connect(f"{Path(db_path).resolve().as_uri()}?mode=ro", uri=True)
+        try:
+            return dict(conn.execute("SELECT conversation, mtime_ns FROM conversations"))
+        except sqlite3.Error:
+            return {}
+        finally:
+            conn.close()
+
+    def applied_pairs(self) -> Set[Tuple[str, str]]:
+        return set(self._conn.execute("SELECT conversation, tag_note FROM applied"))
+
+    def mark_applied(self, tag_note: str, conversations: Iterable[str]):
+        now = datetime.now().isoformat(timespec="seconds")
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO applied VALUES (?, ?, ?)",
+            [(conversation, tag_note, now) for conversation in conversations]
+        )
+        self._conn.commit()
+
+    def completed(self) -> Dict[str, int]:
+        """Fully backfilled conversation -> file mtime at the time"""
+        return dict(self._conn.execute("SELECT conversation, mtime_ns FROM conversations"))
+
+    def mark_completed(self, conversations: Dict[str, int]):
+        now = datetime.now().isoformat(timespec="seconds")
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO conversations VALUES (?, ?, ?)",
+            [(conversation, mtime, now) for conversation, mtime in conversations.items()]
+        )
+        self._conn.commit()
+
+    def reset(self):
+        self._conn.executescript("DELETE FROM applied; DELETE FROM conversations;")
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
 
 
 class TagNoteBackfill:
@@ -29,6 +120,7 @@ class TagNoteBackfill:
         self.processed_folder = self.vault_path / "00-Inbox" / "processed"
         self.manager = TagNoteManager(str(vault_path))
         self.extractor = TagKnowledgeExtractor()
+        self.checkpoint = None
 
         # Statistics
         self.stats = {
@@ -53,21 +145,17 @@ class TagNoteBackfill:
 
     def extract_frontmatter(self, conversation_file: Path) -> Dict:
         """Extract YAML frontmatter from conversation file"""
-        content = conversation_file.read_text(encoding='utf-8')
-
-        # Extract frontmatter
-        match = re.match(r'^---\n(.*?)\n---', content, re.DOTALL)
-        if not match:
+        header = read_header(conversation_file)
+        if not header.found:
             print(f"[!] No frontmatter found in {conversation_file.name}")
             return {}
 
-        try:
-            frontmatter = yaml.safe_load(match.group(1))
-            return frontmatter
-        except Exception as e:
-            print(f"[!] Error parsing frontmatter in {conversation_file.name}: {e}")
+        if header.error:
+            print(f"[!] Error parsing frontmatter in {conversation_file.name}: {header.error}")
             return {}
 
+        return read_frontmatter(conversation_file)
+
     def extract_all_entities(self, frontmatter: Dict) -> List[str]:
         """Extract all entities from conversation frontmatter"""
         entities = []
@@ -231,14 +319,135 @@ class TagNoteBackfill:
             self.stats['conversations_skipped'] += 1
             return (0, 0)
 
-    def run(self, dry_run: bool = False, limit: int = None):
+    def parse_conversation(self, conversation_file: Path) -> Dict:
+        """
+        Read one conversation and extract the discussion for each of its entities
+
+        Returns:
+            {"file", "conversation", "mtime_ns", "entities", "discussions",
+             "timestamp", "duration", "skip"}
+        """
+        parsed = {
+            "file": conversation_file.name,
+            "conversation": conversation_file.stem,
+            "mtime_ns": conversation_file.stat().st_mtime_ns,
+            "entities": [],
+            "discussions": {},
+            "skip": None
+        }
+
+        try:
+            frontmatter = self.extract_frontmatter(conversation_file)
+            if not frontmatter:
+                parsed["skip"] = "no frontmatter"
+                return parsed
+
+            entities = sorted(self.extract_all_entities(frontmatter))
+            if not entities:
+                parsed["skip"] = "no entities found"
+                return parsed
+
+            conversation_text = extract_conversation_body(conversation_file)
+            for entity in entities:
+                discussion = self.extractor.extract_tag_discussion(entity, conversation_text)
+                if discussion and len(discussion.strip()) >= 20:
+                    parsed["discussions"][entity] = discussion
+
+            parsed["entities"] = entities
+            parsed["timestamp"] = self.parse_timestamp(frontmatter, conversation_file)
+            parsed["duration"] = self.extract_duration(frontmatter)
+        except Exception as e:
+            parsed["skip"] = f"error - {e}"
+
+        return parsed
+
+    def group_updates(self, parsed: List[Dict], applied: Set[Tuple[str, str]]) -> Tuple[Dict[str, List[Dict]], int]:
+        """
+        Turn parsed conversations into per-tag-note update lists
+
+        Pairs already in the checkpoint are dropped, as is a second entity of
+        the same conversation that resolves to the same tag note.
+
+        Returns:
+            (tag note path relative to the vault -> updates, number of pairs skipped)
+        """
+        groups = {}
+        already = 0
+
+        for conversation in parsed:
+            seen = set()
+            for entity, discussion in conversation["discussions"].items():
+                tag_path = self.manager.get_or_create_tag_path(entity)
+                tag_note = tag_path.relative_to(self.vault_path).as_posix()
+
+                if tag_note in seen:
+                    continue
+                seen.add(tag_note)
+
+                if (conversation["conversation"], tag_note) in applied:
+                    already += 1
+                    continue
+
+                groups.setdefault(tag_note, []).append({
+                    "conversation": conversation["conversation"],
+                    "entity": entity,
+                    "discussion": discussion,
+                    "timestamp": conversation["timestamp"],
+                    "link": f"[[{conversation['conversation']}]]",
+                    "related_tags": self.manager.extract_related_tags(conversation["entities"], entity),
+                    "duration": conversation["duration"]
+                })
+
+        return groups, already
+
+    def apply_tag_note_updates(self, tag_note: str, updates: List[Dict]) -> Dict:
+        """
+        Write all pending updates of one tag note in a single batched write
+
+        A conversation whose Source link is already in the note was written by
+        an interrupted run that did not reach its checkpoint; it is counted as
+        applied without writing it again.
+
+        Returns:
+            {"tag_note", "applied": [conversation keys], "created", "error"}
+        """
+        tag_path = self.vault_path / tag_note
+        existing = tag_path.read_text(encoding='utf-8') if tag_path.exists() else ""
+        result = {"tag_note": tag_note, "applied": [], "created": False, "error": None}
+
+        updates = sorted(updates, key=lambda u: u["timestamp"].isoformat())
+        new = [u for u in updates if f"**Source**: {u['link']}" not in existing]
+
+        try:
+            if new:
+                # One read and one write for the whole group
+                _, result["created"] = self.manager.add_entries(new[0]["entity"], [{
+                    'discussion_text': u["discussion"],
+                    'timestamp': u["timestamp"],
+                    'conversation_link': u["link"],
+                    'related_tags': u["related_tags"],
+                    'conversation_duration_minutes': u["duration"]
+                } for u in new])
+            result["applied"] = [u["conversation"] for u in updates]
+        except Exception as e:
+            # Nothing was written: the note is replaced in one step
+            result["applied"] = [u["conversation"] for u in updates if u not in new]
+            result["error"] = f"{type(e).__name__}: {e}"
+
+        return result
+
+    def run(self, dry_run: bool = False, limit: int = None, workers: int = None, restart: bool = False):
         """
         Run backfill for all processed conversations
 
         Args:
             dry_run: If True, only show what would be processed
             limit: Maximum number of conversations to process
+            workers: Worker processes (default: CPU count)
+            restart: Forget the checkpoint and start from scratch
         """
+        workers = max(1, workers or os.cpu_count() or 1)
+
         print(f"\n{'='*60}")
         print(f"Tag Note Backfill")
         print(f"Vault: {self.vault_path}")
@@ -246,8 +455,16 @@ class TagNoteBackfill:
             print(f"Mode: DRY RUN (no files will be modified)")
         if limit:
             print(f"Limit: {limit} conversations")
+        print(f"Workers: {workers}")
         print(f"{'='*60}\n")
 
+        if not dry_run:
+            # Finish writes an earlier, killed run left behind
+            recovery = recover_vault(self.vault_path)
+            if recovery["recovered"] or recovery["removed"]:
+                print(f"[i] Recovered {recovery['recovered']} interrupted write(s), "
+                      f"removed {len(recovery['removed'])} stray temp file(s)\n")
+
         # Find all conversations
         conversations = self.find_processed_conversations()
         print(f"[i] Found {len(conversations)} processed conversation(s)\n")
@@ -260,26 +477,20 @@ class TagNoteBackfill:
         if limit:
             conversations = conversations[:limit]
 
-        # Dry run mode
         if dry_run:
-            for conv in conversations:
-                print(f"[~] Would process: {conv.name}")
-                frontmatter = self.extract_frontmatter(conv)
-                entities = self.extract_all_entities(frontmatter)
-                print(f"    Entities: {', '.join(entities)}")
-            print(f"\n[i] Dry run complete. {len(conversations)} conversations would be processed.")
+            # A dry run reads an existing checkpoint but never creates or changes one
+            completed = {} if restart else BackfillCheckpoint.read_completed(self.vault_path)
+            self._backfill(conversations, completed, dry_run, workers)
             return
 
-        # Process each conversation
-        total_created = 0
-        total_updated = 0
+        with BackfillCheckpoint(self.vault_path) as self.checkpoint:
+            if restart:
+                self.checkpoint.reset()
+                print("[i] Checkpoint cleared")
 
-        for conv in conversations:
-            created, updated = self.process_conversation(conv)
-            total_created += created
-            total_updated += updated
-            self.stats['tag_notes_created'] += created
-            self.stats['tag_notes_updated'] += updated
+            # Conversations unchanged since they were fully backfilled are skipped outright
+            completed = {} if restart else self.checkpoint.completed()
+            self._backfill(conversations, completed, dry_run, workers)
 
         # Print summary
         print(f"\n{'='*60}")
@@ -293,6 +504,80 @@ class TagNoteBackfill:
         print(f"Errors: {self.stats['errors']}")
         print(f"{'='*60}\n")
 
+    def _backfill(self, conversations: List[Path], completed: Dict[str, int], dry_run: bool, workers: int):
+        """Parse in parallel, then write each tag note's updates (checkpointed unless dry_run)"""
+        pending = [c for c in conversations if completed.get(c.stem) != c.stat().st_mtime_ns]
+        if len(pending) < len(conversations):
+            print(f"[i] Resuming: {len(conversations) - len(pending)} conversation(s) already backfilled")
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(str(self.vault_path),)) as pool:
+            # Stage 1: parse and extract in parallel
+            parsed = []
+            for parsed_conversation in pool.map(_parse_task, [str(c) for c in pending], chunksize=8):
+                if parsed_conversation["skip"]:
+                    print(f"[-] Skipping {parsed_conversation['file']} ({parsed_conversation['skip']})")
+                    self.stats['conversations_skipped'] += 1
+                    if parsed_conversation["skip"].startswith("error"):
+                        self.stats['errors'] += 1
+                    continue
+                parsed.append(parsed_conversation)
+
+            # Dry run mode
+            if dry_run:
+                for conversation in parsed:
+                    print(f"[~] Would process: {conversation['file']}")
+                    print(f"    Entities: {', '.join(conversation['entities'])}")
+                print(f"\n[i] Dry run complete. {len(parsed)} conversations would be processed.")
+                return
+
+            # Stage 2: one task per tag note, so no two workers touch the same file
+            groups, already = self.group_updates(parsed, self.checkpoint.applied_pairs())
+            print(f"[i] {sum(len(u) for u in groups.values())} update(s) across {len(groups)} tag note(s)"
+                  f"{f', {already} already applied' if already else ''}\n")
+
+            failed = set()
+            futures = {pool.submit(_apply_task, tag_note, updates): updates
+                       for tag_note, updates in groups.items()}
+
+            for future in as_completed(futures):
+                result = future.result()
+                self.checkpoint.mark_applied(result["tag_note"], result["applied"])
+                self.stats['entities_processed'] += len(result["applied"])
+
+                if result["created"]:
+                    self.stats['tag_notes_created'] += 1
+                    print(f"  [+] Created -> {result['tag_note']} ({len(result['applied'])} conversation(s))")
+                elif result["applied"]:
+                    self.stats['tag_notes_updated'] += 1
+                    print(f"  [~] Updated -> {result['tag_note']} ({len(result['applied'])} conversation(s))")
+
+                if result["error"]:
+                    print(f"  [X] {result['tag_note']}: Error - {result['error']}")
+                    self.stats['errors'] += 1
+                    done = set(result["applied"])
+                    failed.update(u["conversation"] for u in futures[future] if u["conversation"] not in done)
+
+        finished = {c["conversation"]: c["mtime_ns"] for c in parsed if c["conversation"] not in failed}
+        self.checkpoint.mark_completed(finished)
+        self.stats['conversations_processed'] = len(finished)
+
+
+# Worker process state: one TagNoteBackfill (and taxonomy load) per process
+_worker = {}
+
+
+def _init_worker(vault_path: str):
+    _worker["backfill"] = TagNoteBackfill(vault_path)
+
+
+def _parse_task(conversation_file: str) -> Dict:
+    return _worker["backfill"].parse_conversation(Path(conversation_file))
+
+
+def _apply_task(tag_note: str, updates: List[Dict]) -> Dict:
+    return _worker["backfill"].apply_tag_note_updates(tag_note, updates)
+
 
 def main():
     import argparse
@@ -301,6 +586,8 @@ def main():
     parser.add_argument("--vault", type=str, required=True, help="Path to Obsidian vault")
     parser.add_argument("--dry-run", action="store_true", help="Show what would be processed without making changes")
     parser.add_argument("--limit", type=int, help="Limit number of conversations to process (for testing)")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--restart", action="store_true", help="Clear the checkpoint first (entries already in tag notes are still not duplicated)")
 
     args = parser.parse_args()
 
@@ -310,7 +597,7 @@ def main():
         sys.exit(1)
 
     backfill = TagNoteBackfill(str(vault_path))
-    backfill.run(dry_run=args.dry_run, limit=args.limit)
+    backfill.run(dry_run=args.dry_run, limit=args.limit, workers=args.workers, restart=args.restart)
 
 
 if __name__ == '__main__':
@@ -8,6 +8,8 @@ import json
 from pathlib import Path
 from typing import Dict, List, Tuple
 from logger_setup import get_logger, TimedOperation
+from vault_index import VaultIndex
+from frontmatter_parser import read_header
 
 
 class BatchNeo4jHelper:
@@ -16,6 +18,7 @@ class BatchNeo4jHelper:
     def __init__(self, vault_path: Path):
         self.vault_path = Path(vault_path)
         self.logger = get_logger(__name__, str(vault_path))
+        self.index = VaultIndex(self.vault_path)
         self.batch_size = 50  # Create entities in batches of 50
 
     def prepare_entities_batch(self, entities: List[Dict]) -> List[List[Dict]]:
@@ -45,67 +48,55 @@ class BatchNeo4jHelper:
     def build_entity_from_tag_note(self, tag_file: Path) -> Dict:
         """Build entity dict from tag note for Neo4j creation"""
         try:
-            with open(tag_file, 'r', encoding='utf-8') as f:
-                content = f.read(1000)
-
-            # Parse frontmatter
-            import re
-            import yaml
-
-            fm_match = re.match(r'^---\n(.*?)\n---', content, re.DOTALL)
-            if not fm_match:
+            header = read_header(tag_file)
+            if not header.valid:
                 return None
 
-            fm_data = yaml.safe_load(fm_match.group(1))
-
-            # Build entity
-            entity = {
-                "name": fm_data.get("tag", tag_file.stem),
-                "type": fm_data.get("root", "unknown").lower(),
-                "observations": [
-                    f"Canonical form: {fm_data.get('canonical', '')}",
-                    f"Taxonomy path: {fm_data.get('path', '')}",
-                    f"Depth: {fm_data.get('depth', 1)}",
-                    f"Total conversations: {fm_data.get('total_conversations', 0)}",
-                    f"Total time: {fm_data.get('total_time_minutes', 0)} minutes"
-                ]
-            }
-
-            return entity
+            return self._entity_from_frontmatter(header.data, tag_file)
 
         except Exception as e:
             self.logger.error(f"Failed to build entity from {tag_file}: {e}")
             return None
 
+    def _entity_from_frontmatter(self, fm_data: Dict, tag_file: Path) -> Dict:
+        """Build entity dict from parsed tag note frontmatter"""
+        return {
+            "name": fm_data.get("tag", tag_file.stem),
+            "type": fm_data.get("root", "unknown").lower(),
+            "observations": [
+                f"Canonical form: {fm_data.get('canonical', '')}",
+                f"Taxonomy path: {fm_data.get('path', '')}",
+                f"Depth: {fm_data.get('depth', 1)}",
+                f"Total conversations: {fm_data.get('total_conversations', 0)}",
+                f"Total time: {fm_data.get('total_time_minutes', 0)} minutes"
+            ]
+        }
+
+    def _relations_from_frontmatter(self, fm_data: Dict) -> List[Dict]:
+        """Build CHILD_OF relations from parsed tag note frontmatter"""
+        tag = fm_data.get("tag", "")
+        parent_tags = fm_data.get("parent_tags", [])
+
+        return [
+            {
+                "source": tag,
+                "target": parent,
+                "relationType": "CHILD_OF"
+            }
+            for parent in parent_tags
+        ]
+
     def build_relations_from_taxonomy(self, tag_notes: List[Path]) -> List[Dict]:
         """Build parent-child relations from taxonomy"""
         relations = []
 
         try:
-            import re
-            import yaml
-
             for tag_file in tag_notes:
-                with open(tag_file, 'r', encoding='utf-8') as f:
-                    content = f.read(1000)
-
-                fm_match = re.match(r'^---\n(.*?)\n---', content, re.DOTALL)
-                if not fm_match:
+                header = read_header(tag_file)
+                if not header.valid:
                     continue
 
-                fm_data = yaml.safe_load(fm_match.group(1))
-
-                tag = fm_data.get("tag", "")
-                parent_tags = fm_data.get("parent_tags", [])
-
-                # Create relations to parents
-                for parent in parent_tags:
-                    relation = {
-                        "source": tag,
-                        "target": parent,
-                        "relationType": "CHILD_OF"
-                    }
-                    relations.append(relation)
+                relations.extend(self._relations_from_frontmatter(header.data))
 
         except Exception as e:
             self.logger.error(f"Failed to build relations: {e}")
@@ -121,22 +112,8 @@ class BatchNeo4jHelper:
             entities = []
 
             # Collect all tag notes
-            for md_file in self.vault_path.rglob("*.md"):
-                if any(part in md_file.parts for part in ["00-Inbox", "_system", ".obsidian"]):
-                    continue
-
-                try:
-                    with open(md_file, 'r', encoding='utf-8') as f:
-                        content = f.read(500)
-                        if 'type: tag-note' not in content:
-                            continue
-
-                    entity = self.build_entity_from_tag_note(md_file)
-                    if entity:
-                        entities.append(entity)
-
-                except Exception as e:
-                    self.logger.warning(f"Skipped {md_file.name}: {e}")
+            for note in self.index.tag_notes():
+                entities.append(self._entity_from_frontmatter(note["frontmatter"], note["path"]))
 
             # Split into batches
             batches = self.prepare_entities_batch(entities)
@@ -163,21 +140,9 @@ class BatchNeo4jHelper:
 
         with TimedOperation(self.logger, "Exporting relations for batch import"):
             # Collect all tag notes
-            tag_notes = []
-            for md_file in self.vault_path.rglob("*.md"):
-                if any(part in md_file.parts for part in ["00-Inbox", "_system", ".obsidian"]):
-                    continue
-
-                try:
-                    with open(md_file, 'r', encoding='utf-8') as f:
-                        content = f.read(500)
-                        if 'type: tag-note' in content:
-                            tag_notes.append(md_file)
-                except:
-                    pass
-
-            # Build relations
-            relations = self.build_relations_from_taxonomy(tag_notes)
+            relations = []
+            for note in self.index.tag_notes():
+                relations.extend(self._relations_from_frontmatter(note["frontmatter"]))
 
             # Split into batches
             batches = self.prepare_relations_batch(relations)
@@ -5,12 +5,18 @@ Computes knowledge space metrics, growth analytics, and cognitive patterns
 """
 
 import json
-import re
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple
 from collections import defaultdict
 from logger_setup import get_logger, TimedOperation
+from vault_index import VaultIndex
+from graph_centrality import GraphCentrality, node_key
+from metric_aggregates import MetricCounters, MetricAggregates, weekly_counts
+
+
+def _to_date(day: str) -> datetime:
+    return datetime.strptime(day, "%Y-%m-%d")
 
 
 class BrainSpaceCalculator:
@@ -19,92 +25,73 @@ class BrainSpaceCalculator:
     def __init__(self, vault_path: Path):
         self.vault_path = Path(vault_path)
         self.logger = get_logger(__name__, str(vault_path))
+        self.index = VaultIndex(self.vault_path)
+        self.centrality = GraphCentrality(self.vault_path)
+
+    def load_counters(self) -> MetricCounters:
+        """Aggregate every tag note and conversation once into metric counters"""
+        return MetricCounters.from_records(self.index.tag_notes(), self.index.conversations())
 
-    def calculate_all_metrics(self) -> Dict:
-        """Calculate all brain space metrics"""
+    def calculate_all_metrics(self, counters: MetricCounters = None, centrality: Dict = None) -> Dict:
+        """
+        Calculate all brain space metrics
+
+        Args:
+            counters: Aggregates to compute from (full recompute if omitted)
+            centrality: PageRank result (recomputed if omitted)
+        """
         with TimedOperation(self.logger, "Calculating all brain space metrics"):
+            if counters is None:
+                counters = self.load_counters()
+            if centrality is None:
+                centrality = self.compute_centrality()
+
             metrics = {
-                "knowledge_coverage": self.calculate_knowledge_coverage(),
-                "learning_velocity": self.calculate_learning_velocity(),
-                "cognitive_depth": self.calculate_cognitive_depth(),
-                "connection_density": self.calculate_connection_density(),
-                "domain_diversity": self.calculate_domain_diversity(),
-                "temporal_patterns": self.calculate_temporal_patterns(),
-                "entity_prominence": self.calculate_entity_prominence(),
-                "growth_trajectory": self.calculate_growth_trajectory()
+                "knowledge_coverage": self.calculate_knowledge_coverage(counters),
+                "learning_velocity": self.calculate_learning_velocity(counters),
+                "cognitive_depth": self.calculate_cognitive_depth(counters),
+                "connection_density": self.calculate_connection_density(counters),
+                "domain_diversity": self.calculate_domain_diversity(counters),
+                "temporal_patterns": self.calculate_temporal_patterns(counters),
+                "entity_prominence": self.calculate_entity_prominence(counters=counters, centrality=centrality),
+                "graph_centrality": self.calculate_graph_centrality(centrality=centrality),
+                "growth_trajectory": self.calculate_growth_trajectory(counters)
             }
 
             self.logger.info("All metrics calculated successfully")
             return metrics
 
-    def calculate_knowledge_coverage(self) -> Dict:
+    def calculate_knowledge_coverage(self, counters: MetricCounters = None) -> Dict:
         """Calculate knowledge coverage across domains"""
         self.logger.info("Calculating knowledge coverage")
 
-        coverage = {
-            "total_entities": 0,
-            "total_conversations": 0,
-            "total_time_hours": 0,
-            "areas": {},
-            "depth_distribution": defaultdict(int)
-        }
-
-        # Count conversations
-        processed_dir = self.vault_path / "00-Inbox" / "processed"
-        if processed_dir.exists():
-            coverage["total_conversations"] = len(list(processed_dir.glob("*.md")))
-
-        # Analyze tag notes
-        for md_file in self.vault_path.rglob("*.md"):
-            if any(part in md_file.parts for part in ["00-Inbox", "_system", ".obsidian"]):
-                continue
+        if counters is None:
+            counters = self.load_counters()
 
-            try:
-                with open(md_file, 'r', encoding='utf-8') as f:
-                    content = f.read(1000)
-                    if 'type: tag-note' not in content:
-                        continue
-
-                    coverage["total_entities"] += 1
-
-                    # Extract root area
-                    root_match = re.search(r'root:\s*(\w+)', content)
-                    if root_match:
-                        root = root_match.group(1)
-                        if root not in coverage["areas"]:
-                            coverage["areas"][root] = {"count": 0, "time": 0}
-                        coverage["areas"][root]["count"] += 1
-
-                    # Extract time
-                    time_match = re.search(r'total_time_minutes:\s*(\d+(?:\.\d+)?)', content)
-                    if time_match:
-                        time_min = float(time_match.group(1))
-                        coverage["total_time_hours"] += time_min / 60
-                        if root_match:
-                            coverage["areas"][root]["time"] += time_min / 60
-
-                    # Extract depth
-                    depth_match = re.search(r'depth:\s*(\d+)', content)
-                    if depth_match:
-                        depth = int(depth_match.group(1))
-                        coverage["depth_distribution"][depth] += 1
-            except:
-                pass
-
-        # Round time
-        coverage["total_time_hours"] = round(coverage["total_time_hours"], 1)
-        for area in coverage["areas"]:
-            coverage["areas"][area]["time"] = round(coverage["areas"][area]["time"], 1)
+        area_time = counters.get("area_time")
 
-        # Convert defaultdict to dict
-        coverage["depth_distribution"] = dict(coverage["depth_distribution"])
+        coverage = {
+            "total_entities": int(counters.total("tag_notes")),
+            "total_conversations": int(counters.total("conversations")),
+            "total_time_hours": round(counters.total("time_minutes") / 60, 1),
+            "areas": {
+                area: {"count": int(count), "time": round(area_time.get(area, 0) / 60, 1)}
+                for area, count in counters.get("area_count").items()
+            },
+            "depth_distribution": {
+                int(d): count for d, count in sorted(counters.expand("depth"), key=lambda x: int(x[0]))
+            }
+        }
 
         return coverage
 
-    def calculate_learning_velocity(self) -> Dict:
+    def calculate_learning_velocity(self, counters: MetricCounters = None) -> Dict:
         """Calculate learning velocity over time windows"""
         self.logger.info("Calculating learning velocity")
 
+        if counters is None:
+            counters = self.load_counters()
+
         velocity = {
             "entities_per_week": 0,
             "conversations_per_week": 0,
@@ -112,69 +99,52 @@ class BrainSpaceCalculator:
             "acceleration": 0  # Change in velocity over time
         }
 
-        # Collect timestamps
-        entity_dates = []
-        conversation_dates = []
+        # Per-day counts, sorted by day
+        entity_days = counters.expand("entity_day")
+        conversation_days = counters.expand("conversation_day")
 
-        # Get entity creation dates
-        for md_file in self.vault_path.rglob("*.md"):
-            if any(part in md_file.parts for part in ["00-Inbox", "_system", ".obsidian"]):
-                continue
+        # Calculate velocity if we have data
+        all_days = [day for day, _ in entity_days + conversation_days]
+        if all_days:
+            earliest = _to_date(min(all_days))
+            latest = _to_date(max(all_days))
+            weeks = max((latest - earliest).days / 7, 1)
 
-            try:
-                with open(md_file, 'r', encoding='utf-8') as f:
-                    content = f.read(500)
-                    if 'type: tag-note' in content:
-                        date_match = re.search(r'created:\s*(\d{4}-\d{2}-\d{2})', content)
-                        if date_match:
-                            entity_dates.append(datetime.strptime(date_match.group(1), "%Y-%m-%d"))
-            except:
-                pass
-
-        # Get conversation dates
-        processed_dir = self.vault_path / "00-Inbox" / "processed"
-        if processed_dir.exists():
-            for conv_file in processed_dir.glob("*.md"):
-                try:
-                    with open(conv_file, 'r', encoding='utf-8') as f:
-                        content = f.read(500)
-                        date_match = re.search(r'created:\s*(\d{4}-\d{2}-\d{2})', content)
-                        if date_match:
-                            conversation_dates.append(datetime.strptime(date_match.group(1), "%Y-%m-%d"))
-                except:
-                    pass
+            entity_count = sum(count for _, count in entity_days)
+            conversation_count = sum(count for _, count in conversation_days)
 
-        # Calculate velocity if we have data
-        if entity_dates or conversation_dates:
-            all_dates = entity_dates + conversation_dates
-            if all_dates:
-                earliest = min(all_dates)
-                latest = max(all_dates)
-                weeks = max((latest - earliest).days / 7, 1)
+            velocity["entities_per_week"] = round(entity_count / weeks, 2)
+            velocity["conversations_per_week"] = round(conversation_count / weeks, 2)
 
-                velocity["entities_per_week"] = round(len(entity_dates) / weeks, 2)
-                velocity["conversations_per_week"] = round(len(conversation_dates) / weeks, 2)
+            # Calculate acceleration (compare first half vs second half)
+            if conversation_count >= 4:
+                midpoint_idx = conversation_count // 2
 
-                # Calculate acceleration (compare first half vs second half)
-                if len(conversation_dates) >= 4:
-                    sorted_dates = sorted(conversation_dates)
-                    midpoint_idx = len(sorted_dates) // 2
-                    midpoint_date = sorted_dates[midpoint_idx]
+                # Day of the midpoint_idx-th conversation in date order
+                seen = 0
+                for day, count in conversation_days:
+                    seen += count
+                    if seen > midpoint_idx:
+                        midpoint_date = _to_date(day)
+                        break
 
-                    first_half_weeks = max((midpoint_date - earliest).days / 7, 1)
-                    second_half_weeks = max((latest - midpoint_date).days / 7, 1)
+                first_half_weeks = max((midpoint_date - earliest).days / 7, 1)
+                second_half_weeks = max((latest - midpoint_date).days / 7, 1)
 
-                    first_half_velocity = midpoint_idx / first_half_weeks
-                    second_half_velocity = (len(sorted_dates) - midpoint_idx) / second_half_weeks
+                first_half_velocity = midpoint_idx / first_half_weeks
+                second_half_velocity = (conversation_count - midpoint_idx) / second_half_weeks
 
-                    velocity["acceleration"] = round(second_half_velocity - first_half_velocity, 2)
+                velocity["acceleration"] = round(second_half_velocity - first_half_velocity, 2)
 
         return velocity
 
-    def calculate_cognitive_depth(self) -> Dict:
+    def calculate_cognitive_depth(self, counters: MetricCounters = None) -> Dict:
         """Calculate cognitive depth metrics"""
         self.logger.info("Calculating cognitive depth")
 
+        if counters is None:
+            counters = self.load_counters()
+
         depth = {
             "average_depth": 0,
             "max_depth": 0,
@@ -182,131 +152,88 @@ class BrainSpaceCalculator:
             "shallow_vs_deep": {"shallow": 0, "medium": 0, "deep": 0}
         }
 
-        depths = []
-        area_depths = defaultdict(list)
+        histogram = [(int(d), count) for d, count in counters.expand("depth")]
 
-        for md_file in self.vault_path.rglob("*.md"):
-            if any(part in md_file.parts for part in ["00-Inbox", "_system", ".obsidian"]):
-                continue
+        for d, count in histogram:
+            # Categorize depth
+            if d <= 2:
+                depth["shallow_vs_deep"]["shallow"] += count
+            elif d <= 4:
+                depth["shallow_vs_deep"]["medium"] += count
+            else:
+                depth["shallow_vs_deep"]["deep"] += count
 
-            try:
-                with open(md_file, 'r', encoding='utf-8') as f:
-                    content = f.read(500)
-                    if 'type: tag-note' not in content:
-                        continue
-
-                    depth_match = re.search(r'depth:\s*(\d+)', content)
-                    root_match = re.search(r'root:\s*(\w+)', content)
-
-                    if depth_match:
-                        d = int(depth_match.group(1))
-                        depths.append(d)
-
-                        if root_match:
-                            area_depths[root_match.group(1)].append(d)
-
-                        # Categorize depth
-                        if d <= 2:
-                            depth["shallow_vs_deep"]["shallow"] += 1
-                        elif d <= 4:
-                            depth["shallow_vs_deep"]["medium"] += 1
-                        else:
-                            depth["shallow_vs_deep"]["deep"] += 1
-            except:
-                pass
-
-        if depths:
-            depth["average_depth"] = round(sum(depths) / len(depths), 2)
-            depth["max_depth"] = max(depths)
+        total = sum(count for _, count in histogram)
+        if total:
+            depth["average_depth"] = round(sum(d * count for d, count in histogram) / total, 2)
+            depth["max_depth"] = max(d for d, _ in histogram)
 
         # Calculate average depth per area
-        for area, area_depth_list in area_depths.items():
-            depth["depth_by_area"][area] = round(sum(area_depth_list) / len(area_depth_list), 2)
+        depth_sums = counters.get("area_depth_sum")
+        for area, count in counters.get("area_depth_count").items():
+            depth["depth_by_area"][area] = round(depth_sums.get(area, 0) / count, 2)
 
         return depth
 
-    def calculate_connection_density(self) -> Dict:
+    def calculate_connection_density(self, counters: MetricCounters = None) -> Dict:
         """Calculate connection density (entities per conversation)"""
         self.logger.info("Calculating connection density")
 
+        if counters is None:
+            counters = self.load_counters()
+
         density = {
             "entities_per_conversation": 0,
             "cross_area_connections": 0,
             "hub_concentration": 0  # What % of entities are in top 10%
         }
 
-        # Get total entities
-        total_entities = 0
-        entity_conversation_counts = []
-
-        for md_file in self.vault_path.rglob("*.md"):
-            if any(part in md_file.parts for part in ["00-Inbox", "_system", ".obsidian"]):
-                continue
-
-            try:
-                with open(md_file, 'r', encoding='utf-8') as f:
-                    content = f.read(500)
-                    if 'type: tag-note' not in content:
-                        continue
-
-                    total_entities += 1
-
-                    conv_match = re.search(r'total_conversations:\s*(\d+)', content)
-                    if conv_match:
-                        entity_conversation_counts.append(int(conv_match.group(1)))
-            except:
-                pass
-
         # Calculate density
-        processed_dir = self.vault_path / "00-Inbox" / "processed"
-        total_conversations = 0
-        if processed_dir.exists():
-            total_conversations = len(list(processed_dir.glob("*.md")))
+        total_entities = int(counters.total("tag_notes"))
+        total_conversations = int(counters.total("conversations"))
 
         if total_conversations > 0:
             density["entities_per_conversation"] = round(total_entities / total_conversations, 2)
 
-        # Calculate hub concentration
-        if entity_conversation_counts:
-            entity_conversation_counts.sort(reverse=True)
-            top_10_percent = max(1, len(entity_conversation_counts) // 10)
-            top_entities_total = sum(entity_conversation_counts[:top_10_percent])
-            all_entities_total = sum(entity_conversation_counts)
+        # Calculate hub concentration from the conversations-per-entity histogram
+        histogram = sorted(
+            ((int(conversations), count) for conversations, count in counters.expand("hub_conversations")),
+            reverse=True
+        )
+        entity_count = sum(count for _, count in histogram)
+
+        if entity_count:
+            top_10_percent = max(1, entity_count // 10)
+            top_entities_total = 0
+            remaining = top_10_percent
+            for conversations, count in histogram:
+                taken = min(count, remaining)
+                top_entities_total += conversations * taken
+                remaining -= taken
+                if not remaining:
+                    break
+            all_entities_total = sum(conversations * count for conversations, count in histogram)
 
             if all_entities_total > 0:
                 density["hub_concentration"] = round(top_entities_total / all_entities_total, 2)
 
         return density
 
-    def calculate_domain_diversity(self) -> Dict:
+    def calculate_domain_diversity(self, counters: MetricCounters = None) -> Dict:
         """Calculate domain diversity metrics"""
         self.logger.info("Calculating domain diversity")
 
+        if counters is None:
+            counters = self.load_counters()
+
         diversity = {
             "total_areas": 0,
             "gini_coefficient": 0,  # Measure of inequality in time distribution
             "area_balance": {}
         }
 
-        area_time = defaultdict(float)
-
-        for md_file in self.vault_path.rglob("*.md"):
-            if any(part in md_file.parts for part in ["00-Inbox", "_system", ".obsidian"]):
-                continue
-
-            try:
-                with open(md_file, 'r', encoding='utf-8') as f:
-                    content = f.read(1000)
-                    if 'type: tag-note' not in content:
-                        continue
-
-                    root_match = re.search(r'root:\s*(\w+)', content)
-                    time_match = re.search(r'total_time_minutes:\s*(\d+(?:\.\d+)?)', content)
-
-                    if root_match and time_match:
-                        area_time[root_match.group(1)] += float(time_match.group(1))
-            except:
-                pass
+        tracked_time = counters.get("area_time_tracked")
+        area_time = {area: tracked_time.get(area, 0) for area in counters.get("area_tracked")}
 
         diversity["total_areas"] = len(area_time)
 
@@ -317,24 +244,25 @@ class BrainSpaceCalculator:
             total = sum(times)
 
             if total > 0:
-                cumsum = 0
                 gini_sum = 0
                 for i, t in enumerate(times):
-                    cumsum += t
                     gini_sum += (n - i) * t
 
                 diversity["gini_coefficient"] = round(1 - (2 * gini_sum) / (n * total), 2)
 
-            # Calculate balance (percentage of total time per area)
-            for area, time_min in area_time.items():
-                diversity["area_balance"][area] = round((time_min / total) * 100, 1)
+                # Calculate balance (percentage of total time per area)
+                for area, time_min in area_time.items():
+                    diversity["area_balance"][area] = round((time_min / total) * 100, 1)
 
         return diversity
 
-    def calculate_temporal_patterns(self) -> Dict:
+    def calculate_temporal_patterns(self, counters: MetricCounters = None) -> Dict:
         """Calculate temporal patterns in learning"""
         self.logger.info("Calculating temporal patterns")
 
+        if counters is None:
+            counters = self.load_counters()
+
         patterns = {
             "active_days": 0,
             "longest_streak": 0,
@@ -343,28 +271,15 @@ class BrainSpaceCalculator:
             "weekly_distribution": defaultdict(int)
         }
 
-        # Collect all conversation dates
-        conversation_dates = []
-        processed_dir = self.vault_path / "00-Inbox" / "processed"
-
-        if processed_dir.exists():
-            for conv_file in processed_dir.glob("*.md"):
-                try:
-                    with open(conv_file, 'r', encoding='utf-8') as f:
-                        content = f.read(500)
-                        date_match = re.search(r'created:\s*(\d{4}-\d{2}-\d{2})', content)
-                        if date_match:
-                            conversation_dates.append(datetime.strptime(date_match.group(1), "%Y-%m-%d"))
-                except:
-                    pass
-
-        if conversation_dates:
+        # Conversations per day
+        conversation_days = [(_to_date(day).date(), count) for day, count in counters.expand("conversation_day")]
+
+        if conversation_days:
             # Count active days
-            unique_dates = set(d.date() for d in conversation_dates)
-            patterns["active_days"] = len(unique_dates)
+            patterns["active_days"] = len(conversation_days)
 
             # Calculate streaks
-            sorted_dates = sorted(unique_dates)
+            sorted_dates = [day for day, _ in conversation_days]
             current_streak = 1
             longest_streak = 1
 
@@ -378,70 +293,84 @@ class BrainSpaceCalculator:
             patterns["longest_streak"] = longest_streak
 
             # Check current streak
-            if sorted_dates:
-                last_date = sorted_dates[-1]
-                today = datetime.now().date()
-                if (today - last_date).days <= 1:
-                    patterns["current_streak"] = current_streak
+            last_date = sorted_dates[-1]
+            today = datetime.now().date()
+            if (today - last_date).days <= 1:
+                patterns["current_streak"] = current_streak
 
             # Weekly distribution
-            for date in conversation_dates:
-                day = date.strftime("%A")
-                patterns["weekly_distribution"][day] += 1
+            for date, count in conversation_days:
+                patterns["weekly_distribution"][date.strftime("%A")] += count
 
         # Convert defaultdict to dict
         patterns["weekly_distribution"] = dict(patterns["weekly_distribution"])
 
         return patterns
 
-    def calculate_entity_prominence(self, limit: int = 20) -> List[Dict]:
+    def compute_centrality(self) -> Dict:
+        """PageRank over the tag graph ({} when NumPy is not installed)"""
+        try:
+            return self.centrality.compute(self.index.tag_notes(), self.index.conversations())
+        except ImportError as e:
+            self.logger.warning(f"Skipping graph centrality: {e}")
+            return {}
+
+    def calculate_graph_centrality(self, limit: int = 20, centrality: Dict = None) -> Dict:
+        """Summary of the PageRank run and the most central tags"""
+        self.logger.info("Calculating graph centrality")
+
+        if centrality is None:
+            centrality = self.compute_centrality()
+
+        if not centrality:
+            return {"available": False}
+
+        return {
+            "available": True,
+            "nodes": centrality["nodes"],
+            "edges": centrality["edges"],
+            "iterations": centrality["iterations"],
+            "converged": centrality["converged"],
+            "warm_start": centrality["warm_start"],
+            "top": self.centrality.top(centrality, limit)
+        }
+
+    def calculate_entity_prominence(self, limit: int = 20, counters: MetricCounters = None,
+                                    centrality: Dict = None) -> List[Dict]:
         """Calculate entity prominence scores"""
         self.logger.info(f"Calculating entity prominence (top {limit})")
 
+        if counters is None:
+            counters = self.load_counters()
+
+        scores = centrality["scores"] if centrality else {}
+
         entities = []
 
-        for md_file in self.vault_path.rglob("*.md"):
-            if any(part in md_file.parts for part in ["00-Inbox", "_system", ".obsidian"]):
-                continue
+        # Prominence score (10 points per conversation + 5 per hour) is kept
+        # per entity by the counters, so only the top N rows are read
+        for row in counters.top_entities(limit, by="score"):
+            time_hours = row["time_minutes"] / 60
+
+            entities.append({
+                "name": row["tag"],
+                "conversations": row["conversations"],
+                "time_hours": round(time_hours, 1),
+                "prominence_score": round(row["score"], 2),
+                "root": row["root"] or "Unknown",
+                "depth": row["depth"] or 0,
+                "pagerank": round(scores.get(node_key(row["tag"]), 0.0), 6)
+            })
 
-            try:
-                with open(md_file, 'r', encoding='utf-8') as f:
-                    content = f.read(1000)
-                    if 'type: tag-note' not in content:
-                        continue
-
-                    tag_match = re.search(r'^tag:\s*(.+)$', content, re.MULTILINE)
-                    conv_match = re.search(r'total_conversations:\s*(\d+)', content)
-                    time_match = re.search(r'total_time_minutes:\s*(\d+(?:\.\d+)?)', content)
-                    root_match = re.search(r'root:\s*(\w+)', content)
-                    depth_match = re.search(r'depth:\s*(\d+)', content)
-
-                    if tag_match:
-                        conversations = int(conv_match.group(1)) if conv_match else 0
-                        time_hours = float(time_match.group(1)) / 60 if time_match else 0
-
-                        # Calculate prominence score (weighted combination)
-                        prominence = (conversations * 10) + (time_hours * 5)
-
-                        entities.append({
-                            "name": tag_match.group(1).strip(),
-                            "conversations": conversations,
-                            "time_hours": round(time_hours, 1),
-                            "prominence_score": round(prominence, 2),
-                            "root": root_match.group(1) if root_match else "Unknown",
-                            "depth": int(depth_match.group(1)) if depth_match else 0
-                        })
-            except:
-                pass
-
-        # Sort by prominence and return top N
-        entities.sort(key=lambda x: x["prominence_score"], reverse=True)
-        return entities[:limit]
-
-    def calculate_growth_trajectory(self) -> Dict:
+        return entities
+
+    def calculate_growth_trajectory(self, counters: MetricCounters = None) -> Dict:
         """Calculate growth trajectory and projections"""
         self.logger.info("Calculating growth trajectory")
 
+        if counters is None:
+            counters = self.load_counters()
+
         trajectory = {
             "weekly_growth": [],
             "projected_entities_30d": 0,
@@ -449,41 +378,9 @@ class BrainSpaceCalculator:
             "growth_phase": "Unknown"  # Exponential, Linear, Plateau
         }
 
-        # Collect weekly data
-        weekly_entities = defaultdict(int)
-        weekly_conversations = defaultdict(int)
-
-        # Entities by week
-        for md_file in self.vault_path.rglob("*.md"):
-            if any(part in md_file.parts for part in ["00-Inbox", "_system", ".obsidian"]):
-                continue
-
-            try:
-                with open(md_file, 'r', encoding='utf-8') as f:
-                    content = f.read(500)
-                    if 'type: tag-note' in content:
-                        date_match = re.search(r'created:\s*(\d{4}-\d{2}-\d{2})', content)
-                        if date_match:
-                            date = datetime.strptime(date_match.group(1), "%Y-%m-%d")
-                            week = date.strftime("%Y-W%W")
-                            weekly_entities[week] += 1
-            except:
-                pass
-
-        # Conversations by week
-        processed_dir = self.vault_path / "00-Inbox" / "processed"
-        if processed_dir.exists():
-            for conv_file in processed_dir.glob("*.md"):
-                try:
-                    with open(conv_file, 'r', encoding='utf-8') as f:
-                        content = f.read(500)
-                        date_match = re.search(r'created:\s*(\d{4}-\d{2}-\d{2})', content)
-                        if date_match:
-                            date = datetime.strptime(date_match.group(1), "%Y-%m-%d")
-                            week = date.strftime("%Y-W%W")
-                            weekly_conversations[week] += 1
-                except:
-                    pass
+        # Entities and conversations by week
+        weekly_entities = weekly_counts(counters.expand("entity_day"))
+        weekly_conversations = weekly_counts(counters.expand("conversation_day"))
 
         # Merge weekly data
         all_weeks = sorted(set(list(weekly_entities.keys()) + list(weekly_conversations.keys())))
@@ -523,12 +420,37 @@ class BrainSpaceCalculator:
 
         return trajectory
 
-    def export_metrics(self, output_file: Path = None) -> Dict:
-        """Export all metrics to JSON"""
+    def load_aggregates(self) -> Tuple[MetricAggregates, Dict]:
+        """
+        Incrementally maintained counters plus the last stored PageRank run
+
+        The aggregates are kept current by the processing pipeline (see
+        metric_aggregates.py), so nothing is re-read from the vault here.
+        """
+        aggregates = MetricAggregates(self.vault_path)
+        aggregates.ensure_built()
+        centrality = self.centrality.load_state() or self.compute_centrality()
+        return aggregates, centrality
+
+    def export_metrics(self, output_file: Path = None, incremental: bool = False) -> Dict:
+        """
+        Export all metrics to JSON
+
+        Args:
+            output_file: Override output file
+            incremental: Use the maintained aggregates instead of a full recompute
+        """
         if output_file is None:
             output_file = self.vault_path / "_system" / "brain-space-metrics.json"
 
-        metrics = self.calculate_all_metrics()
+        if incremental:
+            aggregates, centrality = self.load_aggregates()
+            try:
+                metrics = self.calculate_all_metrics(aggregates, centrality)
+            finally:
+                aggregates.close()
+        else:
+            metrics = self.calculate_all_metrics()
 
         with open(output_file, 'w', encoding='utf-8') as f:
             json.dump(metrics, f, indent=2)
@@ -544,13 +466,15 @@ def main():
     parser.add_argument("--vault", type=str, default="C:/obsidian-memory-vault",
                        help="Path to vault")
     parser.add_argument("--output", type=str, help="Override output file")
+    parser.add_argument("--incremental", action="store_true",
+                       help="Use the aggregates maintained by the pipeline instead of a full recompute")
 
     args = parser.parse_args()
 
     calculator = BrainSpaceCalculator(Path(args.vault))
 
     output_path = Path(args.output) if args.output else None
-    metrics = calculator.export_metrics(output_path)
+    metrics = calculator.export_metrics(output_path, incremental=args.incremental)
 
     # Print summary
     coverage = metrics["knowledge_coverage"]
@@ -5,12 +5,13 @@ Generates Obsidian canvas files (.canvas) for knowledge graph visualization
 """
 
 import json
-import re
 import math
 from pathlib import Path
 from typing import Dict, List, Tuple, Set, Optional
 from collections import defaultdict
 from logger_setup import get_logger, TimedOperation
+from vault_index import VaultIndex
+from frontmatter_parser import read_header
 
 
 class CanvasGenerator:
@@ -19,6 +20,7 @@ class CanvasGenerator:
     def __init__(self, vault_path: Path):
         self.vault_path = Path(vault_path)
         self.logger = get_logger(__name__, str(vault_path))
+        self.index = VaultIndex(self.vault_path)
 
     def generate_area_canvas(self, area: str, output_file: Path = None) -> Dict:
         """Generate canvas for a specific knowledge area"""
@@ -127,24 +129,20 @@ class CanvasGenerator:
         if output_file is None:
             output_file = conversation_file.with_suffix(".canvas")
 
-        # Extract entities from conversation
-        with open(conversation_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        # Parse frontmatter
-        fm_match = re.match(r'^---\n(.*?)\n---', content, re.DOTALL)
-        if not fm_match:
+        # Extract entities from the conversation's frontmatter
+        header = read_header(conversation_file)
+        if not header.found:
             self.logger.error("No frontmatter found")
             return {}
 
-        # Extract entities
-        entities_match = re.search(r'entities:\s*\[(.*?)\]', fm_match.group(1), re.DOTALL)
-        if not entities_match:
+        entities = header.get("entities")
+        if isinstance(entities, str):
+            entities = entities.split(',')
+        entities = [str(e).strip() for e in entities or [] if e is not None and str(e).strip()]
+        if not entities:
             self.logger.warning("No entities found in conversation")
             return {}
 
-        entities = [e.strip() for e in entities_match.group(1).split(',')]
-
         # Create nodes
         nodes = []
         edges = []
@@ -281,94 +279,33 @@ class CanvasGenerator:
         """Find all tag notes in a specific area"""
         tag_notes = {}
 
-        for md_file in self.vault_path.rglob("*.md"):
-            if any(part in md_file.parts for part in ["00-Inbox", "_system", ".obsidian"]):
+        for note in self.index.tag_notes():
+            # Check if matches area
+            if note["root"] != area:
                 continue
 
-            try:
-                with open(md_file, 'r', encoding='utf-8') as f:
-                    content = f.read(1000)
-
-                    if 'type: tag-note' not in content:
-                        continue
-
-                    # Check if matches area
-                    root_match = re.search(r'root:\s*(\w+)', content)
-                    if not root_match or root_match.group(1) != area:
-                        continue
-
-                    # Extract tag data
-                    tag_match = re.search(r'^tag:\s*(.+)$', content, re.MULTILINE)
-                    conv_match = re.search(r'total_conversations:\s*(\d+)', content)
-                    depth_match = re.search(r'depth:\s*(\d+)', content)
-                    parent_match = re.search(r'parent_tags:\s*\[(.*?)\]', content)
-
-                    tag_data = {
-                        "tag": tag_match.group(1).strip() if tag_match else md_file.stem,
-                        "conversations": int(conv_match.group(1)) if conv_match else 0,
-                        "depth": int(depth_match.group(1)) if depth_match else 1,
-                        "parent_tags": []
-                    }
-
-                    if parent_match:
-                        parents = parent_match.group(1).split(',')
-                        tag_data["parent_tags"] = [p.strip() for p in parents]
-
-                    tag_notes[md_file] = tag_data
-
-            except:
-                pass
+            tag_notes[note["path"]] = {
+                "tag": note["tag"] or note["path"].stem,
+                "conversations": note["total_conversations"],
+                "depth": note["depth"] if note["depth"] is not None else 1,
+                "parent_tags": note["parent_tags"]
+            }
 
         return tag_notes
 
     def _find_tag_note(self, tag: str) -> Optional[Path]:
         """Find tag note file for a given tag"""
-        for md_file in self.vault_path.rglob("*.md"):
-            if any(part in md_file.parts for part in ["00-Inbox", "_system", ".obsidian"]):
-                continue
-
-            try:
-                with open(md_file, 'r', encoding='utf-8') as f:
-                    content = f.read(500)
-
-                    if 'type: tag-note' not in content:
-                        continue
-
-                    tag_match = re.search(r'^tag:\s*(.+)$', content, re.MULTILINE)
-                    if tag_match and tag_match.group(1).strip() == tag:
-                        return md_file
-            except:
-                pass
-
-        return None
+        return self.index.find_tag_note(tag)
 
     def _find_all_areas(self) -> Dict[str, Dict]:
         """Find all knowledge areas with statistics"""
         areas = defaultdict(lambda: {"entity_count": 0, "time_hours": 0})
 
-        for md_file in self.vault_path.rglob("*.md"):
-            if any(part in md_file.parts for part in ["00-Inbox", "_system", ".obsidian"]):
-                continue
-
-            try:
-                with open(md_file, 'r', encoding='utf-8') as f:
-                    content = f.read(1000)
-
-                    if 'type: tag-note' not in content:
-                        continue
-
-                    root_match = re.search(r'root:\s*(\w+)', content)
-                    time_match = re.search(r'total_time_minutes:\s*(\d+(?:\.\d+)?)', content)
-
-                    if root_match:
-                        area = root_match.group(1)
-                        areas[area]["entity_count"] += 1
-
-                        if time_match:
-                            areas[area]["time_hours"] += float(time_match.group(1)) / 60
-
-            except:
-                pass
+        for note in self.index.tag_notes():
+            if note["root"]:
+                area = note["root"]
+                areas[area]["entity_count"] += 1
+                areas[area]["time_hours"] += note["total_time_minutes"] / 60
 
         # Round time
         for area in areas:
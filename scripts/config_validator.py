@@ -32,7 +32,7 @@ class ConfigValidator:
                     "mode": {
                         "type": str,
                         "required": True,
-                        "allowed_values": ["daily", "file_count"]
+                        "allowed_values": ["daily", "file_count", "incremental"]
                     },
                     "threshold": {
                         "type": int,
@@ -102,6 +102,43 @@ class ConfigValidator:
                     "enabled": {
                         "type": bool,
                         "required": True
+                    },
+                    "quiet_period_seconds": {
+                        "type": float,
+                        "required": False,
+                        "min": 0.05,
+                        "max": 60.0
+                    },
+                    "stability_interval_seconds": {
+                        "type": float,
+                        "required": False,
+                        "min": 0.05,
+                        "max": 60.0
+                    },
+                    "poll_interval_seconds": {
+                        "type": float,
+                        "required": False,
+                        "min": 0.0,
+                        "max": 300.0
+                    },
+                    "max_batch_files": {
+                        "type": int,
+                        "required": False,
+                        "min": 1,
+                        "max": 1000
+                    }
+                }
+            },
+
+            "pipeline_runner": {
+                "type": dict,
+                "required": False,
+                "fields": {
+                    "workers": {
+                        "type": int,
+                        "required": False,
+                        "min": 1,
+                        "max": 64
                     }
                 }
             },
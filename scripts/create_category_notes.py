@@ -13,8 +13,10 @@ from typing import Dict, List, Tuple, Set
 
 try:
     from scripts.tag_path_resolver import TagPathResolver
+    from scripts.atomic_write import write_text
 except ImportError:
     from tag_path_resolver import TagPathResolver
+    from atomic_write import write_text
 
 
 class CategoryNoteGenerator:
@@ -74,26 +76,14 @@ class CategoryNoteGenerator:
         """
         children = []
 
-        for tag, tax_data in self.taxonomy.items():
-            tag_path = tax_data.get("path", "")
-            if not tag_path:
-                continue
-
-            # Parse tag path
-            parts = [p.strip() for p in tag_path.split(">")]
-
-            # Build parent path (everything except last element)
-            if len(parts) > 1:
-                tag_parent_path = " > ".join(parts[:-1])
-
-                # Check if this tag is a direct child
-                if tag_parent_path == category_path:
-                    children.append({
-                        "tag": tag,
-                        "canonical": tax_data.get("canonical", tag.replace('-', ' ').title()),
-                        "description": tax_data.get("description", ""),
-                        "path": tag_path
-                    })
+        for tag in self.resolver.get_tags_by_parent_path(category_path):
+            tax_data = self.taxonomy[tag]
+            children.append({
+                "tag": tag,
+                "canonical": tax_data.get("canonical", tag.replace('-', ' ').title()),
+                "description": tax_data.get("description", ""),
+                "path": tax_data.get("path", "")
+            })
 
         return sorted(children, key=lambda x: x["canonical"])
 
@@ -289,7 +279,7 @@ Use Obsidian's graph view or backlinks panel to explore connections.
                 file_path.parent.mkdir(parents=True, exist_ok=True)
 
                 # Write file
-                file_path.write_text(content, encoding='utf-8')
+                write_text(file_path, content)
 
                 print(f"[CREATE] {file_path.relative_to(self.vault_path)}")
                 print(f"    Children: {len(children_tags)} tags, {len(children_cats)} categories")
@@ -8,7 +8,6 @@ entirely new areas of knowledge that deserve their own root category.
 Uses semantic pattern matching and clustering to suggest new roots automatically.
 """
 
-import re
 from pathlib import Path
 from datetime import datetime
 from typing import List, Dict, Optional, Set
@@ -16,8 +15,10 @@ from collections import defaultdict, Counter
 
 try:
     from scripts.tag_path_resolver import TagPathResolver
+    from scripts.frontmatter_parser import read_header
 except ImportError:
     from tag_path_resolver import TagPathResolver
+    from frontmatter_parser import read_header
 
 
 class NewRootDetector:
@@ -194,23 +195,17 @@ class NewRootDetector:
                 continue
 
             try:
-                content = md_file.read_text(encoding='utf-8')
+                fm = read_header(md_file).data
 
-                if 'type: tag-note' not in content[:500]:
+                if fm.get('type') != 'tag-note':
                     continue
 
-                # Extract frontmatter
-                match = re.match(r'^---\n(.*?)\n---', content, re.DOTALL)
-                if match:
-                    import yaml
-                    fm = yaml.safe_load(match.group(1))
+                root = fm.get('root', '')
+                tag = fm.get('tag', '')
 
-                    root = fm.get('root', '')
-                    tag = fm.get('tag', '')
-
-                    # Check if uncategorized
-                    if root in ['Uncategorized', 'Resources', 'Unknown', ''] and tag:
-                        uncategorized.append(tag)
+                # Check if uncategorized
+                if root in ['Uncategorized', 'Resources', 'Unknown', ''] and tag:
+                    uncategorized.append(tag)
 
             except Exception:
                 pass
@@ -2,46 +2,134 @@
 """
 Ollama Embedding Script for Smart Connections
 Embeds new notes using nomic-embed-text:latest model via Ollama API
+
+Requests go through one pooled HTTP session and one shared request executor,
+so at most `concurrency` requests are in flight however many files are being
+embedded. Chunks are batched through the multi-input /api/embed endpoint,
+falling back to per-chunk /api/embeddings on older Ollama versions; 5xx
+responses and connection errors are retried with backoff.
+
+Vectors are cached by chunk content (see embedding_cache.py), so only chunks
+whose text actually changed are sent to Ollama on a re-run.
+
+Output goes to Smart Connections .ajson files, to the binary vector store in
+_system/vector-store (see vector_store.py), or both.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import hashlib
 import argparse
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
 from datetime import datetime
 from typing import List, Dict, Optional
 
+try:
+    from scripts.embedding_cache import EmbeddingCache, text_hash
+    from scripts.vector_store import VectorStore
+except ImportError:
+    from embedding_cache import EmbeddingCache, text_hash
+    from vector_store import VectorStore
+
+OUTPUT_FORMATS = ("ajson", "binary", "both")
+
+HEADING_RE = re.compile(r'#{1,6}\s')
+
 
 class OllamaEmbedder:
     """Embeds markdown notes using Ollama nomic-embed-text model"""
 
-    def __init__(self, vault_path: str, ollama_url: str = "http://localhost:11434"):
+    def __init__(self, vault_path: str, ollama_url: str = "http://localhost:11434",
+                 batch_size: int = 32, concurrency: int = 4, timeout: int = 60,
+                 output: str = "both", store_dtype: str = "float32",
+                 retries: int = 2, retry_backoff: float = 0.5):
+        if output not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format: {output} (expected one of {OUTPUT_FORMATS})")
+
         self.vault_path = Path(vault_path)
-        self.ollama_url = ollama_url
+        self.ollama_url = ollama_url.rstrip("/")
         self.model = "nomic-embed-text:latest"
         self.smart_env_path = self.vault_path / ".smart-env" / "multi"
 
+        # Request pipelining
+        self.batch_size = max(1, batch_size)
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        self.retries = max(0, retries)
+        self.retry_backoff = retry_backoff
+        self._batch_endpoint = None  # None = not probed yet
+        self._slots = threading.BoundedSemaphore(self.concurrency)
+        self._pool = None  # shared request executor, created on first use
+
+        # Keep-alive connections shared by all worker threads
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=self.concurrency
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
         # Chunking parameters
         self.min_chunk_size = 200
         self.max_chunk_size = 500
+        self.max_block_size = 2000  # hard cap for unsplittable code fences / frontmatter
         self.overlap = 50
 
         # Ensure output directory exists
         self.smart_env_path.mkdir(parents=True, exist_ok=True)
 
-    def get_embedding(self, text: str) -> Optional[List[float]]:
-        """Get embedding vector from Ollama API"""
-        try:
-            response = requests.post(
-                f"{self.ollama_url}/api/embeddings",
-                json={
-                    "model": self.model,
-                    "prompt": text
-                },
-                timeout=30
+        self.cache = EmbeddingCache(self.vault_path)
+
+        # Output backends
+        self.write_ajson = output in ("ajson", "both")
+        self.store = None
+        if output in ("binary", "both"):
+            self.store = VectorStore(
+                self.vault_path / "_system" / "vector-store", self.model, dtype=store_dtype
             )
 
+    def _executor(self) -> ThreadPoolExecutor:
+        """The one executor every embedding request runs on"""
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="ollama")
+        return self._pool
+
+    def close(self):
+        """Stop the request executor and close pooled connections"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+        self.session.close()
+
+    def _post(self, endpoint: str, payload: Dict) -> requests.Response:
+        """POST with a request slot held; 5xx and connection errors are retried"""
+        for attempt in range(self.retries + 1):
+            last = attempt == self.retries
+            try:
+                with self._slots:
+                    response = self.session.post(
+                        f"{self.ollama_url}{endpoint}", json=payload, timeout=self.timeout
+                    )
+                if response.status_code < 500 or last:
+                    return response
+            except (requests.ConnectionError, requests.Timeout):
+                if last:
+                    raise
+            # Back off without holding a slot
+            time.sleep(self.retry_backoff * (2 ** attempt))
+
+    def _embed_single(self, text: str) -> Optional[List[float]]:
+        """One text through the legacy /api/embeddings endpoint"""
+        try:
+            response = self._post("/api/embeddings", {"model": self.model, "prompt": text})
+
             if response.status_code == 200:
                 return response.json()["embedding"]
             else:
@@ -52,6 +140,59 @@ class OllamaEmbedder:
             print(f"❌ Failed to get embedding: {e}")
             return None
 
+    def _embed_batch(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """Embed one batch, preferring the multi-input /api/embed endpoint"""
+        if self._batch_endpoint is not False:
+            try:
+                response = self._post("/api/embed", {"model": self.model, "input": texts})
+
+                if response.status_code == 200:
+                    self._batch_endpoint = True
+                    embeddings = response.json().get("embeddings", [])
+                    if len(embeddings) == len(texts):
+                        return embeddings
+                    print(f"❌ Ollama returned {len(embeddings)} embeddings for {len(texts)} inputs")
+                    return [None] * len(texts)
+
+                if response.status_code == 404 and self._batch_endpoint is not True:
+                    # Ollama < 0.2 has no /api/embed
+                    self._batch_endpoint = False
+                else:
+                    print(f"❌ Ollama error: {response.status_code} - {response.text}")
+                    return [None] * len(texts)
+
+            except Exception as e:
+                print(f"❌ Failed to get embeddings: {e}")
+                return [None] * len(texts)
+
+        return [self._embed_single(text) for text in texts]
+
+    def get_embeddings(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """
+        Get embedding vectors for many texts
+
+        Texts are split into batches of `batch_size` and sent concurrently.
+
+        Returns:
+            One vector (or None on failure) per input text, in order
+        """
+        if not texts:
+            return []
+
+        batches = [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+
+        if len(batches) == 1:
+            return self._embed_batch(batches[0])
+
+        results = []
+        for future in [self._executor().submit(self._embed_batch, batch) for batch in batches]:
+            results.extend(future.result())
+        return results
+
+    def get_embedding(self, text: str) -> Optional[List[float]]:
+        """Get embedding vector from Ollama API"""
+        return self.get_embeddings([text])[0]
+
     def chunk_text(self, text: str, file_path: str) -> List[Dict]:
         """
         Chunk text into overlapping segments for embedding
@@ -61,64 +202,131 @@ class OllamaEmbedder:
         - Medium text: 2-3 chunks
         - Large text: Multiple chunks with overlap
         """
+        return list(self.iter_chunks(text))
+
+    @staticmethod
+    def _iter_lines(text: str):
+        """Yield (line number, start offset, line) without splitting the whole text"""
+        pos = 0
+        lineno = 1
+        length = len(text)
+
+        while pos <= length:
+            newline = text.find('\n', pos)
+            if newline == -1:
+                newline = length
+            yield lineno, pos, text[pos:newline]
+            pos = newline + 1
+            lineno += 1
+
+    def _iter_marked_lines(self, text: str):
+        """
+        Yield (line number, start offset, line, breakable, section_start)
+
+        A chunk may only end before a breakable line: lines inside
+        frontmatter or a code fence are not breakable. Headings and the
+        first line after frontmatter start a new section.
+        """
+        in_frontmatter = False
+        fence = None
+        section_next = False
+
+        for lineno, start, line in self._iter_lines(text):
+            stripped = line.strip()
+            breakable = True
+            section_start = section_next
+            section_next = False
+
+            if in_frontmatter:
+                breakable = False
+                if stripped == '---':
+                    in_frontmatter = False
+                    section_next = True
+            elif lineno == 1 and stripped == '---':
+                in_frontmatter = True
+            elif fence:
+                breakable = False
+                if stripped.startswith(fence):
+                    fence = None
+            elif stripped.startswith('```') or stripped.startswith('~~~'):
+                fence = stripped[:3]
+            elif HEADING_RE.match(line):
+                section_start = True
+
+            yield lineno, start, line, breakable, section_start
+
+    def iter_chunks(self, text: str):
+        """
+        Stream chunks of a note in a single linear pass
+
+        Chunks grow line by line up to max_chunk_size and carry `overlap`
+        characters of trailing lines into the next chunk. They never split
+        frontmatter or a code fence (unless it exceeds max_block_size), and
+        a heading closes the current chunk once it holds min_chunk_size
+        characters.
+
+        Yields:
+            {"text", "start", "end", "lines"} with character offsets into the
+            stripped text and 1-based inclusive line numbers
+        """
         text = text.strip()
+        if not text:
+            return
 
         # For tiny text (tags, short notes), embed as-is
         if len(text) <= self.max_chunk_size:
-            return [{
+            yield {
                 "text": text,
                 "start": 0,
                 "end": len(text),
                 "lines": [1, text.count('\n') + 1]
-            }]
-
-        # For larger text, create overlapping chunks
-        chunks = []
-        lines = text.split('\n')
-        current_chunk = []
-        current_size = 0
-        line_start = 0
+            }
+            return
+
+        current = deque()  # (line number, start offset, line)
+        size = 0           # sum of len(line) + 1 over current
+
+        def make_chunk():
+            first, last = current[0], current[-1]
+            return {
+                "text": '\n'.join(line for _, _, line in current),
+                "start": first[1],
+                "end": last[1] + len(last[2]),
+                "lines": [first[0], last[0]]
+            }
 
-        for i, line in enumerate(lines, 1):
+        for lineno, start, line, breakable, section_start in self._iter_marked_lines(text):
             line_len = len(line) + 1  # +1 for newline
 
-            if current_size + line_len > self.max_chunk_size and current_chunk:
-                # Save current chunk
-                chunk_text = '\n'.join(current_chunk)
-                chunks.append({
-                    "text": chunk_text,
-                    "start": len('\n'.join(lines[:line_start])),
-                    "end": len('\n'.join(lines[:i-1])),
-                    "lines": [line_start + 1, i]
-                })
+            if current and section_start and size >= self.min_chunk_size:
+                # Structural boundary: start fresh, no overlap
+                yield make_chunk()
+                current.clear()
+                size = 0
+
+            elif current and size + line_len > self.max_chunk_size and (
+                breakable or size + line_len > self.max_block_size
+            ):
+                yield make_chunk()
 
                 # Start new chunk with overlap
-                overlap_lines = []
                 overlap_size = 0
-                for j in range(len(current_chunk) - 1, -1, -1):
-                    overlap_size += len(current_chunk[j]) + 1
+                keep = 0
+                for _, _, prev in reversed(current):
+                    overlap_size += len(prev) + 1
                     if overlap_size >= self.overlap:
                         break
-                    overlap_lines.insert(0, current_chunk[j])
+                    keep += 1
 
-                current_chunk = overlap_lines + [line]
-                current_size = sum(len(l) + 1 for l in current_chunk)
-                line_start = i - len(overlap_lines) - 1
-            else:
-                current_chunk.append(line)
-                current_size += line_len
+                while len(current) > keep:
+                    size -= len(current.popleft()[2]) + 1
 
-        # Add final chunk
-        if current_chunk:
-            chunk_text = '\n'.join(current_chunk)
-            chunks.append({
-                "text": chunk_text,
-                "start": len('\n'.join(lines[:line_start])),
-                "end": len(text),
-                "lines": [line_start + 1, len(lines) + 1]
-            })
+            current.append((lineno, start, line))
+            size += line_len
 
-        return chunks
+        # Add final chunk
+        if current:
+            yield make_chunk()
 
     def generate_key(self, file_path: str, chunk_text: str = None) -> str:
         """Generate Smart Connections compatible key"""
@@ -132,14 +340,29 @@ class OllamaEmbedder:
 
         return relative_path
 
+    def ajson_path(self, key: str) -> Path:
+        """Smart Connections output file for a key"""
+        key_hash = hashlib.md5(key.encode()).hexdigest()
+        return self.smart_env_path / f"{key_hash}.ajson"
+
+    def _chunk_written(self, key: str) -> bool:
+        """Whether every enabled output already holds this chunk"""
+        if self.write_ajson and not self.ajson_path(key).exists():
+            return False
+        if self.store is not None and key not in self.store:
+            return False
+        return True
+
+    def flush(self):
+        """Persist the vector store table"""
+        if self.store is not None:
+            self.store.flush()
+
     def save_embedding(self, file_path: Path, chunk: Dict, embedding: List[float]):
         """Save embedding in Smart Connections .ajson format"""
 
         key = self.generate_key(file_path, chunk["text"])
-
-        # Generate hash for filename
-        key_hash = hashlib.md5(key.encode()).hexdigest()
-        output_file = self.smart_env_path / f"{key_hash}.ajson"
+        output_file = self.ajson_path(key)
 
         # Smart Connections format
         data = {
@@ -176,52 +399,119 @@ class OllamaEmbedder:
         """
         Embed a single markdown file
 
+        Chunks are streamed in batches: each batch is checked against the
+        content-hash cache and its new texts are sent to Ollama while the
+        rest of the file is still being chunked. Only chunks missing from an
+        enabled output are written (unless force). Call flush() afterwards
+        to persist the vector store.
+
         Returns:
-            Number of chunks embedded
+            Number of chunks written
         """
-        # Check if already embedded (unless force)
-        if not force:
-            key = self.generate_key(file_path)
-            key_hash = hashlib.md5(key.encode()).hexdigest()
-            existing = self.smart_env_path / f"{key_hash}.ajson"
-
-            if existing.exists():
-                # Check if file modified since embedding
-                existing_mtime = json.loads("{" + existing.read_text().rstrip(",") + "}")
-                existing_data = list(existing_mtime.values())[0]
-                file_mtime = int(file_path.stat().st_mtime)
-
-                if existing_data.get("metadata", {}).get("mtime", 0) >= file_mtime:
-                    print(f"[SKIP] Skipping {file_path.name} (already embedded)")
-                    return 0
+        return self._finish_file(self._submit_file(file_path, force))
 
-        print(f"\n[*] Processing: {file_path.name}")
+    def _submit_file(self, file_path: Path, force: bool = False) -> Optional[Dict]:
+        """
+        Chunk a file and submit its uncached batches to the request executor
 
+        Returns:
+            Pending work for _finish_file (None if the file could not be read)
+        """
         # Read file content
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
         except Exception as e:
             print(f"❌ Failed to read file: {e}")
+            return None
+
+        pending_file = {
+            "file_path": file_path,
+            "rel_path": str(file_path.relative_to(self.vault_path)).replace("\\", "/"),
+            "all_keys": [],
+            "jobs": [],
+            "total": 0,
+            "cached": 0
+        }
+
+        chunk_stream = self.iter_chunks(content)
+
+        while True:
+            batch = list(islice(chunk_stream, self.batch_size))
+            if not batch:
+                break
+
+            keys = [self.generate_key(file_path, chunk["text"]) for chunk in batch]
+            pending_file["all_keys"].extend(keys)
+
+            if not force:
+                pending = [(c, k) for c, k in zip(batch, keys) if not self._chunk_written(k)]
+                if not pending:
+                    continue
+                batch, keys = [list(x) for x in zip(*pending)]
+
+            hashes = [text_hash(chunk["text"]) for chunk in batch]
+            cached = {} if force else self.cache.get_many(self.model, hashes)
+
+            # Embed each distinct uncached text once
+            missing = {}
+            for h, chunk in zip(hashes, batch):
+                if h not in cached:
+                    missing.setdefault(h, chunk["text"])
+
+            pending_file["total"] += len(batch)
+            pending_file["cached"] += sum(1 for h in hashes if h in cached)
+
+            future = self._executor().submit(self._embed_batch, list(missing.values())) if missing else None
+            pending_file["jobs"].append((batch, keys, hashes, cached, missing, future))
+
+        return pending_file
+
+    def _finish_file(self, pending_file: Optional[Dict]) -> int:
+        """Wait for a file's requests and write its chunks (runs on the caller's thread)"""
+        if pending_file is None:
             return 0
 
-        # Chunk text
-        chunks = self.chunk_text(content, file_path)
-        print(f"   Chunks: {len(chunks)}")
+        file_path = pending_file["file_path"]
+        rel_path = pending_file["rel_path"]
+        jobs = pending_file["jobs"]
+        total = pending_file["total"]
 
-        embedded_count = 0
+        if self.store is not None:
+            # Forget vectors of chunks that no longer exist in the note
+            self.store.retain_path(rel_path, pending_file["all_keys"])
 
-        for i, chunk in enumerate(chunks, 1):
-            # Get embedding
-            embedding = self.get_embedding(chunk["text"])
+        if not jobs:
+            print(f"[SKIP] Skipping {file_path.name} (unchanged)")
+            return 0
 
-            if embedding:
-                # Save embedding
-                output_file = self.save_embedding(file_path, chunk, embedding)
-                print(f"   [OK] Chunk {i}/{len(chunks)} embedded ({len(chunk['text'])} chars) -> {output_file.name}")
-                embedded_count += 1
-            else:
-                print(f"   [X] Chunk {i}/{len(chunks)} failed")
+        print(f"\n[*] Processing: {file_path.name}")
+        print(f"   Chunks: {total} ({pending_file['cached']} cached)")
+
+        embedded_count = 0
+        i = 0
+
+        for batch, keys, hashes, cached, missing, future in jobs:
+            if future is not None:
+                fresh = dict(zip(missing, future.result()))
+                fresh = {h: vector for h, vector in fresh.items() if vector}
+                self.cache.put_many(self.model, fresh)
+                cached.update(fresh)
+
+            for chunk, key, h in zip(batch, keys, hashes):
+                i += 1
+                embedding = cached.get(h)
+                if embedding:
+                    # Save embedding
+                    target = "vector store"
+                    if self.write_ajson:
+                        target = self.save_embedding(file_path, chunk, embedding).name
+                    if self.store is not None:
+                        self.store.add(key, rel_path, chunk["lines"], embedding)
+                    print(f"   [OK] Chunk {i}/{total} embedded ({len(chunk['text'])} chars) -> {target}")
+                    embedded_count += 1
+                else:
+                    print(f"   [X] Chunk {i}/{total} failed")
 
         return embedded_count
 
@@ -251,20 +541,40 @@ class OllamaEmbedder:
 
         print(f"Found {len(files)} files\n")
 
-        for file_path in files:
+        def finish(file_path: Path, pending_file: Optional[Dict]):
             try:
-                chunks = self.embed_file(file_path, force=force)
+                chunks = self._finish_file(pending_file)
+            except Exception as e:
+                print(f"❌ Error processing {file_path.name}: {e}")
+                stats["files_failed"] += 1
+                return
 
-                if chunks > 0:
-                    stats["files_processed"] += 1
-                    stats["chunks_embedded"] += chunks
-                elif chunks == 0:
-                    stats["files_skipped"] += 1
+            if chunks > 0:
+                stats["files_processed"] += 1
+                stats["chunks_embedded"] += chunks
+            else:
+                stats["files_skipped"] += 1
 
+        # Files are pipelined so small notes don't wait on each other's
+        # round-trips: requests for the next few files are already queued on
+        # the shared executor (at most `concurrency` in flight) while earlier
+        # files are written here, on one thread
+        window = deque()
+        for file_path in files:
+            try:
+                window.append((file_path, self._submit_file(file_path, force=force)))
             except Exception as e:
                 print(f"❌ Error processing {file_path.name}: {e}")
                 stats["files_failed"] += 1
+                continue
+
+            if len(window) > self.concurrency:
+                finish(*window.popleft())
+
+        while window:
+            finish(*window.popleft())
 
+        self.flush()
         return stats
 
 
@@ -290,6 +600,30 @@ def main():
         default="http://localhost:11434",
         help="Ollama API URL (default: http://localhost:11434)"
     )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=32,
+        help="Chunks per /api/embed request (default: 32)"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Maximum concurrent requests to Ollama (default: 4)"
+    )
+    parser.add_argument(
+        "--output",
+        choices=OUTPUT_FORMATS,
+        default="both",
+        help="Write Smart Connections .ajson, the binary vector store, or both (default: both)"
+    )
+    parser.add_argument(
+        "--store-dtype",
+        choices=["float32", "float16"],
+        default="float32",
+        help="Vector store precision (default: float32)"
+    )
     parser.add_argument(
         "--force",
         action="store_true",
@@ -310,7 +644,11 @@ def main():
         print(f"❌ Vault not found: {vault_path}")
         return 1
 
-    embedder = OllamaEmbedder(vault_path, args.ollama_url)
+    embedder = OllamaEmbedder(
+        vault_path, args.ollama_url,
+        batch_size=args.batch_size, concurrency=args.concurrency,
+        output=args.output, store_dtype=args.store_dtype
+    )
 
     # Test Ollama connection
     print("Testing Ollama connection...")
@@ -328,6 +666,7 @@ def main():
             return 1
 
         chunks = embedder.embed_file(file_path, force=args.force)
+        embedder.flush()
 
         print(f"\n{'='*60}")
         print(f"[SUCCESS] Embedded {chunks} chunk(s)")
@@ -363,6 +702,7 @@ def main():
         print(f"Chunks embedded: {stats['chunks_embedded']}")
         print(f"{'='*60}\n")
 
+    embedder.close()
     return 0
 
 
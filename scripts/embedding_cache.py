@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Embedding Cache
+Persistent content-addressed store of embedding vectors.
+
+Vectors are keyed by (model, SHA-256 of the chunk text) and stored as packed
+float32 blobs in _system/embedding-cache.db, so a chunk whose text has not
+changed is never sent to Ollama again - no matter which file it came from or
+whether that file's mtime moved.
+"""
+
+import hashlib
+import sqlite3
+import threading
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    model TEXT NOT NULL,
+    text_hash TEXT NOT NULL,
+    dim INTEGER NOT NULL,
+    vector BLOB NOT NULL,
+    PRIMARY KEY (model, text_hash)
+);
+"""
+
+
+def text_hash(text: str) -> str:
+    """Content hash used as the cache key"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class EmbeddingCache:
+    """Thread-safe (model, text hash) -> vector cache backed by SQLite"""
+
+    def __init__(self, vault_path: Path, db_path: Path = None):
+        self.vault_path = Path(vault_path)
+
+        if db_path is None:
+            db_path = self.vault_path / "_system" / "embedding-cache.db"
+
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+
+    def get_many(self, model: str, hashes: Iterable[str]) -> Dict[str, List[float]]:
+        """
+        Look up cached vectors
+
+        Returns:
+            text hash -> vector for every hash present in the cache
+        """
+        hashes = list(dict.fromkeys(hashes))
+        found = {}
+
+        with self._lock:
+            # Stay well under SQLite's bound-parameter limit
+            for i in range(0, len(hashes), 500):
+                batch = hashes[i:i + 500]
+                placeholders = ",".join("?" * len(batch))
+                for h, blob in self._conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings "
+                    f"WHERE model = ? AND text_hash IN ({placeholders})",
+                    [model] + batch
+                ):
+                    vector = array('f')
+                    vector.frombytes(blob)
+                    found[h] = vector.tolist()
+
+        return found
+
+    def get(self, model: str, h: str) -> Optional[List[float]]:
+        return self.get_many(model, [h]).get(h)
+
+    def put_many(self, model: str, vectors: Dict[str, List[float]]):
+        """Store vectors keyed by text hash"""
+        rows = [
+            (model, h, len(vector), array('f', vector).tobytes())
+            for h, vector in vectors.items()
+        ]
+
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?, ?)", rows)
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
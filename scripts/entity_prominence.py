@@ -2,46 +2,106 @@
 """
 Entity Prominence Calculator
 Calculates prominence scores and rankings for entities based on multiple metrics
+
+Tag notes and conversations are loaded once from the vault index and turned
+into lookup maps (tag -> child count, tag -> recent mentions), so scoring every
+entity is a single pass instead of a scan of all notes and conversations per
+entity. Results are memoized per calculator; call invalidate() after the vault
+changes.
+
+A graph centrality component (PageRank over the taxonomy + co-occurrence
+graph, see graph_centrality.py) rewards entities that are more central than
+average. It is skipped when NumPy is not installed.
 """
 
-import re
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple
-from collections import defaultdict
+from collections import Counter, defaultdict
 from logger_setup import get_logger, TimedOperation
+from vault_index import VaultIndex
+from graph_centrality import GraphCentrality, node_key
+
+# Points per multiple of the average PageRank above average
+CENTRALITY_POINTS = 5.0
 
 
 class EntityProminenceCalculator:
     """Calculate entity prominence scores"""
 
-    def __init__(self, vault_path: Path):
+    def __init__(self, vault_path: Path, use_centrality: bool = True):
         self.vault_path = Path(vault_path)
         self.logger = get_logger(__name__, str(vault_path))
+        self.index = VaultIndex(self.vault_path)
+        self.centrality = GraphCentrality(self.vault_path) if use_centrality else None
+        self.invalidate()
+
+    def invalidate(self):
+        """Drop memoized maps and scores (call after the vault changes)"""
+        self._children = None
+        self._recent = {}
+        self._all = None
+        self._centrality = None
+
+    def _get_children(self) -> Dict[str, set]:
+        """tag -> ids of the tag note records that list it as a parent"""
+        if self._children is None:
+            self._children = defaultdict(set)
+            for other in self.index.tag_notes():
+                for parent in other["parent_tags"]:
+                    self._children[parent].add(id(other))
+        return self._children
+
+    def _get_recent_counts(self, days: int) -> Counter:
+        """entity -> number of conversations in the last `days` days mentioning it"""
+        if days not in self._recent:
+            cutoff = datetime.now() - timedelta(days=days)
+            counts = Counter()
+
+            for conv in self.index.conversations():
+                if not conv["created"]:
+                    continue
+
+                conv_date = datetime.strptime(conv["created"], "%Y-%m-%d")
+                if conv_date < cutoff:
+                    continue
+
+                counts.update(set(conv["entities"]))
+
+            self._recent[days] = counts
+        return self._recent[days]
+
+    def get_centrality(self) -> Dict:
+        """PageRank result for the tag graph ({} when disabled or NumPy is missing)"""
+        if self._centrality is None:
+            self._centrality = {}
+            if self.centrality is not None:
+                try:
+                    self._centrality = self.centrality.compute(
+                        self.index.tag_notes(), self.index.conversations()
+                    )
+                except ImportError as e:
+                    self.logger.warning(f"Skipping graph centrality: {e}")
+        return self._centrality
 
     def calculate_prominence(self, entity: str) -> Dict:
         """Calculate comprehensive prominence metrics for an entity"""
-        self.logger.info(f"Calculating prominence for: {entity}")
+        self.logger.debug(f"Calculating prominence for: {entity}")
 
         # Find tag note
-        tag_file = self._find_tag_note(entity)
-        if not tag_file:
+        note = self.index.get_tag_note(entity)
+        if not note:
             self.logger.warning(f"Tag note not found for: {entity}")
             return {}
 
-        with open(tag_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        # Extract metrics from frontmatter
-        conv_match = re.search(r'total_conversations:\s*(\d+)', content)
-        time_match = re.search(r'total_time_minutes:\s*(\d+(?:\.\d+)?)', content)
-        depth_match = re.search(r'depth:\s*(\d+)', content)
-        root_match = re.search(r'root:\s*(\w+)', content)
+        return self._score(entity, note)
 
-        conversations = int(conv_match.group(1)) if conv_match else 0
-        time_minutes = float(time_match.group(1)) if time_match else 0
-        depth = int(depth_match.group(1)) if depth_match else 1
-        root = root_match.group(1) if root_match else "Unknown"
+    def _score(self, entity: str, note: Dict) -> Dict:
+        """Prominence of an entity from its tag note record and the shared maps"""
+        conversations = note["total_conversations"]
+        time_minutes = note["total_time_minutes"]
+        depth = note["depth"] if note["depth"] is not None else 1
+        root = note["root"] or "Unknown"
 
         # Calculate prominence score (weighted)
         # - 10 points per conversation
@@ -59,9 +119,14 @@ class EntityProminenceCalculator:
         # Calculate connection score (more connections = more central)
         connection_score = self._calculate_connection_score(entity)
 
+        # Calculate centrality score (PageRank relative to the average node)
+        pagerank, centrality_score = self._calculate_centrality_score(entity)
+
+        total_score += recency_score + connection_score + centrality_score
+
         prominence = {
             "entity": entity,
-            "total_score": round(total_score + recency_score + connection_score, 2),
+            "total_score": round(total_score, 2),
             "breakdown": {
                 "conversations": conversations,
                 "time_hours": round(time_minutes / 60, 2),
@@ -71,44 +136,37 @@ class EntityProminenceCalculator:
                 "time_score": round(time_score, 2),
                 "depth_score": round(depth_score, 2),
                 "recency_score": round(recency_score, 2),
-                "connection_score": round(connection_score, 2)
+                "connection_score": round(connection_score, 2),
+                "pagerank": round(pagerank, 6),
+                "centrality_score": round(centrality_score, 2)
             },
-            "rank_category": self._categorize_prominence(total_score + recency_score + connection_score)
+            "rank_category": self._categorize_prominence(total_score)
         }
 
         return prominence
 
     def calculate_all_prominence(self) -> List[Dict]:
-        """Calculate prominence for all entities"""
-        with TimedOperation(self.logger, "Calculating prominence for all entities"):
-            entities = []
-
-            # Find all tag notes
-            for md_file in self.vault_path.rglob("*.md"):
-                if any(part in md_file.parts for part in ["00-Inbox", "_system", ".obsidian"]):
-                    continue
-
-                try:
-                    with open(md_file, 'r', encoding='utf-8') as f:
-                        content = f.read(500)
-                        if 'type: tag-note' not in content:
-                            continue
+        """Calculate prominence for all entities (memoized until invalidate())"""
+        if self._all is not None:
+            return list(self._all)
 
-                    tag_match = re.search(r'^tag:\s*(.+)$', content, re.MULTILINE)
-                    if tag_match:
-                        entity = tag_match.group(1).strip()
-                        prominence = self.calculate_prominence(entity)
-                        if prominence:
-                            entities.append(prominence)
+        with TimedOperation(self.logger, "Calculating prominence for all entities"):
+            # Build the shared maps once, then score every tag note in one pass
+            self._get_children()
+            self._get_recent_counts(30)
 
-                except Exception as e:
-                    self.logger.warning(f"Failed to process {md_file.name}: {e}")
+            entities = [
+                self._score(note["tag"], self.index.get_tag_note(note["tag"]))
+                for note in self.index.tag_notes()
+                if note["tag"]
+            ]
 
             # Sort by total score
             entities.sort(key=lambda x: x["total_score"], reverse=True)
 
             self.logger.info(f"Calculated prominence for {len(entities)} entities")
-            return entities
+            self._all = entities
+            return list(entities)
 
     def get_top_entities(self, limit: int = 20, root: str = None) -> List[Dict]:
         """Get top N entities by prominence"""
@@ -124,35 +182,12 @@ class EntityProminenceCalculator:
         """Get entities with recent activity (rising stars)"""
         self.logger.info(f"Finding rising entities in last {days} days")
 
-        entities_with_recency = []
-
-        for md_file in self.vault_path.rglob("*.md"):
-            if any(part in md_file.parts for part in ["00-Inbox", "_system", ".obsidian"]):
-                continue
-
-            try:
-                with open(md_file, 'r', encoding='utf-8') as f:
-                    content = f.read(500)
-                    if 'type: tag-note' not in content:
-                        continue
-
-                tag_match = re.search(r'^tag:\s*(.+)$', content, re.MULTILINE)
-                if not tag_match:
-                    continue
-
-                entity = tag_match.group(1).strip()
-
-                # Check recent activity
-                recent_mentions = self._get_recent_mentions(entity, days)
-
-                if recent_mentions > 0:
-                    prominence = self.calculate_prominence(entity)
-                    if prominence:
-                        prominence["recent_mentions"] = recent_mentions
-                        entities_with_recency.append(prominence)
-
-            except:
-                pass
+        recent = self._get_recent_counts(days)
+        entities_with_recency = [
+            dict(prominence, recent_mentions=recent[prominence["entity"]])
+            for prominence in self.calculate_all_prominence()
+            if recent[prominence["entity"]] > 0
+        ]
 
         # Sort by recent mentions then total score
         entities_with_recency.sort(
@@ -173,23 +208,7 @@ class EntityProminenceCalculator:
 
     def _find_tag_note(self, entity: str) -> Path:
         """Find tag note file for entity"""
-        for md_file in self.vault_path.rglob("*.md"):
-            if any(part in md_file.parts for part in ["00-Inbox", "_system", ".obsidian"]):
-                continue
-
-            try:
-                with open(md_file, 'r', encoding='utf-8') as f:
-                    content = f.read(500)
-                    if 'type: tag-note' not in content:
-                        continue
-
-                    tag_match = re.search(r'^tag:\s*(.+)$', content, re.MULTILINE)
-                    if tag_match and tag_match.group(1).strip() == entity:
-                        return md_file
-            except:
-                pass
-
-        return None
+        return self.index.find_tag_note(entity)
 
     def _calculate_recency_score(self, entity: str) -> float:
         """Calculate recency score (recent activity = higher score)"""
@@ -200,84 +219,33 @@ class EntityProminenceCalculator:
 
     def _get_recent_mentions(self, entity: str, days: int) -> int:
         """Count mentions in recent conversations"""
-        cutoff = datetime.now() - timedelta(days=days)
-        count = 0
-
-        processed_dir = self.vault_path / "00-Inbox" / "processed"
-        if not processed_dir.exists():
-            return 0
-
-        for conv_file in processed_dir.glob("*.md"):
-            try:
-                with open(conv_file, 'r', encoding='utf-8') as f:
-                    content = f.read(1000)
-
-                # Check date
-                date_match = re.search(r'created:\s*(\d{4}-\d{2}-\d{2})', content)
-                if not date_match:
-                    continue
-
-                conv_date = datetime.strptime(date_match.group(1), "%Y-%m-%d")
-                if conv_date < cutoff:
-                    continue
-
-                # Check if entity mentioned
-                entities_match = re.search(r'entities:\s*\[(.*?)\]', content, re.DOTALL)
-                if entities_match:
-                    entities = [e.strip().strip('"').strip("'") for e in entities_match.group(1).split(',')]
-                    if entity in entities:
-                        count += 1
-
-            except:
-                pass
-
-        return count
+        return self._get_recent_counts(days)[entity]
 
     def _calculate_connection_score(self, entity: str) -> float:
         """Calculate connection score (how connected to other entities)"""
         # Count parent and child connections
-        tag_file = self._find_tag_note(entity)
-        if not tag_file:
+        note = self.index.get_tag_note(entity)
+        if not note:
             return 0
 
-        try:
-            with open(tag_file, 'r', encoding='utf-8') as f:
-                content = f.read(1000)
+        parent_count = len(note["parent_tags"])
 
-            parent_match = re.search(r'parent_tags:\s*\[(.*?)\]', content)
-            parent_count = 0
-            if parent_match:
-                parents = [p.strip() for p in parent_match.group(1).split(',') if p.strip()]
-                parent_count = len(parents)
+        # Count children (entities that list this as parent)
+        children = self._get_children().get(entity, set())
+        child_count = len(children - {id(note)})
 
-            # Count children (entities that list this as parent)
-            child_count = 0
-            for md_file in self.vault_path.rglob("*.md"):
-                if md_file == tag_file:
-                    continue
+        # Score: 1 point per parent, 3 points per child (being a parent is more central)
+        return (parent_count * 1.0) + (child_count * 3.0)
 
-                if any(part in md_file.parts for part in ["00-Inbox", "_system", ".obsidian"]):
-                    continue
+    def _calculate_centrality_score(self, entity: str) -> Tuple[float, float]:
+        """(PageRank, points) - points only for entities above the average rank"""
+        centrality = self.get_centrality()
+        if not centrality:
+            return 0.0, 0.0
 
-                try:
-                    with open(md_file, 'r', encoding='utf-8') as f:
-                        child_content = f.read(500)
-                        if 'type: tag-note' not in child_content:
-                            continue
-
-                        child_parent_match = re.search(r'parent_tags:\s*\[(.*?)\]', child_content)
-                        if child_parent_match:
-                            child_parents = [p.strip() for p in child_parent_match.group(1).split(',')]
-                            if entity in child_parents:
-                                child_count += 1
-                except:
-                    pass
-
-            # Score: 1 point per parent, 3 points per child (being a parent is more central)
-            return (parent_count * 1.0) + (child_count * 3.0)
-
-        except:
-            return 0
+        pagerank = centrality["scores"].get(node_key(entity), 0.0)
+        relative = pagerank * centrality["nodes"]
+        return pagerank, max(relative - 1.0, 0.0) * CENTRALITY_POINTS
 
     def _categorize_prominence(self, score: float) -> str:
         """Categorize prominence level"""
@@ -336,6 +304,23 @@ class EntityProminenceCalculator:
                     report += f"score: {entity['total_score']}\n"
                 report += "\n"
 
+            # Most central entities (PageRank)
+            centrality = self.get_centrality()
+            if centrality:
+                central = sorted(all_entities, key=lambda e: e["breakdown"]["pagerank"], reverse=True)
+                report += "## Most Central Entities (PageRank)\n\n"
+                report += f"*{centrality['nodes']} nodes, {centrality['edges']} edges, "
+                report += f"{centrality['iterations']} iterations"
+                report += f"{' (warm start)' if centrality['warm_start'] else ''}*\n\n"
+                report += "| Rank | Entity | PageRank | vs. Average | Centrality Score |\n"
+                report += "|------|--------|----------|-------------|------------------|\n"
+                for i, entity in enumerate(central[:10], 1):
+                    pagerank = entity["breakdown"]["pagerank"]
+                    report += f"| {i} | **{entity['entity']}** | {pagerank} | "
+                    report += f"{round(pagerank * centrality['nodes'], 2)}x | "
+                    report += f"{entity['breakdown']['centrality_score']} |\n"
+                report += "\n"
+
             # By category
             report += "## Entities by Category\n\n"
             by_category = defaultdict(list)
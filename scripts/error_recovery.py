@@ -10,6 +10,7 @@ from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional, Callable, Any
 from logger_setup import get_logger
+from atomic_write import write_json
 
 
 class ErrorRecovery:
@@ -197,14 +198,8 @@ class ErrorRecovery:
             if backup and file_path.exists():
                 self.backup_file(file_path, label="pre_write")
 
-            # Write to temporary file first
-            temp_path = file_path.with_suffix(".tmp")
-
-            with open(temp_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
-
-            # Atomic rename
-            temp_path.replace(file_path)
+            # Temp file + fsync + atomic rename
+            write_json(file_path, data, fsync=True, indent=2)
 
             self.logger.info(f"Safely wrote JSON: {file_path}")
             return True
@@ -5,12 +5,12 @@ Exports metrics and statistics for dashboard visualization
 """
 
 import json
-import re
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple
-from collections import defaultdict
 from logger_setup import get_logger, TimedOperation
+from vault_index import VaultIndex
+from metric_aggregates import MetricCounters, MetricAggregates, weekly_counts
 
 
 class BrainDataExporter:
@@ -19,20 +19,41 @@ class BrainDataExporter:
     def __init__(self, vault_path: Path):
         self.vault_path = Path(vault_path)
         self.logger = get_logger(__name__, str(vault_path))
+        self.index = VaultIndex(self.vault_path)
         self.output_file = self.vault_path / "_system" / "brain-space-data.json"
 
-    def export_all(self) -> Dict:
-        """Export all metrics"""
+    def load_counters(self) -> MetricCounters:
+        """Aggregate every tag note and conversation once into metric counters"""
+        return MetricCounters.from_records(self.index.tag_notes(), self.index.conversations())
+
+    def export_all(self, incremental: bool = False) -> Dict:
+        """
+        Export all metrics
+
+        Args:
+            incremental: Use the aggregates maintained by the pipeline
+                         (metric_aggregates.py) instead of a full recompute
+        """
         with TimedOperation(self.logger, "Exporting brain space data"):
-            data = {
-                "generated_at": datetime.now().isoformat(),
-                "metrics": self.get_basic_metrics(),
-                "time_distribution": self.get_time_distribution(),
-                "growth_trends": self.get_growth_trends(),
-                "hub_entities": self.get_hub_entities(),
-                "recent_activity": self.get_recent_conversations(limit=10),
-                "tag_statistics": self.get_tag_statistics()
-            }
+            if incremental:
+                counters = MetricAggregates(self.vault_path)
+                counters.ensure_built()
+            else:
+                counters = self.load_counters()
+
+            try:
+                data = {
+                    "generated_at": datetime.now().isoformat(),
+                    "metrics": self.get_basic_metrics(counters),
+                    "time_distribution": self.get_time_distribution(counters),
+                    "growth_trends": self.get_growth_trends(counters),
+                    "hub_entities": self.get_hub_entities(counters=counters),
+                    "recent_activity": self.get_recent_conversations(limit=10, counters=counters),
+                    "tag_statistics": self.get_tag_statistics(counters)
+                }
+            finally:
+                if incremental:
+                    counters.close()
 
             # Write to file
             with open(self.output_file, 'w', encoding='utf-8') as f:
@@ -41,91 +62,33 @@ class BrainDataExporter:
             self.logger.info(f"Exported data to {self.output_file}")
             return data
 
-    def get_basic_metrics(self) -> Dict:
+    def get_basic_metrics(self, counters: MetricCounters = None) -> Dict:
         """Get high-level metrics"""
         self.logger.info("Calculating basic metrics")
 
-        processed_dir = self.vault_path / "00-Inbox" / "processed"
-        conversation_count = len(list(processed_dir.glob("*.md"))) if processed_dir.exists() else 0
-
-        # Count tag notes (any .md file with type: tag-note)
-        tag_note_count = 0
-        total_time_minutes = 0
-
-        for md_file in self.vault_path.rglob("*.md"):
-            if any(part in md_file.parts for part in ["00-Inbox", "_system", ".obsidian"]):
-                continue
-
-            try:
-                with open(md_file, 'r', encoding='utf-8') as f:
-                    content = f.read(1000)  # Read first 1000 chars
-                    if 'type: tag-note' in content:
-                        tag_note_count += 1
+        if counters is None:
+            counters = self.load_counters()
 
-                        # Extract time from frontmatter
-                        time_match = re.search(r'total_time_minutes:\s*(\d+(?:\.\d+)?)', content)
-                        if time_match:
-                            total_time_minutes += float(time_match.group(1))
-            except:
-                pass
-
-        # Count areas (unique root categories from tag notes)
-        areas = self._count_areas()
+        total_time_minutes = counters.total("time_minutes")
 
         return {
-            "total_conversations": conversation_count,
-            "total_tag_notes": tag_note_count,
-            "total_areas": len(areas),
+            "total_conversations": int(counters.total("conversations")),
+            "total_tag_notes": int(counters.total("tag_notes")),
+            # Unique root categories from tag notes
+            "total_areas": len(counters.get("area_count")),
             "total_time_hours": round(total_time_minutes / 60, 1),
             "total_time_minutes": round(total_time_minutes, 1)
         }
 
-    def _count_areas(self) -> set:
-        """Count unique root areas"""
-        areas = set()
-
-        for md_file in self.vault_path.rglob("*.md"):
-            if any(part in md_file.parts for part in ["00-Inbox", "_system", ".obsidian"]):
-                continue
-
-            try:
-                with open(md_file, 'r', encoding='utf-8') as f:
-                    content = f.read(500)
-                    if 'type: tag-note' in content:
-                        root_match = re.search(r'root:\s*(\w+)', content)
-                        if root_match:
-                            areas.add(root_match.group(1))
-            except:
-                pass
-
-        return areas
-
-    def get_time_distribution(self) -> List[Dict]:
+    def get_time_distribution(self, counters: MetricCounters = None) -> List[Dict]:
         """Get time spent per area/root"""
         self.logger.info("Calculating time distribution by area")
 
-        area_time = defaultdict(float)
+        if counters is None:
+            counters = self.load_counters()
 
-        for md_file in self.vault_path.rglob("*.md"):
-            if any(part in md_file.parts for part in ["00-Inbox", "_system", ".obsidian"]):
-                continue
-
-            try:
-                with open(md_file, 'r', encoding='utf-8') as f:
-                    content = f.read(1000)
-                    if 'type: tag-note' not in content:
-                        continue
-
-                    # Extract root and time
-                    root_match = re.search(r'root:\s*(\w+)', content)
-                    time_match = re.search(r'total_time_minutes:\s*(\d+(?:\.\d+)?)', content)
-
-                    if root_match and time_match:
-                        root = root_match.group(1)
-                        time_min = float(time_match.group(1))
-                        area_time[root] += time_min
-            except:
-                pass
+        tracked_time = counters.get("area_time_tracked")
+        area_time = {area: tracked_time.get(area, 0) for area in counters.get("area_tracked")}
 
         # Convert to list format for treemap
         result = [
@@ -152,159 +115,75 @@ class BrainDataExporter:
         }
         return colors.get(area, "#7f7f7f")
 
-    def get_growth_trends(self) -> List[Dict]:
+    def get_growth_trends(self, counters: MetricCounters = None) -> List[Dict]:
         """Get entity/conversation growth over time"""
         self.logger.info("Calculating growth trends")
 
-        # Group conversations by week
-        weekly_counts = defaultdict(int)
-
-        processed_dir = self.vault_path / "00-Inbox" / "processed"
-        if not processed_dir.exists():
-            return []
+        if counters is None:
+            counters = self.load_counters()
 
-        for conv_file in processed_dir.glob("*.md"):
-            try:
-                with open(conv_file, 'r', encoding='utf-8') as f:
-                    content = f.read(500)
-
-                    # Extract created date
-                    date_match = re.search(r'created:\s*(\d{4}-\d{2}-\d{2})', content)
-                    if date_match:
-                        date = datetime.strptime(date_match.group(1), "%Y-%m-%d")
-                        week = date.strftime("%Y-W%W")
-                        weekly_counts[week] += 1
-            except:
-                pass
+        # Group conversations by week
+        weekly = weekly_counts(counters.expand("conversation_day"))
 
         # Convert to list
         result = [
             {"week": week, "count": count}
-            for week, count in sorted(weekly_counts.items())
+            for week, count in sorted(weekly.items())
         ]
 
         return result
 
-    def get_hub_entities(self, limit: int = 10) -> List[Dict]:
+    def get_hub_entities(self, limit: int = 10, counters: MetricCounters = None) -> List[Dict]:
         """Get most connected entities (by conversation count)"""
         self.logger.info("Finding hub entities")
 
-        entity_stats = defaultdict(lambda: {"count": 0, "time": 0, "root": "Unknown"})
-
-        for md_file in self.vault_path.rglob("*.md"):
-            if any(part in md_file.parts for part in ["00-Inbox", "_system", ".obsidian"]):
-                continue
-
-            try:
-                with open(md_file, 'r', encoding='utf-8') as f:
-                    content = f.read(1000)
-                    if 'type: tag-note' not in content:
-                        continue
-
-                    # Extract tag name, root, conversations, time
-                    tag_match = re.search(r'^tag:\s*(.+)$', content, re.MULTILINE)
-                    root_match = re.search(r'root:\s*(\w+)', content)
-                    conv_match = re.search(r'total_conversations:\s*(\d+)', content)
-                    time_match = re.search(r'total_time_minutes:\s*(\d+(?:\.\d+)?)', content)
-
-                    if tag_match:
-                        tag = tag_match.group(1).strip()
-                        entity_stats[tag]["count"] = int(conv_match.group(1)) if conv_match else 0
-                        entity_stats[tag]["time"] = float(time_match.group(1)) if time_match else 0
-                        entity_stats[tag]["root"] = root_match.group(1) if root_match else "Unknown"
-            except:
-                pass
-
-        # Sort by connection count
-        sorted_entities = sorted(
-            entity_stats.items(),
-            key=lambda x: x[1]["count"],
-            reverse=True
-        )[:limit]
+        if counters is None:
+            counters = self.load_counters()
 
+        # Sort by connection count (one entry per tag)
         result = [
             {
-                "name": tag,
-                "connections": stats["count"],
-                "time_hours": round(stats["time"] / 60, 1),
-                "root": stats["root"]
+                "name": row["tag"],
+                "connections": row["conversations"],
+                "time_hours": round(row["time_minutes"] / 60, 1),
+                "root": row["root"] or "Unknown"
             }
-            for tag, stats in sorted_entities
+            for row in counters.top_entities(limit, by="conversations", distinct=True)
         ]
 
         return result
 
-    def get_recent_conversations(self, limit: int = 10) -> List[Dict]:
+    def get_recent_conversations(self, limit: int = 10, counters: MetricCounters = None) -> List[Dict]:
         """Get most recent conversations"""
         self.logger.info(f"Getting {limit} recent conversations")
 
-        conversations = []
-        processed_dir = self.vault_path / "00-Inbox" / "processed"
+        if counters is None:
+            counters = self.load_counters()
 
-        if not processed_dir.exists():
-            return []
+        # Most recent first
+        return [
+            {
+                "title": row["title"],
+                "date": row["created"],
+                "tags": row["tags"],
+                "file": Path(row["path"]).name
+            }
+            for row in counters.recent_conversations(limit)
+        ]
 
-        for conv_file in processed_dir.glob("*.md"):
-            try:
-                with open(conv_file, 'r', encoding='utf-8') as f:
-                    content = f.read(1000)
-
-                    title_match = re.search(r'^title:\s*"?(.+?)"?$', content, re.MULTILINE)
-                    date_match = re.search(r'created:\s*(\d{4}-\d{2}-\d{2})', content)
-                    tags_match = re.search(r'tags:\s*\[([^\]]+)\]', content)
-
-                    if date_match:
-                        conversations.append({
-                            "title": title_match.group(1) if title_match else conv_file.stem,
-                            "date": date_match.group(1),
-                            "tags": [t.strip() for t in tags_match.group(1).split(',')] if tags_match else [],
-                            "file": conv_file.name
-                        })
-            except:
-                pass
-
-        # Sort by date, most recent first
-        conversations.sort(key=lambda x: x["date"], reverse=True)
-        return conversations[:limit]
-
-    def get_tag_statistics(self) -> Dict:
+    def get_tag_statistics(self, counters: MetricCounters = None) -> Dict:
         """Get tag-level statistics"""
         self.logger.info("Calculating tag statistics")
 
-        stats = {
-            "by_root": defaultdict(int),
-            "by_depth": defaultdict(int),
-            "total_tags": 0
-        }
-
-        for md_file in self.vault_path.rglob("*.md"):
-            if any(part in md_file.parts for part in ["00-Inbox", "_system", ".obsidian"]):
-                continue
-
-            try:
-                with open(md_file, 'r', encoding='utf-8') as f:
-                    content = f.read(500)
-                    if 'type: tag-note' not in content:
-                        continue
+        if counters is None:
+            counters = self.load_counters()
 
-                    stats["total_tags"] += 1
-
-                    root_match = re.search(r'root:\s*(\w+)', content)
-                    depth_match = re.search(r'depth:\s*(\d+)', content)
-
-                    if root_match:
-                        stats["by_root"][root_match.group(1)] += 1
-                    if depth_match:
-                        depth = depth_match.group(1)
-                        stats["by_depth"][f"depth_{depth}"] += 1
-            except:
-                pass
-
-        # Convert defaultdicts to regular dicts
         return {
-            "by_root": dict(stats["by_root"]),
-            "by_depth": dict(stats["by_depth"]),
-            "total_tags": stats["total_tags"]
+            "by_root": {root: int(count) for root, count in counters.get("area_count").items()},
+            "by_depth": {
+                f"depth_{d}": count for d, count in sorted(counters.expand("depth"), key=lambda x: int(x[0]))
+            },
+            "total_tags": int(counters.total("tag_notes"))
         }
 
 
@@ -316,10 +195,13 @@ def main():
                        help="Path to vault")
     parser.add_argument("--output", type=str, help="Override output file")
 
+    parser.add_argument("--incremental", action="store_true",
+                       help="Use the aggregates maintained by the pipeline instead of a full recompute")
+
     args = parser.parse_args()
 
     exporter = BrainDataExporter(Path(args.vault))
-    data = exporter.export_all()
+    data = exporter.export_all(incremental=args.incremental)
 
     if args.output:
         with open(args.output, 'w') as f:
@@ -3,116 +3,297 @@
 The Second Brain - File Watcher
 Monitors raw-conversations folder for new unprocessed files and prepares them for processing.
 
-Version: 1.2
-Updated: 2025-11-08
+Version: 1.3
+Updated: 2026-10-17
 """
 
 import os
 import sys
 import json
 import time
+import queue
 import subprocess
 import re
 import threading
-from datetime import datetime
 from pathlib import Path
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 
+try:
+    from scripts.processing_queue import ProcessingQueue, conversation_key
+except ImportError:
+    from processing_queue import ProcessingQueue, conversation_key
+
 
 class QueueMonitor(threading.Thread):
-    """Monitors the processing queue and displays real-time agent status."""
+    """Monitors the processing queue journal and displays real-time agent status."""
 
-    def __init__(self, queue_path):
+    def __init__(self, queue):
         super().__init__(daemon=True)
-        self.queue_path = Path(queue_path)
+        self.queue = queue
         self.running = True
         self.last_status = None
-        self.last_mtime = 0
 
     def run(self):
-        """Monitor queue file for changes and display updates."""
+        """Tail the queue journal and display new state changes."""
+        # Skip history; only report changes from now on
+        self.queue.refresh()
+
         while self.running:
             try:
-                # Check if queue file was modified
-                current_mtime = self.queue_path.stat().st_mtime
+                for record in self.queue.refresh():
+                    self._show(record)
+            except Exception:
+                # Journal might not exist yet
+                pass
 
-                if current_mtime != self.last_mtime:
-                    self.last_mtime = current_mtime
-                    self._check_queue_status()
+            time.sleep(2)  # Check every 2 seconds
 
-                time.sleep(2)  # Check every 2 seconds
+    def _show(self, record):
+        """Display one journal record."""
+        event = record.get("event")
+        filename = record.get("file", "Unknown")
 
-            except Exception as e:
-                # Queue file might not exist yet
-                time.sleep(5)
+        if event in ("processing", "stage"):
+            stage = record.get("stage") or "Unknown"
+            state = self.queue.files.get(conversation_key(filename), {})
+            started = state.get("started_at", record.get("ts", "Unknown"))
 
-    def _check_queue_status(self):
-        """Parse queue file and display current status."""
-        try:
-            with open(self.queue_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            status_msg = f"📋 AGENT STATUS: Processing {filename}\n    Stage: {stage}\n    Started: {started}"
 
-            # Extract "Currently Processing" section
-            processing_match = re.search(
-                r'## Currently Processing\s*\n\s*<!--.*?-->\s*\n(.*?)(?=\n---|\n##|$)',
-                content,
-                re.DOTALL
-            )
+            if status_msg != self.last_status:
+                print(f"\n{'─'*60}")
+                print(status_msg)
+                print(f"{'─'*60}\n")
+                self.last_status = status_msg
 
-            if processing_match and processing_match.group(1).strip():
-                processing_text = processing_match.group(1).strip()
+        elif event == "completed":
+            print(f"\n{'═'*60}")
+            print(f"✅ COMPLETED: {filename}\n    Time: {record.get('ts')}\n    Status: ✅ Success")
+            print(f"{'═'*60}\n")
 
-                # Parse processing details
-                file_match = re.search(r'^-\s+(\S+)', processing_text, re.MULTILINE)
-                stage_match = re.search(r'^\s*-\s*\*\*Stage\*\*:\s*(.+?)$', processing_text, re.MULTILINE)
-                started_match = re.search(r'^\s*-\s*\*\*Started\*\*:\s*(.+?)$', processing_text, re.MULTILINE)
+        elif event == "failed":
+            print(f"\n{'═'*60}")
+            print(f"[X] FAILED: {filename}\n    Time: {record.get('ts')}\n    Error: {record.get('error')}")
+            print(f"{'═'*60}\n")
 
-                if file_match:
-                    filename = file_match.group(1)
-                    stage = stage_match.group(1) if stage_match else "Unknown"
-                    started = started_match.group(1) if started_match else "Unknown"
+    def stop(self):
+        """Stop the monitor thread."""
+        self.running = False
 
-                    status_msg = f"📋 AGENT STATUS: Processing {filename}\n    Stage: {stage}\n    Started: {started}"
 
-                    if status_msg != self.last_status:
-                        print(f"\n{'─'*60}")
-                        print(status_msg)
-                        print(f"{'─'*60}\n")
-                        self.last_status = status_msg
+class BatchDebouncer(threading.Thread):
+    """
+    Turns a stream of file events into batches.
 
-            # Check for completed files (new completions)
-            completed_section = re.search(
-                r'## Completed \(Last 24 Hours\)(.*?)(?=\n---|\n##|$)',
-                content,
-                re.DOTALL
-            )
+    Watchdog callbacks (and the optional poller) only put (kind, path) tuples
+    on a queue. This thread tracks every pending file and treats it as
+    complete once a close-write/move event arrived or its size and mtime
+    stayed unchanged for `stability_interval`. A batch closes when all
+    pending files are complete and no event arrived for `quiet_period`, when
+    it reaches `max_batch_files`, or (with whatever is complete) after
+    `max_wait`.
+    """
 
-            if completed_section:
-                # Look for very recent completions (within last minute)
-                recent_pattern = r'- \[x\]\s+(\S+)\s+\n\s+- \*\*Completed\*\*:\s+([^\n]+)\n\s+.*?\*\*Status\*\*:\s+(✅[^\n]+)'
-                for match in re.finditer(recent_pattern, completed_section.group(1)):
-                    filename = match.group(1)
-                    completed_time = match.group(2)
-                    status = match.group(3)
+    COMPLETE_EVENTS = ("closed", "moved")
 
-                    completion_msg = f"✅ COMPLETED: {filename}\n    Time: {completed_time}\n    {status}"
+    def __init__(self, events, on_batch, quiet_period=0.5, stability_interval=0.25,
+                 max_batch_files=50, max_wait=30.0):
+        super().__init__(daemon=True)
+        self.events = events
+        self.on_batch = on_batch
+        self.quiet_period = quiet_period
+        self.stability_interval = stability_interval
+        self.max_batch_files = max_batch_files
+        self.max_wait = max_wait
+        self.running = True
 
-                    # Only show if this is new (not in last_status)
-                    if self.last_status and filename not in str(self.last_status):
-                        print(f"\n{'═'*60}")
-                        print(completion_msg)
-                        print(f"{'═'*60}\n")
+        self.pending = {}  # path -> {"sig", "changed_at", "complete"}
+        self.last_event = None
+        self.opened_at = None
 
+    def _signature(self, path):
+        try:
+            st = path.stat()
+            return (st.st_size, st.st_mtime_ns)
+        except OSError:
+            return None
+
+    def _register(self, kind, path, now):
+        state = self.pending.get(path)
+        if state is None:
+            state = {"sig": self._signature(path), "changed_at": now, "complete": False}
+            self.pending[path] = state
+            if self.opened_at is None:
+                self.opened_at = now
+        if kind in self.COMPLETE_EVENTS:
+            state["complete"] = True
+        self.last_event = now
+
+    def _is_ready(self, path, state, now):
+        """Re-stat a pending file and decide whether it is fully written."""
+        sig = self._signature(path)
+        if sig is None:
+            return None  # vanished (renamed or deleted)
+        if sig != state["sig"]:
+            state["sig"] = sig
+            state["changed_at"] = now
+            return state["complete"] and sig[0] > 0
+        if state["complete"]:
+            return True
+        return sig[0] > 0 and now - state["changed_at"] >= self.stability_interval
+
+    def _flush(self, paths):
+        for path in paths:
+            self.pending.pop(path, None)
+        if not self.pending:
+            self.opened_at = None
+
+        try:
+            self.on_batch(sorted(paths))
         except Exception as e:
-            # Silently ignore parsing errors
-            pass
+            print(f"[X] Error processing batch: {e}")
+            import traceback
+            traceback.print_exc()
+
+    def run(self):
+        while self.running:
+            timeout = self.stability_interval / 2 if self.pending else 0.5
+            try:
+                kind, path = self.events.get(timeout=timeout)
+                now = time.monotonic()
+                self._register(kind, path, now)
+
+                # Drain whatever else arrived in the same burst
+                while True:
+                    kind, path = self.events.get_nowait()
+                    self._register(kind, path, now)
+            except queue.Empty:
+                pass
+
+            if not self.pending:
+                continue
+
+            now = time.monotonic()
+            ready = []
+            waiting = False
+            for path, state in list(self.pending.items()):
+                status = self._is_ready(path, state, now)
+                if status is None:
+                    del self.pending[path]
+                elif status:
+                    ready.append(path)
+                else:
+                    waiting = True
+
+            if not self.pending:
+                self.opened_at = None
+                continue
+
+            if not waiting and (
+                now - self.last_event >= self.quiet_period
+                or len(ready) >= self.max_batch_files
+            ):
+                self._flush(ready)
+            elif ready and now - self.opened_at >= self.max_wait:
+                self._flush(ready)
 
     def stop(self):
-        """Stop the monitor thread."""
         self.running = False
 
 
+class BatchScheduler(threading.Thread):
+    """
+    Size-aware admission of debounced files into the processing queue.
+
+    Files below `large_file_threshold` go to the interactive lane and are
+    queued as soon as they arrive, ahead of anything bulk. Larger files wait
+    in the bulk lane and are admitted only while the bytes in flight (queued
+    or processing in the journal) stay within `max_queued_bytes`; one bulk
+    file is always admitted when nothing is in flight so oversized files
+    still make progress. Waiting bulk files are re-checked every
+    `recheck_interval` seconds as the journal shows work finishing.
+    """
+
+    def __init__(self, queue, dispatch, folder, large_file_threshold=100000,
+                 max_queued_bytes=500000, recheck_interval=2.0):
+        super().__init__(daemon=True)
+        self.queue = queue
+        self.dispatch = dispatch
+        self.folder = folder
+        self.large_file_threshold = large_file_threshold
+        self.max_queued_bytes = max_queued_bytes
+        self.recheck_interval = recheck_interval
+        self.running = True
+
+        self.interactive = []
+        self.bulk = []  # (size, path) in arrival order
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+
+    @staticmethod
+    def _size(path):
+        try:
+            return path.stat().st_size
+        except OSError:
+            return None
+
+    def submit(self, files):
+        """Sort closed files into lanes and schedule a dispatch pass."""
+        with self._lock:
+            for path in files:
+                size = self._size(path)
+                if size is None:
+                    continue
+                if size < self.large_file_threshold:
+                    self.interactive.append(path)
+                else:
+                    self.bulk.append((size, path))
+        self._wake.set()
+
+    def pump(self):
+        """Dispatch the interactive lane, then as much bulk work as the byte cap allows."""
+        with self._lock:
+            interactive, self.interactive = self.interactive, []
+
+            admitted = []
+            if self.bulk:
+                in_flight = self.queue.in_flight_bytes(self.folder)
+                in_flight += sum(self._size(p) or 0 for p in interactive)
+                while self.bulk:
+                    size, path = self.bulk[0]
+                    if in_flight and in_flight + size > self.max_queued_bytes:
+                        break
+                    self.bulk.pop(0)
+                    admitted.append(path)
+                    in_flight += size
+
+        if interactive:
+            self.dispatch(interactive, "interactive")
+        if admitted:
+            self.dispatch(admitted, "bulk")
+
+    @property
+    def waiting(self):
+        with self._lock:
+            return len(self.interactive) + len(self.bulk)
+
+    def run(self):
+        while self.running:
+            self._wake.wait(self.recheck_interval)
+            self._wake.clear()
+            if not self.waiting:
+                continue
+            try:
+                self.pump()
+            except Exception as e:
+                print(f"[X] Error scheduling files: {e}")
+
+    def stop(self):
+        self.running = False
+        self._wake.set()
+
+
 class ConversationFileHandler(FileSystemEventHandler):
     """Handler for detecting new conversation files."""
 
@@ -121,15 +302,30 @@ class ConversationFileHandler(FileSystemEventHandler):
         self.queue_path = Path(queue_path)
         self.raw_conversations_path = Path(raw_conversations_path)
         self.config = self.load_config()
+        self.queue = ProcessingQueue(self.raw_conversations_path.parent.parent, view_path=self.queue_path)
         self.processing_batch = []
-        self.batch_timeout = 5  # Wait 5 seconds for more files before processing batch
         self.last_file_time = None
         self.seen_files = set()  # Track files we've already seen (for polling)
+        self.queued_files = set()  # Files already handed to a batch
+        self.events = queue.Queue()  # (kind, path) from watchdog callbacks and the poller
+        self.agent_active = threading.Event()  # at most one processing agent at a time
+
+        watcher_config = self.config.get("file_watcher", {})
+        self.batch_timeout = watcher_config.get("quiet_period_seconds", 0.5)
+        self.stability_interval = watcher_config.get("stability_interval_seconds", 0.25)
+        self.max_batch_files = watcher_config.get("max_batch_files", 50)
+
+        # Watchdog's native backends are event-driven; polling is only a
+        # fallback for Windows, where ReadDirectoryChangesW can drop events
+        default_poll = 3.0 if sys.platform == "win32" else 0
+        self.poll_interval = watcher_config.get("poll_interval_seconds", default_poll)
 
         print(f"[#] Configuration loaded:")
         print(f"    - Batch threshold: {self.config['batch_processing']['min_file_count']} files")
         print(f"    - Large file threshold: {self.config['batch_processing']['large_file_threshold_chars']:,} chars")
-        print(f"    - Batch timeout: {self.batch_timeout}s")
+        print(f"    - Queued bytes cap (bulk lane): {self.config['batch_processing']['total_batch_threshold_chars']:,}")
+        print(f"    - Quiet period: {self.batch_timeout}s")
+        print(f"    - Polling: {f'every {self.poll_interval}s' if self.poll_interval else 'off (event-driven)'}")
 
         # Initialize seen_files with existing files
         self._scan_existing_files()
@@ -150,47 +346,88 @@ class ConversationFileHandler(FileSystemEventHandler):
                 }
             }
 
-    def on_created(self, event):
-        """Called when a file is created."""
-        if event.is_directory:
+    @staticmethod
+    def _is_conversation_file(file_path):
+        """Only files starting with "unprocessed_" and ending with ".md" are queued."""
+        return file_path.name.startswith("unprocessed_") and file_path.suffix == ".md"
+
+    def _enqueue(self, kind, src_path):
+        """Hand an event to the debouncer; never blocks the observer thread."""
+        file_path = Path(src_path)
+        if not self._is_conversation_file(file_path) or file_path in self.queued_files:
             return
 
-        file_path = Path(event.src_path)
-        print(f"[DEBUG] on_created event: {file_path.name}")
+        if file_path.name not in self.seen_files:
+            self.seen_files.add(file_path.name)
+            print(f"\n[+] Detected new file: {file_path.name}")
 
-        # Only process files starting with "unprocessed_" and ending with ".md"
-        if file_path.name.startswith("unprocessed_") and file_path.suffix == ".md":
-            self._add_file_to_batch(file_path)
+        self.events.put((kind, file_path))
 
-    def on_modified(self, event):
-        """Called when a file is modified (Windows fallback)."""
-        if event.is_directory:
-            return
+    def on_created(self, event):
+        """Called when a file is created."""
+        if not event.is_directory:
+            self._enqueue("created", event.src_path)
 
-        file_path = Path(event.src_path)
-        print(f"[DEBUG] on_modified event: {file_path.name}")
+    def on_modified(self, event):
+        """Called when a file is modified."""
+        if not event.is_directory:
+            self._enqueue("modified", event.src_path)
+
+    def on_closed(self, event):
+        """Called when a file opened for writing is closed (inotify close-write)."""
+        if not event.is_directory:
+            self._enqueue("closed", event.src_path)
+
+    def on_moved(self, event):
+        """Called when a file is renamed into place (e.g. browser downloads)."""
+        if not event.is_directory:
+            self._enqueue("moved", event.dest_path)
+
+    def create_debouncer(self):
+        """Debouncer thread that feeds closed batches to process_batch."""
+        return BatchDebouncer(
+            self.events,
+            self.queue_batch,
+            quiet_period=self.batch_timeout,
+            stability_interval=self.stability_interval,
+            max_batch_files=self.max_batch_files
+        )
+
+    def create_scheduler(self):
+        """Lane scheduler between the debouncer and the processing queue."""
+        batch_config = self.config.get("batch_processing", {})
+        self.scheduler = BatchScheduler(
+            self.queue,
+            self.dispatch_lane,
+            self.raw_conversations_path,
+            large_file_threshold=batch_config.get("large_file_threshold_chars", 100000),
+            max_queued_bytes=batch_config.get("total_batch_threshold_chars", 500000)
+        )
+        return self.scheduler
+
+    def queue_batch(self, files):
+        """Hand a batch closed by the debouncer to the lane scheduler."""
+        for file_path in files:
+            self.queued_files.add(file_path)
+            self.seen_files.add(file_path.name)
+        self.scheduler.submit(files)
 
-        # Only process files starting with "unprocessed_" and ending with ".md"
-        # Check if already in batch to avoid duplicates
-        if file_path.name.startswith("unprocessed_") and file_path.suffix == ".md":
-            if file_path not in self.processing_batch:
-                self._add_file_to_batch(file_path)
+    def dispatch_lane(self, files, lane):
+        """Queue files admitted by the scheduler."""
+        for file_path in files:
+            self._add_file_to_batch(file_path)
+        self.process_batch(lane)
 
     def _add_file_to_batch(self, file_path):
         """Add a file to the processing batch."""
-        print(f"\n[+] Detected new file: {file_path.name}")
-
-        # Wait briefly for file write to complete
-        time.sleep(0.5)
+        if file_path in self.processing_batch:
+            return
 
-        # Add to batch and set timer
         self.processing_batch.append(file_path)
+        self.queued_files.add(file_path)
+        self.seen_files.add(file_path.name)
         self.last_file_time = time.time()
 
-        # Start monitoring for batch
-        print(f"    Added to batch (currently {len(self.processing_batch)} file(s))")
-        print(f"    Waiting {self.batch_timeout}s for more files...")
-
     def _scan_existing_files(self):
         """Scan directory for existing files to avoid reprocessing."""
         try:
@@ -203,35 +440,36 @@ class ConversationFileHandler(FileSystemEventHandler):
     def poll_for_new_files(self):
         """Manually poll for new files (Windows fallback)."""
         try:
-            for file_path in self.raw_conversations_path.glob("unprocessed_*.md"):
-                if file_path.name not in self.seen_files:
-                    print(f"[POLL] Found new file: {file_path.name}")
-                    self.seen_files.add(file_path.name)
-                    if file_path not in self.processing_batch:
-                        self._add_file_to_batch(file_path)
+            with os.scandir(self.raw_conversations_path) as entries:
+                for entry in entries:
+                    if entry.name not in self.seen_files and entry.is_file():
+                        file_path = Path(entry.path)
+                        if self._is_conversation_file(file_path):
+                            print(f"[POLL] Found new file: {file_path.name}")
+                            self._enqueue("created", file_path)
         except Exception as e:
             print(f"[!] Error polling for files: {e}")
 
-    def check_and_process_batch(self):
-        """Check if batch is ready to process."""
-        if not self.processing_batch:
-            return
+    def start_poller(self, stop_event):
+        """Start the polling fallback thread if this platform needs it."""
+        if not self.poll_interval:
+            return None
 
-        if self.last_file_time is None:
-            return
+        def poll():
+            while not stop_event.wait(self.poll_interval):
+                self.poll_for_new_files()
 
-        # Check if timeout has passed
-        time_since_last = time.time() - self.last_file_time
-        if time_since_last >= self.batch_timeout:
-            self.process_batch()
+        poller = threading.Thread(target=poll, daemon=True)
+        poller.start()
+        return poller
 
-    def process_batch(self):
+    def process_batch(self, lane=None):
         """Process the current batch of files."""
         if not self.processing_batch:
             return
 
         print(f"\n{'='*60}")
-        print(f"[~] Processing batch of {len(self.processing_batch)} file(s)...")
+        print(f"[~] Processing {lane + ' ' if lane else ''}batch of {len(self.processing_batch)} file(s)...")
         print(f"{'='*60}")
 
         # Calculate batch statistics
@@ -260,7 +498,7 @@ class ConversationFileHandler(FileSystemEventHandler):
         batch_mode = self.determine_batch_mode(files_to_queue, total_size)
 
         # Update processing queue
-        self.update_processing_queue(files_to_queue, batch_mode, total_size)
+        self.update_processing_queue(files_to_queue, batch_mode, total_size, lane)
 
         # Clear batch
         self.processing_batch = []
@@ -268,6 +506,8 @@ class ConversationFileHandler(FileSystemEventHandler):
 
         print(f"\n[✓] Batch queuing complete!")
         print(f"    Mode: {batch_mode}")
+        if lane:
+            print(f"    Lane: {lane}")
         print(f"    Files: {len(files_to_queue)}")
         print(f"    Total size: {total_size:,} bytes ({total_size/1000:.1f} KB)")
         print(f"\n[i] Files remain as 'unprocessed_*.md' until agent starts processing.")
@@ -298,70 +538,19 @@ class ConversationFileHandler(FileSystemEventHandler):
 
         return "Single"
 
-    def update_processing_queue(self, files, mode, total_size):
-        """Update the processing-queue.md file."""
+    def update_processing_queue(self, files, mode, total_size, lane=None):
+        """Journal the batch and re-render processing-queue.md."""
         try:
-            timestamp = datetime.now().isoformat()
-
-            # Read current queue
-            with open(self.queue_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            # Find the marker
-            marker = "<!-- File watcher will add entries here automatically -->"
-
-            if marker not in content:
-                print("[!] Warning: Could not find marker in processing-queue.md")
-                print("    Files renamed but queue not updated.")
-                return
-
-            # Build the new entry
-            entry_lines = [
-                f"\n\n### Batch Added: {timestamp}\n",
-                f"**Mode**: {mode}",
-                f"**File count**: {len(files)}",
-                f"**Total Size**: {total_size:,} bytes\n",
-                "**Files**:"
-            ]
-
-            for file_path in files:
-                entry_lines.append(f"- [ ] {file_path.name}")
-
-            entry = "\n".join(entry_lines) + "\n"
-
-            # Insert entry after marker
-            parts = content.split(marker, 1)
-            content = parts[0] + marker + entry + (parts[1] if len(parts) > 1 else "")
-
-            # Update queue status
-            content = content.replace(
-                '**Queue Status**: Empty ✅',
-                f'**Queue Status**: {len(files)} file(s) awaiting processing ⏳'
-            )
-
-            # Update last check timestamp
-            if '**Last Check**: Never' in content:
-                content = content.replace(
-                    '**Last Check**: Never',
-                    f'**Last Check**: {timestamp}'
-                )
-            else:
-                # Find and replace any existing timestamp
-                import re
-                content = re.sub(
-                    r'\*\*Last Check\*\*: [^\n]+',
-                    f'**Last Check**: {timestamp}',
-                    content
-                )
-
-            # Write back to queue
-            with open(self.queue_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            self.queue.enqueue_batch(files, mode, total_size, lane=lane)
+            self.queue.render()
 
             print(f"[*] Updated processing queue: {len(files)} file(s) added")
 
-            # Spawn the processing pipeline agent
-            self.spawn_processing_agent()
+            # A running agent picks new files up from the queue itself
+            if self.agent_active.is_set():
+                print(f"[i] Processing agent already running; it will pick these up")
+            else:
+                self.spawn_processing_agent()
 
         except Exception as e:
             print(f"[X] Error updating processing queue: {e}")
@@ -371,6 +560,7 @@ class ConversationFileHandler(FileSystemEventHandler):
     def spawn_processing_agent(self):
         """Open Claude Code terminal for manual activation (simple & reliable)."""
         vault_dir = self.raw_conversations_path.parent.parent
+        self.agent_active.set()
 
         print(f"\n{'='*60}")
         print(f"[!] NEW CONVERSATIONS READY")
@@ -474,6 +664,7 @@ class ConversationFileHandler(FileSystemEventHandler):
                         # Remove the completion signal file
                         signal_file.unlink()
                         print(f"\n[✓] Completion signal removed")
+                        self.agent_active.clear()
 
                         # Notify user to close Claude session
                         print(f"\n{'─'*70}")
@@ -491,6 +682,11 @@ class ConversationFileHandler(FileSystemEventHandler):
                         except:
                             pass
 
+                        # Files admitted while the agent was finishing up
+                        if self.queue.pending():
+                            print(f"[*] Files still queued, opening a new agent session...")
+                            self.spawn_processing_agent()
+
                         return
 
                     except Exception as e:
@@ -692,14 +888,14 @@ def main():
         print(f"    Using default configuration...")
 
     if not queue_path.exists():
-        print(f"[X] Error: processing-queue.md not found at {queue_path}")
-        print(f"    Please ensure the vault structure is set up correctly.")
-        return
+        print(f"[!] processing-queue.md not found, rendering it from the queue journal...")
+        ProcessingQueue(vault_path, view_path=queue_path).render()
 
     print()
 
     # Set up file system observer
     event_handler = ConversationFileHandler(config_path, queue_path, raw_conversations_path)
+    scheduler = event_handler.create_scheduler()
     observer = Observer()
     observer.schedule(event_handler, str(raw_conversations_path), recursive=False)
     observer.start()
@@ -714,45 +910,43 @@ def main():
             print(f"    - {f.name}")
 
         print(f"\n[*] Triggering agent to process existing files...")
-        # Add to batch and trigger processing
-        for f in existing_unprocessed:
-            event_handler._add_file_to_batch(f)
-
-        # Force immediate processing (don't wait for timeout)
-        if event_handler.processing_batch:
-            event_handler.process_batch()
+        # Hand them to the scheduler (queued as soon as it starts)
+        event_handler.queue_batch(existing_unprocessed)
     else:
         print(f"[i] No existing unprocessed files found")
 
     # Start queue monitor for real-time agent status
-    queue_monitor = QueueMonitor(queue_path)
+    queue_monitor = QueueMonitor(ProcessingQueue(vault_path, view_path=queue_path))
     queue_monitor.start()
 
+    # Event pipeline: observer/poller -> queue -> debouncer -> scheduler -> process_batch
+    scheduler.start()
+    debouncer = event_handler.create_debouncer()
+    debouncer.start()
+    stop_polling = threading.Event()
+    event_handler.start_poller(stop_polling)
+
     print()
     print("[✓] File watcher is running!")
     print(f"    Press Ctrl+C to stop")
     print()
     print("Monitoring for new conversation files...")
-    print("    (Using both file system events + polling for Windows compatibility)")
+    if event_handler.poll_interval:
+        print("    (Using both file system events + polling for Windows compatibility)")
+    else:
+        print("    (Using file system events)")
     print("    (Monitoring processing queue for agent status updates)")
     print("-" * 60)
 
     try:
-        poll_counter = 0
-        while True:
-            time.sleep(1)
-            poll_counter += 1
-
-            # Poll for new files every 3 seconds (Windows fallback)
-            if poll_counter >= 3:
-                event_handler.poll_for_new_files()
-                poll_counter = 0
-
-            # Check if batch needs processing
-            event_handler.check_and_process_batch()
+        while observer.is_alive():
+            observer.join(1)
 
     except KeyboardInterrupt:
         print("\n\n[-] Stopping file watcher...")
+        stop_polling.set()
+        debouncer.stop()
+        scheduler.stop()
         queue_monitor.stop()
         observer.stop()
         observer.join()
@@ -7,8 +7,15 @@ import yaml
 from pathlib import Path
 import sys
 
+try:
+    from scripts.atomic_write import VaultWriter
+    from scripts.frontmatter_parser import is_tag_note
+except ImportError:
+    from atomic_write import VaultWriter
+    from frontmatter_parser import is_tag_note
 
-def fix_tag_note_path(tag_note_path: Path, vault_path: Path):
+
+def fix_tag_note_path(tag_note_path: Path, vault_path: Path, writer: VaultWriter = None):
     """Fix the path field in a tag note's frontmatter"""
 
     # Read content
@@ -56,7 +63,9 @@ def fix_tag_note_path(tag_note_path: Path, vault_path: Path):
             f'---\n{new_frontmatter}\n---'
         )
 
-        tag_note_path.write_text(new_content, encoding='utf-8')
+        if writer is None:
+            writer = VaultWriter(vault_path, fsync="none", journal=False)
+        writer.write_text(tag_note_path, new_content)
 
         print(f"[+] {tag_note_path.name}")
         print(f"    Old: {current_path}")
@@ -95,12 +104,8 @@ def main():
             continue
 
         # Check if it's a tag note
-        try:
-            content = md_file.read_text(encoding='utf-8')
-            if 'type: tag-note' in content[:500]:
-                tag_notes.append(md_file)
-        except Exception as e:
-            pass
+        if is_tag_note(md_file):
+            tag_notes.append(md_file)
 
     print(f"[i] Found {len(tag_notes)} tag note(s)\n")
 
@@ -124,9 +129,10 @@ def main():
 
     # Fix all tag notes
     fixed_count = 0
-    for tag_note in tag_notes:
-        if fix_tag_note_path(tag_note, vault_path):
-            fixed_count += 1
+    with VaultWriter(vault_path) as writer:
+        for tag_note in tag_notes:
+            if fix_tag_note_path(tag_note, vault_path, writer):
+                fixed_count += 1
 
     print(f"\n{'='*60}")
     print(f"[+] Complete: {fixed_count}/{len(tag_notes)} tag notes updated")
@@ -4,19 +4,171 @@ Frontmatter Parser Utility
 Robust YAML frontmatter parser and writer for markdown files
 """
 
+import os
+import copy
+import time
+import threading
 import yaml
 import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Tuple, Optional
-from logger_setup import get_logger
+from typing import Callable, Dict, List, Tuple, Optional
+
+try:
+    from scripts.logger_setup import get_logger
+    from scripts.atomic_write import VaultWriter, write_text
+except ImportError:
+    from logger_setup import get_logger
+    from atomic_write import VaultWriter, write_text
+
+# libyaml-backed loader when PyYAML was built with it (several times faster)
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+HEADER_CACHE_SIZE = 4096
+
+
+class FrontmatterHeader:
+    """
+    Parsed YAML header of a markdown file
+
+    Attributes:
+        path: File the header was read from
+        data: Frontmatter dict ({} when missing or invalid) - shared by the
+              cache, so treat it as read-only (read_frontmatter() returns a copy)
+        found: True if the file starts with a closed --- block
+        error: YAML error message, if the block did not parse
+        lines: Number of header lines including both --- fences
+    """
+
+    __slots__ = ("path", "data", "found", "error", "lines")
+
+    def __init__(self, path: Path, data: Dict = None, found: bool = False,
+                 error: Optional[str] = None, lines: int = 0):
+        self.path = path
+        self.data = data if data is not None else {}
+        self.found = found
+        self.error = error
+        self.lines = lines
+
+    @property
+    def valid(self) -> bool:
+        return self.found and self.error is None
+
+    def get(self, field: str, default=None):
+        return self.data.get(field, default)
+
+
+def _load_header(path: Path) -> FrontmatterHeader:
+    """Stream lines up to the closing --- and parse only that block"""
+    with open(path, 'r', encoding='utf-8') as f:
+        if f.readline().rstrip('\r\n') != '---':
+            return FrontmatterHeader(path)
+
+        lines = []
+        for line in f:
+            if line.rstrip('\r\n') == '---':
+                break
+            lines.append(line)
+        else:
+            return FrontmatterHeader(path)
+
+    try:
+        data = yaml.load(''.join(lines), Loader=YAML_LOADER)
+    except yaml.YAMLError as e:
+        return FrontmatterHeader(path, found=True, error=str(e), lines=len(lines) + 2)
+
+    if not isinstance(data, dict):
+        data = {}
+    return FrontmatterHeader(path, data, found=True, lines=len(lines) + 2)
+
+
+@lru_cache(maxsize=HEADER_CACHE_SIZE)
+def _cached_header(path: str, mtime_ns: int, size: int) -> FrontmatterHeader:
+    return _load_header(Path(path))
+
+
+def read_header(file_path: Path) -> FrontmatterHeader:
+    """
+    Read a file's frontmatter without reading its body
+
+    Results are cached by (path, mtime, size), so an unchanged file is parsed
+    once per process. Raises OSError / UnicodeDecodeError like open().
+    """
+    st = os.stat(file_path)
+    return _cached_header(os.fspath(file_path), st.st_mtime_ns, st.st_size)
+
+
+def read_frontmatter(file_path: Path) -> Dict:
+    """Frontmatter dict of a file ({} when missing or invalid), safe to modify"""
+    return copy.deepcopy(read_header(file_path).data)
+
+
+def is_tag_note(file_path: Path) -> bool:
+    """True if the file's frontmatter declares type: tag-note"""
+    try:
+        return read_header(file_path).data.get("type") == "tag-note"
+    except (OSError, UnicodeDecodeError):
+        return False
+
+
+def clear_header_cache():
+    _cached_header.cache_clear()
+
+
+BULK_OPERATIONS = ("set", "ensure", "delete", "rename")
+
+
+def apply_operations(frontmatter: Dict, operations: List[Tuple]) -> Tuple[Dict, List[Tuple]]:
+    """
+    Apply field operations to a copy of a frontmatter dict
+
+    Args:
+        frontmatter: Current frontmatter (not modified)
+        operations: (op, field, value) tuples applied in order:
+            ("set", field, value)      - set field to value
+            ("ensure", field, default) - set field only if missing
+            ("delete", field, None)    - remove field
+            ("rename", field, new)     - move field's value to `new`
+
+    Returns:
+        (new_frontmatter, changes) where changes are (field, old, new)
+        tuples; a missing value is reported as None
+    """
+    updated = copy.deepcopy(frontmatter)
+    missing = object()
+
+    for op, field, value in operations:
+        if op == "set":
+            updated[field] = copy.deepcopy(value)
+        elif op == "ensure":
+            if field not in updated:
+                updated[field] = copy.deepcopy(value)
+        elif op == "delete":
+            updated.pop(field, None)
+        elif op == "rename":
+            if field in updated and value != field:
+                updated[value] = updated.pop(field)
+        else:
+            raise ValueError(f"Unknown operation: {op} (expected one of {BULK_OPERATIONS})")
+
+    changes = []
+    for field in list(frontmatter) + [f for f in updated if f not in frontmatter]:
+        old = frontmatter.get(field, missing)
+        new = updated.get(field, missing)
+        if old is missing or new is missing or old != new:
+            changes.append((field, None if old is missing else old, None if new is missing else new))
+
+    return updated, changes
 
 
 class FrontmatterParser:
     """Parse and manipulate YAML frontmatter in markdown files"""
 
-    def __init__(self, vault_path: Path = None):
+    def __init__(self, vault_path: Path = None, writer=None):
         self.vault_path = Path(vault_path) if vault_path else None
         self.logger = get_logger(__name__, str(vault_path) if vault_path else ".")
+        self.writer = writer  # optional atomic_write.VaultWriter for bulk jobs
 
     def parse(self, file_path: Path) -> Tuple[Dict, str]:
         """
@@ -41,7 +193,7 @@ class FrontmatterParser:
 
             # Parse YAML
             try:
-                frontmatter = yaml.safe_load(frontmatter_str)
+                frontmatter = yaml.load(frontmatter_str, Loader=YAML_LOADER)
                 if frontmatter is None:
                     frontmatter = {}
             except yaml.YAMLError as e:
@@ -59,30 +211,45 @@ class FrontmatterParser:
         Write frontmatter and body back to markdown file
         """
         try:
-            # Serialize frontmatter to YAML
-            frontmatter_str = yaml.dump(
-                frontmatter,
-                default_flow_style=False,
-                allow_unicode=True,
-                sort_keys=False
-            )
+            content = self._render(frontmatter, body)
 
-            # Construct content
-            content = f"---\n{frontmatter_str}---\n{body}"
-
-            # Write to file
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            # Write to file (atomically)
+            if self.writer is not None:
+                self.writer.write_text(file_path, content)
+            else:
+                write_text(file_path, content)
 
             self.logger.info(f"Written frontmatter to {file_path.name}")
 
         except Exception as e:
             self.logger.error(f"Failed to write {file_path.name}: {e}", exc_info=True)
 
+    @staticmethod
+    def _render(frontmatter: Dict, body: str) -> str:
+        """Serialize frontmatter to YAML and join it with the body"""
+        frontmatter_str = yaml.dump(
+            frontmatter,
+            default_flow_style=False,
+            allow_unicode=True,
+            sort_keys=False
+        )
+        return f"---\n{frontmatter_str}---\n{body}"
+
     def get_field(self, file_path: Path, field: str) -> Optional[any]:
         """Get single frontmatter field value"""
-        frontmatter, _ = self.parse(file_path)
-        return frontmatter.get(field, None)
+        return self.read_frontmatter(file_path).get(field, None)
+
+    def read_frontmatter(self, file_path: Path) -> Dict:
+        """Frontmatter only, without reading the body"""
+        try:
+            header = read_header(file_path)
+        except Exception as e:
+            self.logger.error(f"Failed to read {file_path.name}: {e}", exc_info=True)
+            return {}
+
+        if header.error:
+            self.logger.error(f"Failed to parse YAML in {file_path.name}: {header.error}")
+        return copy.deepcopy(header.data)
 
     def set_field(self, file_path: Path, field: str, value: any):
         """Set single frontmatter field value"""
@@ -121,7 +288,7 @@ class FrontmatterParser:
         Returns:
             (is_valid, missing_fields)
         """
-        frontmatter, _ = self.parse(file_path)
+        frontmatter = self.read_frontmatter(file_path)
 
         missing = [field for field in required_fields if field not in frontmatter]
 
@@ -132,43 +299,109 @@ class FrontmatterParser:
 
         return is_valid, missing
 
-    def bulk_update_field(self, pattern: str, field: str, value: any):
-        """Bulk update field across all matching files"""
-        if not self.vault_path:
-            self.logger.error("vault_path not set for bulk operations")
-            return
+    def bulk_apply(self, operations: List[Tuple], pattern: str = "*.md",
+                   predicate: Callable[[Dict, Path], bool] = None,
+                   dry_run: bool = False, workers: int = 8) -> Dict:
+        """
+        Apply several field operations to every matching file in one pass
 
-        count = 0
+        Each file's header is read once (cached), the predicate and all
+        operations run against it, and only files whose frontmatter actually
+        changes are read in full and rewritten.
 
-        for md_file in self.vault_path.rglob(pattern):
-            try:
-                self.set_field(md_file, field, value)
-                count += 1
-            except Exception as e:
-                self.logger.error(f"Failed to update {md_file.name}: {e}")
+        Args:
+            operations: (op, field, value) tuples, see apply_operations()
+            pattern: Glob pattern under the vault (".obsidian" is skipped)
+            predicate: Optional filter called with (frontmatter, path)
+            dry_run: Compute the diff without writing anything
+            workers: Thread pool size
 
-        self.logger.info(f"Bulk updated {count} files")
+        Returns:
+            Report with matched/changed/unchanged/errors counts, per-file
+            changes {path: [(field, old, new), ...]} and elapsed seconds
+        """
+        report = {
+            "matched": 0,
+            "changed": 0,
+            "unchanged": 0,
+            "errors": 0,
+            "dry_run": dry_run,
+            "changes": {},
+            "elapsed": 0.0
+        }
 
-    def bulk_ensure_field(self, pattern: str, field: str, default_value: any):
-        """Bulk ensure field exists across all matching files"""
         if not self.vault_path:
             self.logger.error("vault_path not set for bulk operations")
-            return
-
-        count = 0
+            return report
+
+        for op, _, _ in operations:
+            if op not in BULK_OPERATIONS:
+                raise ValueError(f"Unknown operation: {op} (expected one of {BULK_OPERATIONS})")
+
+        start = time.perf_counter()
+        files = [f for f in self.vault_path.rglob(pattern) if ".obsidian" not in f.parts]
+        write_lock = threading.Lock()
+
+        def process(md_file: Path):
+            header = read_header(md_file)
+            if header.error:
+                raise ValueError(header.error)
+            if predicate is not None and not predicate(header.data, md_file):
+                return None
+
+            updated, changes = apply_operations(header.data, operations)
+            if changes and not dry_run:
+                with open(md_file, 'r', encoding='utf-8') as f:
+                    body = ''.join(f.readlines()[header.lines:])
+                content = self._render(updated, body)
+                if self.writer is not None:
+                    # VaultWriter stages are not thread-safe
+                    with write_lock:
+                        self.writer.write_text(md_file, content)
+                else:
+                    write_text(md_file, content)
+            return changes
+
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            futures = {md_file: pool.submit(process, md_file) for md_file in files}
+
+            for md_file, future in futures.items():
+                try:
+                    changes = future.result()
+                except Exception as e:
+                    report["errors"] += 1
+                    self.logger.error(f"Failed to process {md_file.name}: {e}")
+                    continue
+
+                if changes is None:
+                    continue
+
+                report["matched"] += 1
+                if changes:
+                    report["changed"] += 1
+                    report["changes"][md_file] = changes
+                else:
+                    report["unchanged"] += 1
+
+        report["elapsed"] = time.perf_counter() - start
+        self.logger.info(
+            f"Bulk {'dry run' if dry_run else 'update'}: {report['matched']} matched, "
+            f"{report['changed']} changed, {report['unchanged']} unchanged, "
+            f"{report['errors']} errors in {report['elapsed']:.2f}s"
+        )
+        return report
 
-        for md_file in self.vault_path.rglob(pattern):
-            try:
-                self.ensure_field(md_file, field, default_value)
-                count += 1
-            except Exception as e:
-                self.logger.error(f"Failed to process {md_file.name}: {e}")
+    def bulk_update_field(self, pattern: str, field: str, value: any) -> Dict:
+        """Bulk update field across all matching files"""
+        return self.bulk_apply([("set", field, value)], pattern)
 
-        self.logger.info(f"Bulk ensured field in {count} files")
+    def bulk_ensure_field(self, pattern: str, field: str, default_value: any) -> Dict:
+        """Bulk ensure field exists across all matching files"""
+        return self.bulk_apply([("ensure", field, default_value)], pattern)
 
     def extract_to_dict(self, file_path: Path, fields: list) -> Dict:
         """Extract specific fields to dict"""
-        frontmatter, _ = self.parse(file_path)
+        frontmatter = self.read_frontmatter(file_path)
 
         extracted = {}
         for field in fields:
@@ -203,24 +436,16 @@ class FrontmatterParser:
             (is_valid, error_message)
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            fm_match = re.match(r'^---\n(.*?)\n---', content, re.DOTALL)
-            if not fm_match:
-                return False, "No frontmatter found"
-
-            frontmatter_str = fm_match.group(1)
-
-            try:
-                yaml.safe_load(frontmatter_str)
-                return True, None
-            except yaml.YAMLError as e:
-                return False, str(e)
-
+            header = read_header(file_path)
         except Exception as e:
             return False, str(e)
 
+        if not header.found:
+            return False, "No frontmatter found"
+        if header.error:
+            return False, header.error
+        return True, None
+
     def generate_frontmatter_report(self) -> Dict:
         """Generate report on frontmatter usage across vault"""
         if not self.vault_path:
@@ -255,11 +480,8 @@ class FrontmatterParser:
 
             report["files_with_frontmatter"] += 1
 
-            # Parse frontmatter
-            frontmatter, _ = self.parse(md_file)
-
-            # Track field usage
-            for field in frontmatter.keys():
+            # Track field usage (header is cached from the syntax check)
+            for field in read_header(md_file).data.keys():
                 if field not in report["field_usage"]:
                     report["field_usage"][field] = 0
                 report["field_usage"][field] += 1
@@ -283,9 +505,32 @@ def main():
                        help="Validate YAML syntax")
     parser.add_argument("--report", action="store_true",
                        help="Generate frontmatter usage report")
+    parser.add_argument("--bulk-set", nargs=2, action="append", metavar=('FIELD', 'VALUE'),
+                       help="Bulk: set field (VALUE is parsed as YAML; repeatable)")
+    parser.add_argument("--bulk-ensure", nargs=2, action="append", metavar=('FIELD', 'VALUE'),
+                       help="Bulk: add field if missing (repeatable)")
+    parser.add_argument("--bulk-delete", action="append", metavar='FIELD',
+                       help="Bulk: remove field (repeatable)")
+    parser.add_argument("--bulk-rename", nargs=2, action="append", metavar=('FIELD', 'NEW'),
+                       help="Bulk: rename field (repeatable)")
+    parser.add_argument("--where", action="append", metavar='FIELD=VALUE',
+                       help="Bulk: only files whose field equals VALUE (repeatable)")
+    parser.add_argument("--pattern", type=str, default="*.md",
+                       help="Bulk: glob pattern under the vault")
+    parser.add_argument("--dry-run", action="store_true",
+                       help="Bulk: show the diff without writing")
+    parser.add_argument("--workers", type=int, default=8,
+                       help="Bulk: thread pool size")
 
     args = parser.parse_args()
 
+    operations = (
+        [("set", f, yaml.safe_load(v)) for f, v in args.bulk_set or []]
+        + [("ensure", f, yaml.safe_load(v)) for f, v in args.bulk_ensure or []]
+        + [("delete", f, None) for f in args.bulk_delete or []]
+        + [("rename", f, new) for f, new in args.bulk_rename or []]
+    )
+
     parser_obj = FrontmatterParser(Path(args.vault))
 
     if args.file:
@@ -314,6 +559,31 @@ def main():
             for key, value in frontmatter.items():
                 print(f"   {key}: {value}")
 
+    elif operations:
+        conditions = [w.split('=', 1) for w in args.where or []]
+        predicate = None
+        if conditions:
+            def predicate(fm, path):
+                return all(str(fm.get(f.strip())) == v.strip() for f, v in conditions)
+
+        writer = None if args.dry_run else VaultWriter(Path(args.vault))
+        parser_obj.writer = writer
+        report = parser_obj.bulk_apply(operations, args.pattern, predicate,
+                                       dry_run=args.dry_run, workers=args.workers)
+        if writer is not None:
+            writer.commit()
+
+        print(f"\n[OK] Bulk {'Dry Run' if args.dry_run else 'Update'}")
+        for file_path, changes in sorted(report["changes"].items()):
+            print(f"\n   {file_path.relative_to(parser_obj.vault_path)}")
+            for field, old, new in changes:
+                print(f"      {field}: {old!r} -> {new!r}")
+        print(f"\n   Matched: {report['matched']}")
+        print(f"   {'Would change' if args.dry_run else 'Changed'}: {report['changed']}")
+        print(f"   Unchanged: {report['unchanged']}")
+        print(f"   Errors: {report['errors']}")
+        print(f"   Time: {report['elapsed']:.2f}s")
+
     elif args.report:
         report = parser_obj.generate_frontmatter_report()
         print(f"\n[OK] Frontmatter Report")
@@ -16,8 +16,10 @@ import sys
 
 try:
     from scripts.tag_path_resolver import TagPathResolver
+    from scripts.atomic_write import write_text
 except ImportError:
     from tag_path_resolver import TagPathResolver
+    from atomic_write import write_text
 
 
 class TaxonomyTagNoteGenerator:
@@ -159,7 +161,7 @@ class TaxonomyTagNoteGenerator:
                 return True
 
             # Write file
-            file_path.write_text(content, encoding='utf-8')
+            write_text(file_path, content)
 
             print(f"[CREATE] {canonical}")
             print(f"    Path: {file_path.relative_to(self.vault_path)}")
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Graph Centrality
+PageRank over the combined tag graph used as a prominence component.
+
+Nodes are tags (tag notes plus entities mentioned in conversations). Edges
+come from two sources:
+  - taxonomy: child -> parent for every entry in a tag note's parent_tags
+  - co-occurrence: both directions between entities mentioned in the same
+    processed conversation, weighted by the number of shared conversations
+
+Scores are computed by sparse power iteration in NumPy (edge lists +
+np.bincount, no dense matrix). The previous run's vector is kept in
+_system/graph-centrality.json and used as the starting point, so a nightly
+recompute over a mostly unchanged graph converges in a few iterations.
+"""
+
+import json
+from collections import Counter
+from datetime import datetime
+from itertools import combinations
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from scripts.logger_setup import get_logger, TimedOperation
+    from scripts.vault_index import VaultIndex
+    from scripts.atomic_write import write_json
+except ImportError:
+    from logger_setup import get_logger, TimedOperation
+    from vault_index import VaultIndex
+    from atomic_write import write_json
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+DAMPING = 0.85
+TOLERANCE = 1e-6
+MAX_ITERATIONS = 100
+
+
+def node_key(name) -> str:
+    """Normalize a tag / entity name so [[Neo4j]], neo4j and "neo 4j" style variants meet"""
+    key = str(name).strip()
+    if key.startswith('[[') and key.endswith(']]'):
+        key = key[2:-2]
+    return key.strip().lower().replace(' ', '-').replace('_', '-')
+
+
+def build_tag_graph(tag_notes: List[Dict], conversations: List[Dict],
+                    taxonomy_weight: float = 1.0,
+                    cooccurrence_weight: float = 1.0) -> Tuple[List[str], Dict[Tuple[str, str], float]]:
+    """
+    Build the weighted edge map of the tag graph from vault index records
+
+    Returns:
+        (nodes, edges) where edges maps (source, target) node keys to weight
+    """
+    nodes = {}
+    edges = Counter()
+
+    def add_node(name) -> Optional[str]:
+        key = node_key(name)
+        if not key:
+            return None
+        nodes.setdefault(key, len(nodes))
+        return key
+
+    for note in tag_notes:
+        if not note["tag"]:
+            continue
+        child = add_node(note["tag"])
+        for parent in note["parent_tags"]:
+            parent = add_node(parent)
+            if parent and parent != child:
+                edges[(child, parent)] += taxonomy_weight
+
+    for conv in conversations:
+        mentioned = sorted({key for key in map(add_node, conv["entities"]) if key})
+        for a, b in combinations(mentioned, 2):
+            edges[(a, b)] += cooccurrence_weight
+            edges[(b, a)] += cooccurrence_weight
+
+    return list(nodes), dict(edges)
+
+
+def pagerank(nodes: List[str], edges: Dict[Tuple[str, str], float],
+             damping: float = DAMPING, tol: float = TOLERANCE,
+             max_iter: int = MAX_ITERATIONS,
+             start: Dict[str, float] = None) -> Tuple[Dict[str, float], int, bool]:
+    """
+    Weighted PageRank by sparse power iteration
+
+    Args:
+        nodes: Node keys
+        edges: (source, target) -> weight
+        damping: Probability of following an edge instead of teleporting
+        tol: L1 change between iterations at which to stop
+        max_iter: Iteration cap
+        start: Previous scores to warm-start from (new nodes start at 1/N)
+
+    Returns:
+        (scores, iterations, converged); scores sum to 1
+    """
+    if np is None:
+        raise ImportError("numpy is required for graph centrality")
+
+    n = len(nodes)
+    if n == 0:
+        return {}, 0, True
+
+    position = {key: i for i, key in enumerate(nodes)}
+    src = np.fromiter((position[s] for s, _ in edges), dtype=np.int64, count=len(edges))
+    dst = np.fromiter((position[t] for _, t in edges), dtype=np.int64, count=len(edges))
+    weight = np.fromiter(edges.values(), dtype=np.float64, count=len(edges))
+
+    out_weight = np.bincount(src, weights=weight, minlength=n)
+    share = weight / out_weight[src] if len(edges) else weight
+    dangling = out_weight == 0
+
+    rank = np.full(n, 1.0 / n)
+    if start:
+        rank = np.fromiter((start.get(key, 1.0 / n) for key in nodes), dtype=np.float64, count=n)
+        rank /= rank.sum()
+
+    converged = False
+    iterations = 0
+    for iterations in range(1, max_iter + 1):
+        spread = np.bincount(dst, weights=share * rank[src], minlength=n)
+        updated = (1.0 - damping) / n + damping * (spread + rank[dangling].sum() / n)
+        delta = np.abs(updated - rank).sum()
+        rank = updated
+        if delta < tol:
+            converged = True
+            break
+
+    return dict(zip(nodes, rank.tolist())), iterations, converged
+
+
+class GraphCentrality:
+    """PageRank over the tag graph, warm-started from the previous run"""
+
+    def __init__(self, vault_path: Path, state_path: Path = None):
+        self.vault_path = Path(vault_path)
+        self.logger = get_logger(__name__, str(vault_path))
+
+        if state_path is None:
+            state_path = self.vault_path / "_system" / "graph-centrality.json"
+        self.state_path = Path(state_path)
+
+    def load_state(self) -> Dict:
+        if not self.state_path.exists():
+            return {}
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            self.logger.warning(f"Ignoring unreadable centrality state {self.state_path}: {e}")
+            return {}
+
+    def compute(self, tag_notes: List[Dict] = None, conversations: List[Dict] = None,
+                warm_start: bool = True, save: bool = True) -> Dict:
+        """
+        Compute PageRank for every tag
+
+        Args:
+            tag_notes: Vault index tag note records (loaded if omitted)
+            conversations: Vault index conversation records (loaded if omitted)
+            warm_start: Start from the previous run's scores
+            save: Store the scores for the next warm start
+
+        Returns:
+            Dict with scores (node key -> PageRank), nodes, edges,
+            iterations, converged and warm_start
+        """
+        if tag_notes is None or conversations is None:
+            index = VaultIndex(self.vault_path)
+            tag_notes = index.tag_notes() if tag_notes is None else tag_notes
+            conversations = index.conversations() if conversations is None else conversations
+
+        with TimedOperation(self.logger, "Computing graph centrality"):
+            nodes, edges = build_tag_graph(tag_notes, conversations)
+
+            previous = self.load_state() if warm_start else {}
+            start = previous.get("scores") if previous.get("damping") == DAMPING else None
+
+            scores, iterations, converged = pagerank(nodes, edges, start=start)
+
+        result = {
+            "generated": datetime.now().isoformat(timespec="seconds"),
+            "damping": DAMPING,
+            "nodes": len(nodes),
+            "edges": len(edges),
+            "iterations": iterations,
+            "converged": converged,
+            "warm_start": bool(start),
+            "scores": scores
+        }
+
+        self.logger.info(
+            f"PageRank: {len(nodes)} nodes, {len(edges)} edges, {iterations} iterations"
+            f"{' (warm start)' if start else ''}{'' if converged else ' (not converged)'}"
+        )
+
+        if save:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            write_json(self.state_path, result, separators=(",", ":"))
+
+        return result
+
+    def top(self, result: Dict, limit: int = 20) -> List[Dict]:
+        """Highest-ranked nodes as {name, pagerank, relative} dicts"""
+        n = max(result["nodes"], 1)
+        ranked = sorted(result["scores"].items(), key=lambda item: item[1], reverse=True)
+        return [
+            {"name": key, "pagerank": round(score, 6), "relative": round(score * n, 2)}
+            for key, score in ranked[:limit]
+        ]
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="PageRank over the tag + co-occurrence graph")
+    parser.add_argument("--vault", type=str, default="C:/obsidian-memory-vault",
+                       help="Path to vault")
+    parser.add_argument("--top", type=int, default=20,
+                       help="Show top N tags")
+    parser.add_argument("--cold", action="store_true",
+                       help="Ignore the previous run's scores")
+
+    args = parser.parse_args()
+
+    centrality = GraphCentrality(Path(args.vault))
+    result = centrality.compute(warm_start=not args.cold)
+
+    print(f"\n[OK] Graph Centrality")
+    print(f"   Nodes: {result['nodes']}, Edges: {result['edges']}")
+    print(f"   Iterations: {result['iterations']}"
+          f"{' (warm start)' if result['warm_start'] else ''}"
+          f"{'' if result['converged'] else ' [!] not converged'}")
+    print(f"\n   Top {args.top}:")
+    for i, entry in enumerate(centrality.top(result, args.top), 1):
+        print(f"      {i}. {entry['name']} - {entry['pagerank']} ({entry['relative']}x average)")
+    print()
+
+
+if __name__ == "__main__":
+    main()
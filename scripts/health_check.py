@@ -9,6 +9,7 @@ from pathlib import Path
 from datetime import datetime
 from typing import Dict, List
 from logger_setup import get_logger, TimedOperation
+from frontmatter_parser import is_tag_note
 
 
 class HealthChecker:
@@ -197,13 +198,8 @@ class HealthChecker:
             if any(part in md_file.parts for part in ["00-Inbox", "_system", ".obsidian"]):
                 continue
 
-            try:
-                with open(md_file, 'r', encoding='utf-8') as f:
-                    content = f.read(500)
-                    if 'type: tag-note' in content:
-                        tag_notes.append(md_file)
-            except:
-                pass
+            if is_tag_note(md_file):
+                tag_notes.append(md_file)
 
         self.checks.append({
             "name": "Tag Notes",
@@ -248,7 +244,10 @@ class HealthChecker:
             "timeline_generator.py",
             "batch_neo4j_helper.py",
             "tag_path_resolver.py",
+            "taxonomy_cache.py",
             "entity_prominence.py",
+            "graph_centrality.py",
+            "metric_aggregates.py",
             "frontmatter_parser.py",
             "similarity_matcher.py",
             "health_check.py"
@@ -0,0 +1,565 @@
+#!/usr/bin/env python3
+"""
+Metric Aggregates
+Incrementally maintained counters behind the brain space metrics and dashboard.
+
+Every tag note and processed conversation contributes a fixed set of
+(metric, key, value) increments - per-area counts and time, the depth
+histogram, per-day entity / conversation counts (weekly buckets, streaks and
+velocity are derived from these), the per-entity conversation-count
+histogram - plus one row in the entity table (top-k by prominence) or the
+conversation table (recent activity).
+
+MetricCounters holds these in memory and is what BrainSpaceCalculator and
+BrainDataExporter compute from. MetricAggregates keeps the same counters in
+_system/metric-aggregates.db together with each file's last contribution, so
+a changed file is applied as "subtract old contribution, add new one":
+keeping metrics fresh costs O(changed files) instead of O(vault). rebuild()
+and verify() are the only full recomputes.
+"""
+
+import heapq
+import json
+import os
+import sqlite3
+from collections import Counter, defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    from scripts.logger_setup import get_logger, TimedOperation
+    from scripts.frontmatter_parser import read_header
+    from scripts.vault_index import VaultIndex, SKIP_DIRS, build_record
+except ImportError:
+    from logger_setup import get_logger, TimedOperation
+    from frontmatter_parser import read_header
+    from vault_index import VaultIndex, SKIP_DIRS, build_record
+
+ALL = "all"
+EPSILON = 1e-9
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sources (
+    path TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    contributions TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS counters (
+    metric TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (metric, key)
+);
+CREATE TABLE IF NOT EXISTS entities (
+    path TEXT PRIMARY KEY,
+    tag TEXT NOT NULL,
+    root TEXT,
+    depth INTEGER,
+    conversations INTEGER NOT NULL,
+    time_minutes REAL NOT NULL,
+    score REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_entities_score ON entities(score DESC, path);
+CREATE INDEX IF NOT EXISTS idx_entities_conversations ON entities(conversations DESC, path);
+CREATE INDEX IF NOT EXISTS idx_entities_tag ON entities(tag, path);
+CREATE TABLE IF NOT EXISTS conversations (
+    path TEXT PRIMARY KEY,
+    created TEXT,
+    title TEXT NOT NULL,
+    tags TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_conversations_created ON conversations(created DESC, path);
+"""
+
+ENTITY_ORDER = ("score", "conversations")
+
+
+def record_contributions(record: Dict) -> List[Tuple[str, str, float]]:
+    """(metric, key, value) increments of one vault index record"""
+    if record["kind"] == "conversation":
+        contributions = [("conversations", ALL, 1)]
+        if record["created"]:
+            contributions.append(("conversation_day", record["created"], 1))
+        return contributions
+
+    frontmatter = record["frontmatter"]
+    root = record["root"]
+    depth = record["depth"]
+    minutes = record["total_time_minutes"]
+
+    contributions = [("tag_notes", ALL, 1), ("time_minutes", ALL, minutes)]
+
+    if root:
+        contributions += [("area_count", root, 1), ("area_time", root, minutes)]
+        if "total_time_minutes" in frontmatter:
+            contributions += [("area_tracked", root, 1), ("area_time_tracked", root, minutes)]
+        if depth is not None:
+            contributions += [("area_depth_sum", root, depth), ("area_depth_count", root, 1)]
+
+    if depth is not None:
+        contributions.append(("depth", str(depth), 1))
+    if record["created"]:
+        contributions.append(("entity_day", record["created"], 1))
+    if "total_conversations" in frontmatter:
+        contributions.append(("hub_conversations", str(record["total_conversations"]), 1))
+
+    return contributions
+
+
+def weekly_counts(day_counts: Iterable[Tuple[str, int]]) -> Dict[str, int]:
+    """Fold YYYY-MM-DD counts into %Y-W%W week buckets"""
+    weeks = Counter()
+    for day, count in day_counts:
+        weeks[datetime.strptime(day, "%Y-%m-%d").strftime("%Y-W%W")] += count
+    return dict(weeks)
+
+
+def entity_row(record: Dict) -> Optional[Dict]:
+    """Row of the entity table (None for conversations and untagged notes)"""
+    if record["kind"] != "tag-note" or not record["tag"]:
+        return None
+
+    conversations = record["total_conversations"]
+    minutes = record["total_time_minutes"]
+    return {
+        "path": str(record["path"]),
+        "tag": record["tag"],
+        "root": record["root"],
+        "depth": record["depth"],
+        "conversations": conversations,
+        "time_minutes": minutes,
+        # 10 points per conversation + 5 points per hour
+        "score": (conversations * 10) + (minutes / 60 * 5)
+    }
+
+
+def conversation_row(record: Dict) -> Optional[Dict]:
+    """Row of the recent-activity table"""
+    if record["kind"] != "conversation":
+        return None
+
+    return {
+        "path": str(record["path"]),
+        "created": record["created"],
+        "title": record["title"],
+        "tags": record["tags"]
+    }
+
+
+class MetricCounters:
+    """In-memory aggregate counters plus entity / conversation rows"""
+
+    def __init__(self):
+        self.values = defaultdict(Counter)
+        self._entities = {}
+        self._conversations = {}
+
+    @classmethod
+    def from_records(cls, tag_notes: Iterable[Dict], conversations: Iterable[Dict]) -> "MetricCounters":
+        """Full recompute from vault index records"""
+        counters = cls()
+        for record in list(tag_notes) + list(conversations):
+            counters.add(record)
+        return counters
+
+    def add(self, record: Dict):
+        self._increment(record_contributions(record))
+
+        row = entity_row(record)
+        if row:
+            self._entities[row["path"]] = row
+
+        row = conversation_row(record)
+        if row:
+            self._conversations[row["path"]] = row
+
+    def _increment(self, contributions: Iterable[Tuple[str, str, float]], sign: int = 1):
+        for metric, key, value in contributions:
+            self.values[metric][key] += sign * value
+
+    # ---- Queries -----------------------------------------------------------
+
+    def get(self, metric: str) -> Dict[str, float]:
+        """Non-zero keys of a metric"""
+        return {key: value for key, value in self.values[metric].items() if abs(value) > EPSILON}
+
+    def total(self, metric: str) -> float:
+        return self.values[metric].get(ALL, 0)
+
+    def expand(self, metric: str) -> List[Tuple[str, int]]:
+        """(key, count) pairs of a count metric sorted by key (e.g. per-day counts)"""
+        return sorted((key, int(round(value))) for key, value in self.get(metric).items())
+
+    def top_entities(self, limit: int, by: str = "score", distinct: bool = False) -> List[Dict]:
+        """
+        Entity rows by score or conversations, descending (ties by path)
+
+        Args:
+            distinct: One row per tag - when several tag notes share a tag,
+                      the first one in path order wins (as in VaultIndex.get_tag_note)
+        """
+        if by not in ENTITY_ORDER:
+            raise ValueError(f"Unknown entity order: {by} (expected one of {ENTITY_ORDER})")
+
+        rows = self._entities.values()
+        if distinct:
+            first = {}
+            for row in sorted(rows, key=lambda row: row["path"]):
+                first.setdefault(row["tag"], row)
+            rows = first.values()
+
+        return heapq.nsmallest(limit, rows, key=lambda row: (-row[by], row["path"]))
+
+    def recent_conversations(self, limit: int) -> List[Dict]:
+        """Dated conversation rows, most recent first (ties by path)"""
+        dated = [row for row in self._conversations.values() if row["created"]]
+        dated.sort(key=lambda row: row["path"])
+        dated.sort(key=lambda row: row["created"], reverse=True)
+        return dated[:limit]
+
+    def entity_count(self) -> int:
+        return len(self._entities)
+
+    def conversation_row_count(self) -> int:
+        return len(self._conversations)
+
+
+class MetricAggregates(MetricCounters):
+    """MetricCounters persisted in SQLite and updated by per-file deltas"""
+
+    def __init__(self, vault_path: Path, db_path: Path = None):
+        super().__init__()
+        self.vault_path = Path(vault_path)
+        self.logger = get_logger(__name__, str(vault_path))
+        self.processed_dir = self.vault_path / "00-Inbox" / "processed"
+
+        if db_path is None:
+            db_path = self.vault_path / "_system" / "metric-aggregates.db"
+
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.executescript(SCHEMA)
+        self._load_counters()
+
+    def close(self):
+        self.conn.close()
+
+    def _load_counters(self):
+        self.values = defaultdict(Counter)
+        for metric, key, value in self.conn.execute("SELECT metric, key, value FROM counters"):
+            self.values[metric][key] = value
+
+    @property
+    def initialized(self) -> bool:
+        return self.conn.execute("SELECT 1 FROM meta WHERE key = 'built_at'").fetchone() is not None
+
+    def ensure_built(self):
+        if not self.initialized:
+            self.rebuild()
+
+    # ---- Full rebuild ------------------------------------------------------
+
+    def rebuild(self) -> Dict[str, int]:
+        """Recompute every aggregate from the vault index"""
+        with TimedOperation(self.logger, "Rebuilding metric aggregates"):
+            index = VaultIndex(self.vault_path)
+            index.refresh()
+            records = index.tag_notes() + index.conversations()
+            files = index.walk()
+
+            with self.conn:
+                for table in ("sources", "counters", "entities", "conversations", "meta"):
+                    self.conn.execute(f"DELETE FROM {table}")
+
+                self.values = defaultdict(Counter)
+                for record in records:
+                    st = files.pop(str(record["path"]), (None, None))[1]
+                    self._store(record, st)
+
+                # Remember the other notes too, so sync() only re-reads them when they change
+                for path, (kind, st) in files.items():
+                    self._store_untracked(path, kind, st)
+
+                self._write_counters(self.values.items())
+                self.conn.execute("INSERT INTO meta VALUES ('built_at', ?)",
+                                  (datetime.now().isoformat(timespec="seconds"),))
+
+        return {"files": len(records)}
+
+    # ---- Deltas ------------------------------------------------------------
+
+    def _key(self, path) -> str:
+        """Path spelled the way VaultIndex spells it (vault path + relative path)"""
+        rel = os.path.relpath(os.path.abspath(path), os.path.abspath(self.vault_path))
+        return os.path.join(str(self.vault_path), rel)
+
+    def _kind(self, key: str) -> Optional[str]:
+        """conversation / note / None (outside the tracked parts of the vault)"""
+        if not key.endswith(".md"):
+            return None
+        if os.path.dirname(os.path.abspath(key)) == os.path.abspath(self.processed_dir):
+            return "conversation"
+        rel = os.path.relpath(os.path.abspath(key), os.path.abspath(self.vault_path))
+        if rel.startswith(os.pardir) or any(part in SKIP_DIRS for part in Path(rel).parts):
+            return None
+        return "note"
+
+    def _read_record(self, key: str) -> Tuple[Optional[Dict], Optional[os.stat_result]]:
+        kind = self._kind(key)
+        if kind is None or not os.path.exists(key):
+            return None, None
+
+        st = os.stat(key)
+        try:
+            header = read_header(Path(key))
+            frontmatter = header.data
+        except (OSError, UnicodeDecodeError) as e:
+            self.logger.warning(f"Failed to parse {key}: {e}")
+            frontmatter = {}
+
+        if kind == "note":
+            if frontmatter.get("type") != "tag-note":
+                return None, st
+            kind = "tag-note"
+
+        return build_record(Path(key), kind, frontmatter), st
+
+    def _store(self, record: Dict, st: Optional[os.stat_result]):
+        """Insert a record's rows and add its contribution to self.values"""
+        contributions = record_contributions(record)
+        self._increment(contributions)
+
+        self.conn.execute(
+            "INSERT OR REPLACE INTO sources VALUES (?, ?, ?, ?, ?)",
+            (str(record["path"]), record["kind"], st.st_mtime if st else 0,
+             st.st_size if st else 0, json.dumps(contributions))
+        )
+
+        row = entity_row(record)
+        if row:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO entities VALUES (:path, :tag, :root, :depth, "
+                ":conversations, :time_minutes, :score)", row
+            )
+
+        row = conversation_row(record)
+        if row:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO conversations VALUES (?, ?, ?, ?)",
+                (row["path"], row["created"], row["title"], json.dumps(row["tags"]))
+            )
+
+    def _store_untracked(self, key: str, kind: str, st: os.stat_result):
+        """Record a file that contributes nothing (e.g. a note that is not a tag note)"""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO sources VALUES (?, ?, ?, ?, '[]')",
+            (key, kind, st.st_mtime, st.st_size)
+        )
+
+    def _forget(self, key: str) -> List[Tuple[str, str, float]]:
+        """Remove a file's rows; returns its previous contribution"""
+        previous = self.conn.execute(
+            "SELECT contributions FROM sources WHERE path = ?", (key,)
+        ).fetchone()
+
+        for table in ("sources", "entities", "conversations"):
+            self.conn.execute(f"DELETE FROM {table} WHERE path = ?", (key,))
+
+        return [tuple(c) for c in json.loads(previous[0])] if previous else []
+
+    def _write_counters(self, items):
+        rows = [(metric, key, value) for metric, keys in items for key, value in keys.items()]
+        self.conn.executemany(
+            "INSERT INTO counters VALUES (?, ?, ?) "
+            "ON CONFLICT(metric, key) DO UPDATE SET value = excluded.value", rows
+        )
+        self.conn.execute("DELETE FROM counters WHERE abs(value) < ?", (EPSILON,))
+
+    def apply(self, paths: Iterable) -> Dict[str, int]:
+        """
+        Apply the current state of changed / new / deleted files
+
+        Args:
+            paths: Tag notes or processed conversations that changed
+
+        Returns:
+            Counts of applied and removed files
+        """
+        if not self.initialized:
+            self.logger.info("Metric aggregates not built yet - running a full rebuild")
+            self.rebuild()
+            return {"applied": 0, "removed": 0, "rebuilt": True}
+
+        stats = {"applied": 0, "removed": 0, "rebuilt": False}
+        touched = defaultdict(set)
+
+        with self.conn:
+            for path in paths:
+                key = self._key(path)
+                previous = self._forget(key)
+                self._increment(previous, sign=-1)
+                for metric, counter_key, _ in previous:
+                    touched[metric].add(counter_key)
+
+                record, st = self._read_record(key)
+                if record is None:
+                    if st is not None:
+                        self._store_untracked(key, "note", st)
+                    if previous:
+                        stats["removed"] += 1
+                    continue
+
+                self._store(record, st)
+                for metric, counter_key, _ in record_contributions(record):
+                    touched[metric].add(counter_key)
+                stats["applied"] += 1
+
+            self._write_counters(
+                (metric, {k: self.values[metric][k] for k in keys}) for metric, keys in touched.items()
+            )
+
+        self.logger.info(f"Metric aggregates: {stats['applied']} applied, {stats['removed']} removed")
+        return stats
+
+    def sync(self) -> Dict[str, int]:
+        """Apply every file whose mtime / size changed since it was last applied"""
+        if not self.initialized:
+            self.rebuild()
+            return {"applied": 0, "removed": 0, "rebuilt": True}
+
+        known = {
+            path: (mtime, size)
+            for path, mtime, size in self.conn.execute("SELECT path, mtime, size FROM sources")
+        }
+        found = VaultIndex(self.vault_path).walk()
+
+        changed = [
+            path for path, (_, st) in found.items()
+            if known.get(path) != (st.st_mtime, st.st_size)
+        ]
+        changed += [path for path in known if path not in found]
+        return self.apply(changed)
+
+    # ---- Verification ------------------------------------------------------
+
+    def verify(self) -> List[str]:
+        """
+        Compare the maintained aggregates with a full recompute
+
+        Returns:
+            Human-readable differences (empty when consistent)
+        """
+        index = VaultIndex(self.vault_path)
+        index.refresh()
+        expected = MetricCounters.from_records(index.tag_notes(), index.conversations())
+
+        differences = []
+        for metric in sorted(set(expected.values) | set(self.values)):
+            want, have = expected.get(metric), self.get(metric)
+            for key in sorted(set(want) | set(have)):
+                if abs(want.get(key, 0) - have.get(key, 0)) > 1e-6:
+                    differences.append(f"{metric}[{key}]: expected {want.get(key, 0)}, have {have.get(key, 0)}")
+
+        if expected.entity_count() != self.entity_count():
+            differences.append(f"entities: expected {expected.entity_count()}, have {self.entity_count()}")
+        if expected.conversation_row_count() != self.conversation_row_count():
+            differences.append(f"conversations: expected {expected.conversation_row_count()}, "
+                               f"have {self.conversation_row_count()}")
+
+        for by in ENTITY_ORDER:
+            want = [(row["path"], row[by]) for row in expected.top_entities(20, by)]
+            have = [(row["path"], row[by]) for row in self.top_entities(20, by)]
+            if want != have:
+                differences.append(f"top entities by {by} differ")
+
+        return differences
+
+    # ---- Queries -----------------------------------------------------------
+
+    def top_entities(self, limit: int, by: str = "score", distinct: bool = False) -> List[Dict]:
+        if by not in ENTITY_ORDER:
+            raise ValueError(f"Unknown entity order: {by} (expected one of {ENTITY_ORDER})")
+
+        where = "WHERE path IN (SELECT MIN(path) FROM entities GROUP BY tag) " if distinct else ""
+        cursor = self.conn.execute(
+            "SELECT path, tag, root, depth, conversations, time_minutes, score FROM entities "
+            f"{where}ORDER BY {by} DESC, path LIMIT ?", (limit,)
+        )
+        columns = [c[0] for c in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor]
+
+    def recent_conversations(self, limit: int) -> List[Dict]:
+        cursor = self.conn.execute(
+            "SELECT path, created, title, tags FROM conversations WHERE created IS NOT NULL "
+            "ORDER BY created DESC, path LIMIT ?", (limit,)
+        )
+        return [
+            {"path": path, "created": created, "title": title, "tags": json.loads(tags)}
+            for path, created, title, tags in cursor
+        ]
+
+    def entity_count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM entities").fetchone()[0]
+
+    def conversation_row_count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM conversations").fetchone()[0]
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Incrementally maintained metric aggregates")
+    parser.add_argument("files", nargs="*", help="Changed tag notes / processed conversations to apply")
+    parser.add_argument("--vault", type=str, default="C:/obsidian-memory-vault",
+                       help="Path to vault")
+    parser.add_argument("--sync", action="store_true",
+                       help="Apply every file changed since it was last applied")
+    parser.add_argument("--rebuild", action="store_true",
+                       help="Recompute all aggregates from scratch")
+    parser.add_argument("--verify", action="store_true",
+                       help="Compare the aggregates with a full recompute")
+
+    args = parser.parse_args()
+
+    aggregates = MetricAggregates(Path(args.vault))
+    try:
+        if args.rebuild:
+            stats = aggregates.rebuild()
+            print(f"\n[OK] Rebuilt metric aggregates from {stats['files']} files")
+        elif args.sync:
+            stats = aggregates.sync()
+            print(f"\n[OK] Synced: {stats['applied']} applied, {stats['removed']} removed")
+        elif args.files:
+            stats = aggregates.apply(args.files)
+            print(f"\n[OK] Applied: {stats['applied']} applied, {stats['removed']} removed")
+
+        if args.verify:
+            differences = aggregates.verify()
+            if differences:
+                print(f"\n[X] {len(differences)} difference(s) from a full recompute:")
+                for line in differences[:50]:
+                    print(f"   {line}")
+            else:
+                print(f"\n[OK] Aggregates match a full recompute")
+        elif not (args.rebuild or args.sync or args.files):
+            aggregates.ensure_built()
+            print(f"\n[OK] Metric Aggregates")
+            print(f"   Tag notes: {int(aggregates.total('tag_notes'))}")
+            print(f"   Conversations: {int(aggregates.total('conversations'))}")
+            print(f"   Database: {aggregates.db_path}")
+    finally:
+        aggregates.close()
+
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,9 @@ from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional
 from logger_setup import get_logger, TimedOperation
+from atomic_write import write_text
+from frontmatter_parser import read_header
+from taxonomy_cache import load_taxonomy
 
 
 class TagNoteMigrator:
@@ -33,20 +36,8 @@ class TagNoteMigrator:
             self.logger.error(f"Taxonomy file not found: {self.taxonomy_path}")
             return {}
 
-        with open(self.taxonomy_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        # Extract YAML blocks
-        taxonomy = {}
-        yaml_blocks = re.findall(r'```yaml\n(.*?)\n```', content, re.DOTALL)
-
-        for block in yaml_blocks:
-            try:
-                data = yaml.safe_load(block)
-                if isinstance(data, dict):
-                    taxonomy.update(data)
-            except yaml.YAMLError as e:
-                self.logger.warning(f"Failed to parse YAML block: {e}")
+        # Compiled snapshot; re-parsed only when the markdown changed
+        taxonomy = load_taxonomy(self.taxonomy_path, logger=self.logger)
 
         self.logger.info(f"Loaded {len(taxonomy)} tags from taxonomy")
         return taxonomy
@@ -62,20 +53,19 @@ class TagNoteMigrator:
                 continue
 
             try:
-                with open(md_file, 'r', encoding='utf-8') as f:
-                    content = f.read(500)
+                fm = read_header(md_file).data
 
-                    # Check if it's a tag note
-                    if 'type: tag-note' not in content:
-                        continue
+                # Check if it's a tag note
+                if fm.get('type') != 'tag-note':
+                    continue
 
-                    # Check if already migrated (has 'root:' field)
-                    if 'root:' in content:
-                        self.logger.debug(f"Already migrated: {md_file.name}")
-                        continue
+                # Check if already migrated (has 'root:' field)
+                if 'root' in fm:
+                    self.logger.debug(f"Already migrated: {md_file.name}")
+                    continue
 
-                    old_notes.append(md_file)
-            except:
+                old_notes.append(md_file)
+            except (OSError, UnicodeDecodeError):
                 pass
 
         self.logger.info(f"Found {len(old_notes)} tag notes to migrate")
@@ -159,8 +149,7 @@ class TagNoteMigrator:
 
             if not dry_run:
                 # Write back to file
-                with open(note_path, 'w', encoding='utf-8') as f:
-                    f.write(new_content)
+                write_text(note_path, new_content)
 
                 self.logger.info(f"Successfully migrated: {note_path.name}")
 
@@ -279,15 +268,12 @@ class TagNoteMigrator:
 
         for note_path in old_notes:
             try:
-                with open(note_path, 'r', encoding='utf-8') as f:
-                    content = f.read(500)
-
-                tag_match = re.search(r'^tag:\s*(.+)$', content, re.MULTILINE)
-                if tag_match:
-                    tag = tag_match.group(1).strip()
+                tag = read_header(note_path).get('tag')
+                if tag:
+                    tag = str(tag).strip()
                     in_taxonomy = "✅" if tag in self.taxonomy else "❌"
                     report += f"- `{note_path.name}` (tag: `{tag}`) {in_taxonomy}\n"
-            except:
+            except (OSError, UnicodeDecodeError):
                 pass
 
         report += f"\n## Tags Not in Taxonomy\n\n"
@@ -295,15 +281,10 @@ class TagNoteMigrator:
         missing_tags = []
         for note_path in old_notes:
             try:
-                with open(note_path, 'r', encoding='utf-8') as f:
-                    content = f.read(500)
-
-                tag_match = re.search(r'^tag:\s*(.+)$', content, re.MULTILINE)
-                if tag_match:
-                    tag = tag_match.group(1).strip()
-                    if tag not in self.taxonomy:
-                        missing_tags.append(tag)
-            except:
+                tag = read_header(note_path).get('tag')
+                if tag and str(tag).strip() not in self.taxonomy:
+                    missing_tags.append(str(tag).strip())
+            except (OSError, UnicodeDecodeError):
                 pass
 
         if missing_tags:
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+MinHash LSH Index
+Approximate entity similarity for very large vaults.
+
+Each entity keeps a MinHash signature of the set of conversations that mention
+it. Signatures live in an on-disk SQLite index (_system/similarity-lsh.db)
+together with LSH band buckets, so a lookup only touches candidate entities.
+Because the MinHash of a set union is the element-wise minimum, new
+conversations are folded in incrementally without recomputing anything else;
+an edited or removed conversation only recomputes the entities it mentions.
+"""
+
+import hashlib
+import json
+import random
+import sqlite3
+from array import array
+from pathlib import Path
+from typing import Dict, List
+
+try:
+    from scripts.logger_setup import get_logger, TimedOperation
+except ImportError:
+    from logger_setup import get_logger, TimedOperation
+
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 61) - 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS conversations (
+    conv_id TEXT PRIMARY KEY,
+    entities TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS signatures (
+    entity TEXT PRIMARY KEY,
+    signature BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS buckets (
+    band INTEGER NOT NULL,
+    bucket BLOB NOT NULL,
+    entity TEXT NOT NULL,
+    PRIMARY KEY (band, bucket, entity)
+);
+CREATE INDEX IF NOT EXISTS idx_buckets_entity ON buckets(entity);
+"""
+
+
+class MinHashLSHIndex:
+    """On-disk MinHash signatures with banded LSH buckets"""
+
+    def __init__(self, vault_path: Path, num_perm: int = 64, bands: int = 32,
+                 seed: int = 1, db_path: Path = None):
+        if num_perm % bands != 0:
+            raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands})")
+
+        self.vault_path = Path(vault_path)
+        self.logger = get_logger(__name__, str(vault_path))
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.seed = seed
+
+        if db_path is None:
+            db_path = self.vault_path / "_system" / "similarity-lsh.db"
+
+        self.db_path = Path(db_path)
+
+        rng = random.Random(seed)
+        self._perms = [
+            (rng.randrange(1, MERSENNE_PRIME), rng.randrange(0, MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+
+    def _connect(self) -> sqlite3.Connection:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.db_path))
+        conn.executescript(SCHEMA)
+        return conn
+
+    def _params(self) -> Dict:
+        return {"num_perm": self.num_perm, "bands": self.bands, "seed": self.seed}
+
+    def _hash_conversation(self, conv_id: str) -> List[int]:
+        """Permuted hash values of one conversation ID"""
+        x = int.from_bytes(hashlib.blake2b(conv_id.encode('utf-8'), digest_size=8).digest(), 'little')
+        return [(a * x + b) % MERSENNE_PRIME for a, b in self._perms]
+
+    def _band_keys(self, signature: array) -> List[bytes]:
+        return [
+            signature[band * self.rows:(band + 1) * self.rows].tobytes()
+            for band in range(self.bands)
+        ]
+
+    def _clear(self, conn: sqlite3.Connection):
+        for table in ("conversations", "signatures", "buckets", "meta"):
+            conn.execute(f"DELETE FROM {table}")
+        conn.executemany(
+            "INSERT INTO meta VALUES (?, ?)",
+            [(k, json.dumps(v)) for k, v in self._params().items()]
+        )
+
+    def _empty_signature(self) -> array:
+        return array('Q', [MAX_HASH] * self.num_perm)
+
+    def _fold(self, signature: array, conv_id: str):
+        """Element-wise min of a signature with one conversation's hashes"""
+        for i, h in enumerate(self._hash_conversation(conv_id)):
+            if h < signature[i]:
+                signature[i] = h
+
+    def get_cursor(self):
+        """Cursor stored by the last update (None if never set)"""
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'cursor'").fetchone()
+            return json.loads(row[0]) if row else None
+        finally:
+            conn.close()
+
+    def update(self, conversation_entities: Dict[str, List[str]], rebuild: bool = False,
+               cursor=None) -> Dict[str, int]:
+        """
+        Bring the index in line with the processed conversations
+
+        New conversations are folded into the signatures of their entities.
+        MinHash cannot subtract, so for a removed or edited conversation only
+        the entities it mentions(ed) are recomputed from their conversations.
+        Only new / changed conversation rows and signatures are written.
+
+        Args:
+            conversation_entities: conversation ID -> entity list for every processed conversation
+            rebuild: Discard the stored index first
+            cursor: Opaque change marker stored with the index (see get_cursor)
+
+        Returns:
+            Counts of added / removed / edited conversations and updated entities
+        """
+        stats = {"added": 0, "removed": 0, "edited": 0, "entities_updated": 0, "rebuilt": 0}
+        conn = self._connect()
+
+        try:
+            stored_params = {
+                k: json.loads(v) for k, v in conn.execute("SELECT key, value FROM meta")
+                if k != "cursor"
+            }
+            if rebuild or stored_params != self._params():
+                self._clear(conn)
+                stats["rebuilt"] = 1
+
+            known = {
+                conv_id: entities
+                for conv_id, entities in conn.execute("SELECT conv_id, entities FROM conversations")
+            }
+            current = {
+                conv_id: json.dumps(sorted(set(entities)))
+                for conv_id, entities in conversation_entities.items()
+            }
+
+            new = [conv_id for conv_id in current if conv_id not in known]
+            removed = [conv_id for conv_id in known if conv_id not in current]
+            edited = [conv_id for conv_id in known if conv_id in current and current[conv_id] != known[conv_id]]
+
+            if new or removed or edited:
+                with TimedOperation(self.logger, f"Updating LSH index ({len(new)} new, "
+                                                 f"{len(edited)} edited, {len(removed)} removed)"):
+                    touched = self._apply_changes(conn, known, current, new, removed, edited)
+
+                stats.update(added=len(new), removed=len(removed), edited=len(edited),
+                             entities_updated=len(touched))
+
+            if cursor is not None:
+                conn.execute("INSERT OR REPLACE INTO meta VALUES ('cursor', ?)", (json.dumps(cursor),))
+            conn.commit()
+        finally:
+            conn.close()
+
+        return stats
+
+    def _apply_changes(self, conn: sqlite3.Connection, known: Dict[str, str], current: Dict[str, str],
+                       new: List[str], removed: List[str], edited: List[str]) -> Dict[str, array]:
+        """Write the signature / bucket / conversation rows affected by a change set"""
+        # Entities of removed / edited conversations are recomputed from scratch
+        recompute = set()
+        for conv_id in removed + edited:
+            recompute.update(json.loads(known[conv_id]))
+            recompute.update(json.loads(current.get(conv_id, "[]")))
+
+        touched = {entity: self._empty_signature() for entity in recompute}
+        if recompute:
+            for conv_id, entities in current.items():
+                for entity in json.loads(entities):
+                    if entity in touched:
+                        self._fold(touched[entity], conv_id)
+
+        # Everything else: fold the new conversations into the stored signature
+        for conv_id in new:
+            for entity in json.loads(current[conv_id]):
+                if entity in recompute:
+                    continue
+                if entity not in touched:
+                    row = conn.execute(
+                        "SELECT signature FROM signatures WHERE entity = ?", (entity,)
+                    ).fetchone()
+                    signature = array('Q')
+                    if row:
+                        signature.frombytes(row[0])
+                    else:
+                        signature = self._empty_signature()
+                    touched[entity] = signature
+                self._fold(touched[entity], conv_id)
+
+        # Entities no longer mentioned anywhere are dropped
+        empty = self._empty_signature()
+        gone = [entity for entity, sig in touched.items() if sig == empty]
+        for entity in gone:
+            del touched[entity]
+
+        conn.executemany(
+            "DELETE FROM buckets WHERE entity = ?", [(entity,) for entity in list(touched) + gone]
+        )
+        conn.executemany("DELETE FROM signatures WHERE entity = ?", [(entity,) for entity in gone])
+        conn.executemany(
+            "INSERT OR REPLACE INTO signatures VALUES (?, ?)",
+            [(entity, sig.tobytes()) for entity, sig in touched.items()]
+        )
+        conn.executemany(
+            "INSERT OR IGNORE INTO buckets VALUES (?, ?, ?)",
+            [
+                (band, key, entity)
+                for entity, sig in touched.items()
+                for band, key in enumerate(self._band_keys(sig))
+            ]
+        )
+        conn.executemany("DELETE FROM conversations WHERE conv_id = ?", [(c,) for c in removed])
+        conn.executemany(
+            "INSERT OR REPLACE INTO conversations VALUES (?, ?)",
+            [(conv_id, current[conv_id]) for conv_id in new + edited]
+        )
+        return touched
+
+    def query(self, entity: str, limit: int = 10) -> List[Dict]:
+        """
+        Near-neighbours of an entity by estimated Jaccard similarity
+
+        Returns:
+            [{"entity", "estimated_jaccard"}] sorted by estimate
+        """
+        conn = self._connect()
+
+        try:
+            row = conn.execute("SELECT signature FROM signatures WHERE entity = ?", (entity,)).fetchone()
+            if not row:
+                return []
+
+            signature = array('Q')
+            signature.frombytes(row[0])
+
+            candidates = set()
+            for band, key in enumerate(self._band_keys(signature)):
+                for (other,) in conn.execute(
+                    "SELECT entity FROM buckets WHERE band = ? AND bucket = ?", (band, key)
+                ):
+                    if other != entity:
+                        candidates.add(other)
+
+            results = []
+            for other in candidates:
+                other_sig = array('Q')
+                other_sig.frombytes(conn.execute(
+                    "SELECT signature FROM signatures WHERE entity = ?", (other,)
+                ).fetchone()[0])
+
+                matches = sum(1 for a, b in zip(signature, other_sig) if a == b)
+                results.append({
+                    "entity": other,
+                    "estimated_jaccard": round(matches / self.num_perm, 3)
+                })
+        finally:
+            conn.close()
+
+        results.sort(key=lambda x: (-x["estimated_jaccard"], x["entity"]))
+        return results[:limit]
+
+    def stats(self) -> Dict[str, int]:
+        """Sizes of the stored index"""
+        conn = self._connect()
+        try:
+            return {
+                "conversations": conn.execute("SELECT COUNT(*) FROM conversations").fetchone()[0],
+                "entities": conn.execute("SELECT COUNT(*) FROM signatures").fetchone()[0],
+                "bands": self.bands,
+                "rows_per_band": self.rows
+            }
+        finally:
+            conn.close()
@@ -14,12 +14,23 @@ from pathlib import Path
 from datetime import datetime, timedelta
 from typing import List, Dict, Set, Tuple
 
+try:
+    from scripts.vault_index import VaultIndex
+    from scripts.tag_note_model import TagNote, parse_month_entries
+    from scripts.atomic_write import VaultWriter, write_text
+except ImportError:
+    from vault_index import VaultIndex
+    from tag_note_model import TagNote, parse_month_entries
+    from atomic_write import VaultWriter, write_text
+
+
 class MonthlyConsolidation:
     def __init__(self, vault_path: Path):
         self.vault_path = vault_path
         self.current_month = datetime.now().month
         self.current_year = datetime.now().year
         self.month_name = datetime.now().strftime("%B")
+        self.writer = None  # set for the duration of run()
 
     def is_last_day_of_month(self) -> bool:
         """Check if today is the last day of the month."""
@@ -29,22 +40,7 @@ class MonthlyConsolidation:
 
     def find_all_tag_notes(self) -> List[Path]:
         """Find all tag notes in the vault."""
-        tag_notes = []
-        for md_file in self.vault_path.rglob("*.md"):
-            # Skip if in certain directories
-            if any(part in md_file.parts for part in ["00-Inbox", "_system", ".obsidian"]):
-                continue
-
-            # Read frontmatter to check if it's a tag note
-            try:
-                with open(md_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                if 'type: tag-note' in content[:500]:  # Check first 500 chars
-                    tag_notes.append(md_file)
-            except Exception as e:
-                print(f"[!] Error reading {md_file}: {e}")
-
-        return tag_notes
+        return [note["path"] for note in VaultIndex(self.vault_path).tag_notes()]
 
     def extract_monthly_entries(self, content: str, month: int, year: int) -> List[Dict]:
         """
@@ -58,56 +54,11 @@ class MonthlyConsolidation:
         Returns:
             List of entry dicts with date, discussion, related_tags, source
         """
-        import calendar
-        month_name = calendar.month_name[month]
-
-        # Find month section (e.g., "## November 2025")
-        section_pattern = rf'## {month_name} {year}\s*\n(.*?)(?=\n##|\Z)'
-        section_match = re.search(section_pattern, content, re.DOTALL)
-
-        if not section_match:
+        section = TagNote(content).month_section(year, month)
+        if section is None:
             return []
 
-        month_section = section_match.group(1)
-        entries = []
-
-        # Extract individual entries (### YYYY-MM-DD HH:MM format)
-        entry_pattern = r'### (\d{4}-\d{2}-\d{2}(?: \d{2}:\d{2})?)\s*\n(.*?)(?=\n###|\Z)'
-
-        for match in re.finditer(entry_pattern, month_section, re.DOTALL):
-            date_str = match.group(1)
-            entry_body = match.group(2).strip()
-
-            # Parse entry body
-            # Extract discussion (everything before Related/Source lines)
-            discussion_lines = []
-            related_tags = []
-            source = None
-
-            for line in entry_body.split('\n'):
-                if line.startswith('**Related'):
-                    # Extract wikilinks from Related line
-                    related_tags = re.findall(r'\[\[([^\]]+)\]\]', line)
-                elif line.startswith('**Source'):
-                    # Extract source conversation link
-                    source_match = re.search(r'\[\[([^\]]+)\]\]', line)
-                    if source_match:
-                        source = source_match.group(1)
-                else:
-                    # Part of discussion
-                    if line.strip():
-                        discussion_lines.append(line.strip())
-
-            discussion = ' '.join(discussion_lines)
-
-            entries.append({
-                'date': date_str,
-                'discussion': discussion,
-                'related_tags': related_tags,
-                'source': source
-            })
-
-        return entries
+        return parse_month_entries(section.body)
 
     def find_related_tags(self, tag_name: str, content: str) -> List[str]:
         """Find related tags from Related Tags section and cross-references in updates."""
@@ -267,10 +218,14 @@ class MonthlyConsolidation:
         new_section = ''.join(new_section_parts)
 
         # Replace old month section with compressed version
-        old_section_pattern = rf'## {month_name} {year}\s*\n.*?(?=\n##|\Z)'
-        content = re.sub(old_section_pattern, new_section, content, flags=re.DOTALL)
+        note = TagNote(content)
+        section = note.month_section(year, month)
+        if section is None:
+            return content
 
-        return content
+        is_last = section is note.sections[-1]
+        note.replace_section(section.title, new_section + ('\n' if is_last else '\n\n'))
+        return note.render()
 
     def compress_previous_month_if_needed(self, tag_note_path: Path, target_month: int = None, target_year: int = None) -> bool:
         """
@@ -306,10 +261,11 @@ class MonthlyConsolidation:
             compress_month_name = calendar.month_name[compress_month]
 
             # Check if month section exists and isn't already compressed
-            if f"## {compress_month_name} {compress_year}" not in content:
+            section = TagNote(content).month_section(compress_year, compress_month)
+            if section is None:
                 return True  # Month doesn't exist, nothing to compress
 
-            if f"*Compressed from" in content and f"## {compress_month_name} {compress_year}" in content:
+            if "*Compressed from" in section.text:
                 print(f"[i] {compress_month_name} {compress_year} already compressed")
                 return True
 
@@ -335,8 +291,10 @@ class MonthlyConsolidation:
             )
 
             # Write back
-            with open(tag_note_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            if self.writer is not None:
+                self.writer.write_text(tag_note_path, content)
+            else:
+                write_text(tag_note_path, content)
 
             print(f"[✓] Compressed {compress_month_name} {compress_year} ({len(entries)} entries)")
             return True
@@ -398,9 +356,11 @@ class MonthlyConsolidation:
 
         # Process each tag note
         success_count = 0
-        for tag_note in tag_notes:
-            if self.process_tag_note(tag_note, compress_mode=compress):
-                success_count += 1
+        with VaultWriter(self.vault_path) as self.writer:
+            for tag_note in tag_notes:
+                if self.process_tag_note(tag_note, compress_mode=compress):
+                    success_count += 1
+        self.writer = None
 
         print(f"\n{'='*60}")
         print(f"[✓] Consolidation complete")
@@ -0,0 +1,461 @@
+#!/usr/bin/env python3
+"""
+Pipeline Runner
+Runs the deterministic processing stages for many conversations in parallel.
+
+The LLM stages (entity extraction, tagging, graph sync) stay with the
+Processing Pipeline Agent. Once a conversation carries its entities in
+frontmatter, everything after that is plain Python and is run here in a
+process pool, one conversation per task:
+
+    1. Tag discussion extraction (what the user said about each entity)
+    2. Time estimation (timestamp gaps capped at idle_gap_minutes, split by mentions)
+    3. Tag note updates
+    4. Finalization rename (processing_ -> processed_)
+
+After a run, the metric aggregates (metric_aggregates.py) are updated from the
+tag notes and conversations the run touched, so brain space metrics never need
+a full vault scan. With brain_space_calculation.mode "incremental" the metrics
+and dashboard data are re-exported from those aggregates right away.
+
+Conversations the journal already marks completed are skipped, and a tag note
+that already links to a conversation (**Source**) is not given a second entry,
+so re-running a folder never duplicates entries or time.
+
+A failure in one conversation is journaled and does not affect the others.
+Tag note updates are serialized through a fixed set of striped locks shared by
+all workers, so two conversations touching the same tag note never interleave
+their read-modify-write cycles.
+
+Usage:
+    python scripts/pipeline_runner.py --vault C:/obsidian-memory-vault            # drain the queue
+    python scripts/pipeline_runner.py --vault C:/obsidian-memory-vault --folder 00-Inbox/processed
+"""
+
+import json
+import multiprocessing
+import os
+import re
+import sys
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    from scripts.backfill_tag_notes import TagNoteBackfill
+    from scripts.extract_tag_knowledge import extract_conversation_body
+    from scripts.processing_queue import ProcessingQueue, PREFIX_RE, conversation_key
+    from scripts.metric_aggregates import MetricAggregates
+    from scripts.atomic_write import recover_vault
+except ImportError:
+    from backfill_tag_notes import TagNoteBackfill
+    from extract_tag_knowledge import extract_conversation_body
+    from processing_queue import ProcessingQueue, PREFIX_RE, conversation_key
+    from metric_aggregates import MetricAggregates
+    from atomic_write import recover_vault
+
+
+LOCK_STRIPES = 64
+STAGES = ("Tag Extraction", "Time Estimation", "Tag Notes Update", "Finalization")
+
+# A message timestamp at the start of a line: "18:45:23", "[18:45]", "2025-11-08 22:08:00"
+MESSAGE_TIME_RE = re.compile(
+    r'^\s*\[?(?:(\d{4}-\d{2}-\d{2})[ T])?([01]?\d|2[0-3]):([0-5]\d)(?::([0-5]\d))?\b',
+    re.MULTILINE
+)
+
+
+def load_config(vault_path: Path) -> Dict:
+    config_file = Path(vault_path) / "_system" / "config.json"
+    if not config_file.exists():
+        return {}
+    with open(config_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def parse_message_times(text: str) -> List[datetime]:
+    """
+    Message timestamps in order of appearance
+
+    Times without a date roll over to the next day when the clock goes
+    backwards (a conversation running past midnight).
+    """
+    times = []
+    day = datetime(2000, 1, 1)
+
+    for match in MESSAGE_TIME_RE.finditer(text):
+        date_str, hour, minute, second = match.groups()
+        if date_str:
+            try:
+                day = datetime.strptime(date_str, '%Y-%m-%d')
+            except ValueError:
+                continue
+
+        current = day.replace(hour=int(hour), minute=int(minute), second=int(second or 0))
+        if times and not date_str and current < times[-1]:
+            current += timedelta(days=1)
+            day += timedelta(days=1)
+        times.append(current)
+
+    return times
+
+
+def estimate_active_minutes(text: str, idle_gap_minutes: float = 30) -> Optional[float]:
+    """
+    Active conversation time with gaps capped at the idle threshold (Stage 4.2.2)
+
+    Returns:
+        Minutes, or None if the text has fewer than two message timestamps
+    """
+    times = parse_message_times(text)
+    if len(times) < 2:
+        return None
+
+    active = 0.0
+    for previous, current in zip(times, times[1:]):
+        gap = (current - previous).total_seconds() / 60
+        if gap > 0:
+            active += min(gap, idle_gap_minutes)
+
+    return round(active, 2)
+
+
+def allocate_time(entities: List[str], text: str, total_minutes: float,
+                  variations=None) -> Dict[str, float]:
+    """
+    Split conversation time across entities by mention count (Stage 4.2.3)
+
+    Entities that are never mentioned in the body still count once, so every
+    tag note receives a share.
+    """
+    lowered = text.lower()
+    mentions = {}
+    for entity in entities:
+        forms = variations(entity) if variations else [entity.lower()]
+        mentions[entity] = max(1, sum(lowered.count(form) for form in forms))
+
+    total = sum(mentions.values())
+    return {entity: round(total_minutes * count / total, 2) for entity, count in mentions.items()}
+
+
+# ---- Worker process ------------------------------------------------------
+
+_worker = {}
+
+
+def _init_worker(vault_path: str, locks, config: Dict):
+    """Per-process setup: taxonomy and extractor are loaded once per worker"""
+    _worker["backfill"] = TagNoteBackfill(vault_path)
+    _worker["queue"] = ProcessingQueue(Path(vault_path))
+    _worker["locks"] = locks
+
+    time_tracking = config.get("time_tracking", {})
+    _worker["idle_gap"] = time_tracking.get("idle_gap_minutes", 30)
+    _worker["default_minutes"] = time_tracking.get("default_session_minutes", 5)
+
+
+@contextmanager
+def tag_note_lock(tag_path: Path):
+    """Hold the stripe lock guarding one tag note (paths compare case-insensitively)"""
+    locks = _worker["locks"]
+    lock = locks[zlib.crc32(str(tag_path).lower().encode('utf-8')) % len(locks)]
+    with lock:
+        yield
+
+
+def _conversation_minutes(frontmatter: Dict, body: str) -> float:
+    minutes = estimate_active_minutes(body, _worker["idle_gap"])
+    if minutes is not None:
+        return minutes
+
+    metrics = frontmatter.get("metrics")
+    if isinstance(metrics, dict) and "duration_minutes" in metrics:
+        frontmatter = dict(frontmatter, duration_minutes=metrics["duration_minutes"])
+    if any(field in frontmatter for field in ("duration_minutes", "total_time_minutes", "duration")):
+        return float(_worker["backfill"].extract_duration(frontmatter))
+
+    return float(_worker["default_minutes"])
+
+
+def _claim(conversation: Path) -> Path:
+    """Rename unprocessed_ -> processing_ so the agent does not pick the file up too"""
+    if conversation.name.startswith("unprocessed_"):
+        claimed = conversation.with_name("processing_" + conversation.name[len("unprocessed_"):])
+        conversation.rename(claimed)
+        return claimed
+    return conversation
+
+
+def process_conversation(file_path: str, journal: bool = True) -> Dict:
+    """
+    Run the deterministic stages for one conversation (executes in a worker)
+
+    Returns:
+        {"file", "status": completed|failed|skipped, "created", "updated",
+         "minutes", "tags", "paths", "error"} where paths lists every file written
+        plus the conversation's note in 00-Inbox/processed
+    """
+    backfill = _worker["backfill"]
+    queue = _worker["queue"] if journal else None
+    conversation = Path(file_path)
+    result = {"file": conversation.name, "status": "skipped", "created": 0,
+              "updated": 0, "minutes": 0.0, "tags": [], "paths": [], "error": None}
+
+    def stage(index: int):
+        if queue:
+            queue.set_stage(conversation.name, f"{index + 1}/{len(STAGES)} ({STAGES[index]})")
+
+    try:
+        frontmatter = backfill.extract_frontmatter(conversation)
+        entities = sorted(backfill.extract_all_entities(frontmatter)) if frontmatter else []
+        if not entities:
+            # Needs the agent's entity extraction first; leave it queued
+            result["error"] = "no entities in frontmatter"
+            return result
+
+        conversation = _claim(conversation)
+        result["file"] = conversation.name
+        if queue:
+            queue.start(conversation.name, stage=f"1/{len(STAGES)} ({STAGES[0]})")
+
+        body = extract_conversation_body(conversation)
+        timestamp = backfill.parse_timestamp(frontmatter, conversation)
+        link = f"[[{PREFIX_RE.sub('', conversation.stem)}]]"
+
+        discussions = {}
+        for entity in entities:
+            discussion = backfill.extractor.extract_tag_discussion(entity, body)
+            if discussion and len(discussion.strip()) >= 20:
+                discussions[entity] = discussion
+
+        stage(1)
+        minutes = _conversation_minutes(frontmatter, body)
+        shares = allocate_time(list(discussions), body, minutes,
+                               variations=backfill.extractor._generate_tag_variations)
+        result["minutes"] = minutes
+
+        stage(2)
+        manager = backfill.manager
+        for entity, discussion in discussions.items():
+            tag_path = manager.get_or_create_tag_path(entity)
+            with tag_note_lock(tag_path):
+                if tag_path.exists() and f"**Source**: {link}" in tag_path.read_text(encoding='utf-8'):
+                    # Already recorded by an earlier run or the backfill
+                    continue
+                _, created = manager.create_or_update_tag_note(
+                    tag_name=entity,
+                    discussion_text=discussion,
+                    timestamp=timestamp,
+                    conversation_link=link,
+                    related_tags=manager.extract_related_tags(entities, entity),
+                    conversation_duration_minutes=shares[entity]
+                )
+            result["created" if created else "updated"] += 1
+            result["tags"].append(entity)
+            result["paths"].append(str(tag_path))
+
+        stage(3)
+        if conversation.name.startswith("processing_"):
+            final = conversation.with_name("processed_" + conversation.name[len("processing_"):])
+            conversation.rename(final)
+            conversation = final
+            result["file"] = final.name
+
+        result["paths"].append(str(conversation))
+        # Metrics count the conversation note in 00-Inbox/processed, not the
+        # processed_ raw file left in raw-conversations
+        node = backfill.processed_folder / conversation_key(conversation.name)
+        if node != conversation:
+            result["paths"].append(str(node))
+        result["status"] = "completed"
+        if queue:
+            queue.complete(conversation.name, {
+                "Tag Notes Created": result["created"],
+                "Tag Notes Updated": result["updated"],
+                "Duration": f"{minutes:g} minutes"
+            })
+
+    except Exception as e:
+        result["status"] = "failed"
+        result["error"] = f"{type(e).__name__}: {e}"
+        if queue:
+            try:
+                queue.fail(conversation.name, result["error"])
+            except OSError:
+                pass
+
+    return result
+
+
+# ---- Runner --------------------------------------------------------------
+
+class PipelineRunner:
+    """Fan conversations out over a process pool"""
+
+    def __init__(self, vault_path: Path, workers: int = None):
+        self.vault_path = Path(vault_path)
+        self.raw_folder = self.vault_path / "00-Inbox" / "raw-conversations"
+        self.config = load_config(self.vault_path)
+
+        configured = self.config.get("pipeline_runner", {}).get("workers")
+        self.workers = max(1, workers or configured or os.cpu_count() or 1)
+
+    def queued_files(self) -> List[Path]:
+        """Queued conversations still waiting in raw-conversations, in service order"""
+        files = []
+        for state in ProcessingQueue(self.vault_path).pending():
+            candidate = self.raw_folder / state["file"]
+            if candidate.exists():
+                files.append(candidate)
+        return files
+
+    def run(self, files: List[Path] = None, journal: bool = True, reprocess: bool = False) -> Dict:
+        """
+        Process conversations in parallel
+
+        Args:
+            files: Conversations to process (default: everything queued)
+            journal: Record state changes in the processing queue journal
+            reprocess: Also run conversations the journal marks completed
+
+        Returns:
+            Summary with per-file results
+        """
+        if files is None:
+            files = self.queued_files()
+
+        summary = {"completed": 0, "failed": 0, "skipped": 0, "created": 0,
+                   "updated": 0, "results": []}
+
+        if files and not reprocess:
+            completed = {state["key"] for state in ProcessingQueue(self.vault_path).by_status("completed")}
+            done = [f for f in files if conversation_key(f.name) in completed]
+            if done:
+                files = [f for f in files if conversation_key(f.name) not in completed]
+                summary["skipped"] += len(done)
+                print(f"[i] Skipping {len(done)} conversation(s) already completed")
+
+        if not files:
+            return summary
+
+        # A Manager is not needed: plain locks are inherited by the pool's workers
+        locks = [multiprocessing.Lock() for _ in range(LOCK_STRIPES)]
+        workers = min(self.workers, len(files))
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(str(self.vault_path), locks, self.config)) as pool:
+            futures = {pool.submit(process_conversation, str(f), journal): f for f in files}
+
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # The worker process itself died
+                    result = {"file": futures[future].name, "status": "failed", "created": 0,
+                              "updated": 0, "minutes": 0.0, "tags": [], "paths": [],
+                              "error": str(e)}
+
+                summary[result["status"]] += 1
+                summary["created"] += result["created"]
+                summary["updated"] += result["updated"]
+                summary["results"].append(result)
+                self._report(result)
+
+        if journal:
+            ProcessingQueue(self.vault_path).render()
+
+        self.update_metrics(summary["results"])
+        return summary
+
+    def update_metrics(self, results: List[Dict]):
+        """Apply the run's file changes to the metric aggregates"""
+        changed = sorted({path for result in results for path in result.get("paths", [])})
+        if not changed:
+            return
+
+        aggregates = MetricAggregates(self.vault_path)
+        try:
+            aggregates.apply(changed)
+        finally:
+            aggregates.close()
+
+        if self.config.get("brain_space_calculation", {}).get("mode") == "incremental":
+            try:
+                from scripts.brain_space_calculator import BrainSpaceCalculator
+                from scripts.export_brain_data import BrainDataExporter
+            except ImportError:
+                from brain_space_calculator import BrainSpaceCalculator
+                from export_brain_data import BrainDataExporter
+
+            BrainSpaceCalculator(self.vault_path).export_metrics(incremental=True)
+            BrainDataExporter(self.vault_path).export_all(incremental=True)
+
+    @staticmethod
+    def _report(result: Dict):
+        if result["status"] == "completed":
+            print(f"[OK] {result['file']}: {len(result['tags'])} tag note(s), {result['minutes']:g} min")
+        elif result["status"] == "failed":
+            print(f"[X] {result['file']}: {result['error']}")
+        else:
+            print(f"[-] {result['file']}: skipped ({result['error']})")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run deterministic pipeline stages in parallel")
+    parser.add_argument("files", nargs="*", help="Conversation files (default: queued files)")
+    parser.add_argument("--vault", type=str, default="C:/obsidian-memory-vault",
+                       help="Path to vault")
+    parser.add_argument("--folder", type=str,
+                       help="Process every conversation_*.md in this folder (bulk import)")
+    parser.add_argument("--workers", type=int, default=None,
+                       help="Worker processes (default: config pipeline_runner.workers, else CPU count)")
+    parser.add_argument("--no-journal", action="store_true",
+                       help="Do not record progress in the processing queue")
+    parser.add_argument("--reprocess", action="store_true",
+                       help="Also run conversations already completed (entries already in tag notes are still not duplicated)")
+
+    args = parser.parse_args()
+
+    vault_path = Path(args.vault)
+    if not vault_path.exists():
+        print(f"[X] Vault not found: {vault_path}")
+        sys.exit(1)
+
+    # Roll forward an interrupted batch; bulk imports also sweep stray temp files
+    recovery = recover_vault(vault_path, temp_files=bool(args.folder))
+    if recovery["recovered"] or recovery["removed"]:
+        print(f"[i] Recovered {recovery['recovered']} interrupted write(s), "
+              f"removed {len(recovery['removed'])} stray temp file(s)")
+
+    runner = PipelineRunner(vault_path, workers=args.workers)
+
+    files = None
+    if args.folder:
+        folder = Path(args.folder)
+        if not folder.is_absolute():
+            folder = vault_path / folder
+        files = sorted(folder.glob("*conversation_*.md"))
+    elif args.files:
+        files = [Path(f) for f in args.files]
+
+    print(f"\n[*] Pipeline runner: {runner.workers} worker(s)")
+    summary = runner.run(files, journal=not args.no_journal, reprocess=args.reprocess)
+
+    print(f"\n[OK] Pipeline Run Complete")
+    print(f"   Completed: {summary['completed']}")
+    print(f"   Failed: {summary['failed']}")
+    print(f"   Skipped: {summary['skipped']}")
+    print(f"   Tag notes created: {summary['created']}")
+    print(f"   Tag notes updated: {summary['updated']}\n")
+
+    if summary["failed"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,490 @@
+#!/usr/bin/env python3
+"""
+Processing Queue
+Append-only journal of conversation processing state.
+
+Every state change (queued, processing, stage, completed, failed) is one JSON
+line in _system/processing-queue.jsonl. The journal is the source of truth;
+_system/processing-queue.md is rendered from it and should not be edited by
+hand. Readers keep a byte offset into the journal, so picking up new events
+costs O(new records) rather than re-parsing the whole history.
+
+The folded state is also saved as a compacted snapshot
+(_system/processing-queue.snapshot.json) together with the journal offset it
+covers, so a fresh process (every CLI call) loads the snapshot and replays only
+the records appended after it. The snapshot is rewritten once enough new
+journal has accumulated, and is ignored if the journal no longer matches it.
+
+Usage (Processing Pipeline Agent):
+    python scripts/processing_queue.py start processing_conversation_X.md --stage "1/8 (Entity Extraction)"
+    python scripts/processing_queue.py stage processing_conversation_X.md "2/8 (Tagging)"
+    python scripts/processing_queue.py complete processed_conversation_X.md --detail "Entities Created=8"
+    python scripts/processing_queue.py fail processing_conversation_X.md --error "Neo4j unavailable"
+"""
+
+import hashlib
+import json
+import re
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    from scripts.atomic_write import write_json, write_text
+except ImportError:
+    from atomic_write import write_json, write_text
+
+
+EVENTS = ("queued", "processing", "stage", "completed", "failed")
+LANES = ("interactive", "bulk")  # pending files are served in this order
+PREFIX_RE = re.compile(r'^(unprocessed|processing|processed)_')
+SNAPSHOT_VERSION = 1
+SNAPSHOT_EVERY = 64 * 1024  # journal bytes replayed before the snapshot is rewritten
+SNAPSHOT_CHECK_BYTES = 4096  # journal bytes before the offset that must still match
+
+HEADER = """---
+type: meta
+title: Processing Queue
+created: 2025-11-07
+status: active
+---
+
+# Processing Queue
+
+> **Purpose**: Track files awaiting processing by the Processing Pipeline Agent
+>
+> **Generated file** - rendered from `_system/processing-queue.jsonl`. Do not edit by hand;
+> record state changes with `python scripts/processing_queue.py` instead.
+>
+> **How it works**:
+> 1. File watcher detects new `unprocessed_*.md` files and journals them as queued
+> 2. Processing Pipeline Agent journals `start` / `stage` / `complete` / `fail`
+> 3. This view is re-rendered after every change
+"""
+
+
+def conversation_key(file_name: str) -> str:
+    """Stable identity of a conversation across unprocessed_/processing_/processed_ renames"""
+    return PREFIX_RE.sub('', Path(file_name).name)
+
+
+def _lane_rank(lane: Optional[str]) -> int:
+    return LANES.index(lane) if lane in LANES else len(LANES)
+
+
+def _service_order(state: Dict):
+    return (_lane_rank(state.get("lane")), state.get("queued_at") or "")
+
+
+class ProcessingQueue:
+    """Journal-backed processing queue state"""
+
+    def __init__(self, vault_path: Path, journal_path: Path = None, view_path: Path = None,
+                 snapshot_path: Path = None):
+        self.vault_path = Path(vault_path)
+        self.journal_path = Path(journal_path) if journal_path else self.vault_path / "_system" / "processing-queue.jsonl"
+        self.view_path = Path(view_path) if view_path else self.vault_path / "_system" / "processing-queue.md"
+        self.snapshot_path = (Path(snapshot_path) if snapshot_path else
+                              self.journal_path.with_name(f"{self.journal_path.stem}.snapshot.json"))
+
+        self._lock = threading.Lock()
+        self._offset = 0
+        self._snapshot_offset = None  # journal offset of the last snapshot read or written
+        self.files = {}    # conversation key -> state
+        self.batches = {}  # batch id -> {"added", "mode", "total_size", "files"}
+
+    # ---- Journal ---------------------------------------------------------
+
+    def append(self, event: str, file_name: str = None, **fields) -> Dict:
+        """Journal one state change and fold it into the in-memory state"""
+        if event not in EVENTS:
+            raise ValueError(f"Unknown queue event: {event} (expected one of {EVENTS})")
+
+        record = {"ts": datetime.now().isoformat(timespec="seconds"), "event": event}
+        if file_name is not None:
+            record["file"] = Path(file_name).name
+        record.update(fields)
+
+        line = (json.dumps(record, ensure_ascii=False) + "\n").encode('utf-8')
+
+        with self._lock:
+            self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+            # One append-mode write per record, so lines from several processes never interleave
+            with open(self.journal_path, 'ab') as f:
+                f.write(line)
+            # Our record is folded in by reading it back, together with any
+            # records other processes appended before it
+            self._read_new()
+
+        return record
+
+    def refresh(self) -> List[Dict]:
+        """
+        Read records appended since the last call (by any process)
+
+        Returns:
+            The new records, oldest first
+        """
+        with self._lock:
+            return self._read_new()
+
+    def _read_new(self) -> List[Dict]:
+        try:
+            size = self.journal_path.stat().st_size
+        except FileNotFoundError:
+            return []
+
+        if size < self._offset:
+            # Journal was replaced; start over
+            self._offset = 0
+            self.files = {}
+            self.batches = {}
+            self._snapshot_offset = None
+
+        if self._offset == 0 and self._snapshot_offset is None:
+            self._load_snapshot(size)
+
+        if size == self._offset:
+            return []
+
+        with open(self.journal_path, 'rb') as f:
+            f.seek(self._offset)
+            data = f.read()
+
+        # Leave a partially written last line for the next call
+        end = data.rfind(b"\n") + 1
+        records = []
+        for raw in data[:end].splitlines():
+            if raw.strip():
+                try:
+                    records.append(json.loads(raw))
+                except json.JSONDecodeError:
+                    continue
+
+        self._offset += end
+        for record in records:
+            self._apply(record)
+
+        if self._offset - (self._snapshot_offset or 0) >= SNAPSHOT_EVERY:
+            self._save_snapshot()
+        return records
+
+    # ---- Snapshot --------------------------------------------------------
+
+    def _journal_check(self, offset: int) -> str:
+        """Hash of the journal bytes just before `offset`"""
+        start = max(0, offset - SNAPSHOT_CHECK_BYTES)
+        with open(self.journal_path, 'rb') as f:
+            f.seek(start)
+            return hashlib.sha256(f.read(offset - start)).hexdigest()
+
+    def _load_snapshot(self, journal_size: int):
+        """Start from the compacted snapshot if it still describes this journal"""
+        self._snapshot_offset = 0
+        try:
+            with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+            offset = snapshot["offset"]
+            if (snapshot.get("version") != SNAPSHOT_VERSION or not 0 < offset <= journal_size
+                    or snapshot["check"] != self._journal_check(offset)):
+                return
+            files, batches = snapshot["files"], snapshot["batches"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return
+
+        self.files = files
+        self.batches = batches
+        self._offset = self._snapshot_offset = offset
+
+    def _save_snapshot(self):
+        snapshot = {
+            "version": SNAPSHOT_VERSION,
+            "offset": self._offset,
+            "check": self._journal_check(self._offset),
+            "files": self.files,
+            "batches": self.batches
+        }
+        try:
+            write_json(self.snapshot_path, snapshot, ensure_ascii=False)
+        except OSError:
+            return  # the journal alone is still complete
+        self._snapshot_offset = self._offset
+
+    def compact(self) -> Path:
+        """Write the snapshot now, covering the whole journal"""
+        with self._lock:
+            self._read_new()
+            self._save_snapshot()
+        return self.snapshot_path
+
+    def _apply(self, record: Dict):
+        event = record.get("event")
+        ts = record.get("ts")
+
+        if event == "queued":
+            batch_id = record.get("batch", ts)
+            batch = self.batches.setdefault(batch_id, {
+                "added": ts,
+                "mode": record.get("mode", "Single"),
+                "lane": record.get("lane"),
+                "total_size": record.get("total_size", 0),
+                "files": []
+            })
+            batch["files"].append(record["file"])
+
+        file_name = record.get("file")
+        if not file_name:
+            return
+
+        key = conversation_key(file_name)
+        state = self.files.setdefault(key, {"key": key})
+        state["file"] = file_name
+        state["updated"] = ts
+
+        if event == "queued":
+            state.update({
+                "status": "queued", "batch": record.get("batch", ts), "queued_at": ts,
+                "size": record.get("size"), "lane": record.get("lane"), "stage": None, "error": None
+            })
+        elif event == "processing":
+            state.update({"status": "processing", "started_at": ts, "stage": record.get("stage"), "error": None})
+        elif event == "stage":
+            state["status"] = "processing"
+            state.setdefault("started_at", ts)
+            state["stage"] = record.get("stage")
+        elif event == "completed":
+            state.update({"status": "completed", "completed_at": ts, "details": record.get("details", {})})
+        elif event == "failed":
+            state.update({"status": "failed", "failed_at": ts, "error": record.get("error")})
+
+    # ---- Convenience writers --------------------------------------------
+
+    def enqueue_batch(self, files: List[Path], mode: str, total_size: int, lane: str = None) -> str:
+        """Journal a batch of newly detected files (lane: one of LANES, for priority)"""
+        batch_id = datetime.now().isoformat()
+        fields = {"lane": lane} if lane else {}
+        for file_path in files:
+            try:
+                size = Path(file_path).stat().st_size
+            except OSError:
+                size = None
+            self.append("queued", str(file_path), batch=batch_id, mode=mode,
+                        total_size=total_size, size=size, **fields)
+        return batch_id
+
+    def start(self, file_name: str, stage: str = None) -> Dict:
+        return self.append("processing", file_name, stage=stage)
+
+    def set_stage(self, file_name: str, stage: str) -> Dict:
+        return self.append("stage", file_name, stage=stage)
+
+    def complete(self, file_name: str, details: Dict = None) -> Dict:
+        return self.append("completed", file_name, details=details or {})
+
+    def fail(self, file_name: str, error: str) -> Dict:
+        return self.append("failed", file_name, error=error)
+
+    # ---- Queries ---------------------------------------------------------
+
+    def by_status(self, status: str) -> List[Dict]:
+        self.refresh()
+        return [state for state in self.files.values() if state.get("status") == status]
+
+    def pending(self) -> List[Dict]:
+        """Queued files in service order: interactive lane first, then oldest first"""
+        return sorted(self.by_status("queued"), key=_service_order)
+
+    def processing(self) -> List[Dict]:
+        return self.by_status("processing")
+
+    def in_flight_bytes(self, folder: Path = None) -> int:
+        """
+        Bytes of files queued or being processed
+
+        With `folder`, only conversations still present there as
+        unprocessed_/processing_ count, so entries abandoned outside the
+        journal cannot hold the total up forever.
+        """
+        self.refresh()
+        total = 0
+        for key, state in self.files.items():
+            if state.get("status") not in ("queued", "processing"):
+                continue
+            if folder is not None and not any(
+                (Path(folder) / f"{prefix}_{key}").exists() for prefix in ("unprocessed", "processing")
+            ):
+                continue
+            total += state.get("size") or 0
+        return total
+
+    # ---- Markdown view ---------------------------------------------------
+
+    def render(self, completed_window_hours: int = 24) -> Path:
+        """Render processing-queue.md from the journal state"""
+        self.refresh()
+        now = datetime.now()
+        cutoff = (now - timedelta(hours=completed_window_hours)).isoformat(timespec="seconds")
+
+        pending = [s for s in self.files.values() if s.get("status") == "queued"]
+        processing = [s for s in self.files.values() if s.get("status") == "processing"]
+        completed = sorted(
+            (s for s in self.files.values() if s.get("status") == "completed" and s["completed_at"] >= cutoff),
+            key=lambda s: s["completed_at"], reverse=True
+        )
+        failed = sorted(
+            (s for s in self.files.values() if s.get("status") == "failed"),
+            key=lambda s: s["failed_at"], reverse=True
+        )
+
+        lines = [HEADER, "---", "", "## Files Awaiting Processing", ""]
+
+        pending_by_batch = {}
+        for state in pending:
+            pending_by_batch.setdefault(state["batch"], []).append(state)
+
+        # Interactive batches first, newest first within a lane
+        for batch_id in sorted(sorted(pending_by_batch, reverse=True),
+                               key=lambda b: _lane_rank(self.batches.get(b, {}).get("lane"))):
+            batch = self.batches.get(batch_id, {})
+            lines += [
+                f"### Batch Added: {batch.get('added', batch_id)}",
+                "",
+                f"**Mode**: {batch.get('mode', 'Single')}",
+                f"**Lane**: {(batch.get('lane') or 'unassigned').title()}",
+                f"**File count**: {len(batch.get('files', []))}",
+                f"**Total Size**: {batch.get('total_size', 0):,} bytes",
+                "",
+                "**Files**:"
+            ]
+            lines += [f"- [ ] {state['file']}" for state in pending_by_batch[batch_id]]
+            lines.append("")
+
+        if pending:
+            lines.append(f"**Queue Status**: {len(pending)} file(s) awaiting processing ⏳")
+        else:
+            lines.append("**Queue Status**: Empty ✅")
+        lines += ["", f"**Last Check**: {now.isoformat(timespec='seconds')}", "", "---", "",
+                  "## Currently Processing", ""]
+
+        for state in processing:
+            lines += [
+                f"- {state['file']}",
+                f"  - **Started**: {state.get('started_at', 'Unknown')}",
+                f"  - **Stage**: {state.get('stage') or 'Unknown'}"
+            ]
+        if not processing:
+            lines.append("<!-- No files currently being processed -->")
+
+        lines += ["", f"## Completed (Last {completed_window_hours} Hours)", ""]
+        for state in completed:
+            lines += [f"- [x] {state['file']}", f"  - **Completed**: {state['completed_at']}"]
+            if state.get("started_at"):
+                minutes = (datetime.fromisoformat(state["completed_at"]) -
+                           datetime.fromisoformat(state["started_at"])).total_seconds() / 60
+                lines.append(f"  - **Duration**: ~{max(1, round(minutes))} minutes")
+            for name, value in state.get("details", {}).items():
+                lines.append(f"  - **{name}**: {value}")
+            lines += ["  - **Status**: ✅ Success", ""]
+
+        lines += ["---", "", "## Errors", ""]
+        for state in failed:
+            lines += [
+                f"- [ ] {state['file']}",
+                f"  - **Failed**: {state['failed_at']}",
+                f"  - **Stage**: {state.get('stage') or 'Unknown'}",
+                f"  - **Error**: {state.get('error')}",
+                ""
+            ]
+        if not failed:
+            lines.append("<!-- Failed processing attempts with error messages -->")
+
+        self._archive_legacy_view()
+
+        write_text(self.view_path, "\n".join(lines) + "\n")
+        return self.view_path
+
+    def _archive_legacy_view(self):
+        """Keep the hand-edited queue history the first time the view is generated"""
+        if not self.view_path.exists():
+            return
+
+        with open(self.view_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+        if "rendered from `_system/processing-queue.jsonl`" in content:
+            return
+
+        archive = self.view_path.with_name("processing-queue-archive.md")
+        if not archive.exists():
+            write_text(archive, content)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Journal processing queue state changes")
+    parser.add_argument("--vault", type=str, default="C:/obsidian-memory-vault",
+                       help="Path to vault")
+
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    start = subparsers.add_parser("start", help="Mark a file as being processed")
+    start.add_argument("file")
+    start.add_argument("--stage", default="1/8 (Entity Extraction)")
+
+    stage = subparsers.add_parser("stage", help="Update the current pipeline stage")
+    stage.add_argument("file")
+    stage.add_argument("stage")
+
+    complete = subparsers.add_parser("complete", help="Mark a file as processed")
+    complete.add_argument("file")
+    complete.add_argument("--detail", action="append", default=[], metavar="KEY=VALUE",
+                         help="Extra fields for the Completed section (repeatable)")
+
+    fail = subparsers.add_parser("fail", help="Record a processing failure")
+    fail.add_argument("file")
+    fail.add_argument("--error", required=True)
+
+    subparsers.add_parser("status", help="Show pending and in-progress files")
+    subparsers.add_parser("render", help="Re-render processing-queue.md")
+    subparsers.add_parser("compact", help="Rewrite the state snapshot so later calls skip the history")
+
+    args = parser.parse_args()
+
+    queue = ProcessingQueue(Path(args.vault))
+
+    if args.command == "start":
+        queue.start(args.file, stage=args.stage)
+    elif args.command == "stage":
+        queue.set_stage(args.file, args.stage)
+    elif args.command == "complete":
+        details = {}
+        for item in args.detail:
+            name, _, value = item.partition("=")
+            details[name.strip()] = value.strip()
+        queue.complete(args.file, details)
+    elif args.command == "fail":
+        queue.fail(args.file, args.error)
+
+    if args.command == "compact":
+        snapshot = queue.compact()
+        print(f"[OK] compact: {snapshot} ({len(queue.files)} file(s), journal offset {queue._offset:,})")
+    elif args.command == "status":
+        pending = queue.pending()
+        processing = queue.processing()
+        print(f"\n[OK] Processing Queue")
+        print(f"   Awaiting: {len(pending)}")
+        for state in pending:
+            print(f"      - {state['file']}")
+        print(f"   Processing: {len(processing)}")
+        for state in processing:
+            print(f"      - {state['file']} ({state.get('stage') or 'Unknown'})")
+        print()
+    else:
+        view = queue.render()
+        print(f"[OK] {args.command}: {view}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Semantic Search
+Query the note embeddings produced by embed_notes_ollama.py from Python.
+
+Vectors are read zero-copy from the binary vector store (_system/vector-store).
+Search is exact cosine similarity by default; for large vaults an optional IVF
+index (k-means coarse quantizer, pure NumPy) narrows each query to the nearest
+clusters. The IVF index is persisted next to the store and new vectors are
+assigned to existing clusters instead of re-clustering.
+
+The query embedder is pluggable: pass any callable text -> vector. The default
+calls Ollama through OllamaEmbedder.
+"""
+
+import json
+import math
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+try:
+    from scripts.logger_setup import get_logger, TimedOperation
+    from scripts.vector_store import VectorStore
+except ImportError:
+    from logger_setup import get_logger, TimedOperation
+    from vector_store import VectorStore
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+DEFAULT_MODEL = "nomic-embed-text:latest"
+
+
+class SemanticSearch:
+    """Top-k note and chunk retrieval over the binary vector store"""
+
+    def __init__(self, vault_path: Path, embed_fn: Callable[[str], List[float]] = None,
+                 ollama_url: str = "http://localhost:11434", model: str = DEFAULT_MODEL,
+                 store_dir: Path = None):
+        self.vault_path = Path(vault_path)
+        self.logger = get_logger(__name__, str(vault_path))
+        self.ollama_url = ollama_url
+        self.model = model
+        self.store_dir = Path(store_dir) if store_dir else self.vault_path / "_system" / "vector-store"
+        self.ivf_file = self.store_dir / "ivf-index.npz"
+
+        self._embed_fn = embed_fn
+        self.store = None
+        self._keys = []
+        self._rows = None
+        self._norms = None
+        self._ivf = None
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed the query text with the configured embedder"""
+        if self._embed_fn is None:
+            try:
+                from scripts.embed_notes_ollama import OllamaEmbedder
+            except ImportError:
+                from embed_notes_ollama import OllamaEmbedder
+
+            embedder = OllamaEmbedder(self.vault_path, self.ollama_url)
+            self._embed_fn = embedder.get_embedding
+
+        vector = self._embed_fn(text)
+        if not vector:
+            raise RuntimeError("Query embedding failed")
+        return vector
+
+    def load(self):
+        """(Re)load the store table and catch the IVF index up with new vectors"""
+        # Readers follow the store's own precision (float32 or float16)
+        self.store = VectorStore.open(self.store_dir, self.model)
+
+        ordered = sorted(self.store.entries.items(), key=lambda item: item[1]["row"])
+        self._keys = [key for key, _ in ordered]
+        rows = [entry["row"] for _, entry in ordered]
+
+        if np is not None:
+            self._rows = np.asarray(rows, dtype=np.int64)
+            matrix = self.store.matrix()
+            self._norms = self._row_norms(matrix) if len(matrix) else None
+        else:
+            self._rows = rows
+
+        self._ivf = self._load_ivf()
+        return self
+
+    def _ensure_loaded(self):
+        if self.store is None:
+            self.load()
+
+    # ---- IVF index -------------------------------------------------------
+
+    def build_ivf(self, nlist: int = None, iterations: int = 10, seed: int = 0) -> Dict:
+        """
+        Cluster all stored vectors into `nlist` inverted lists
+
+        Args:
+            nlist: Number of clusters (default: sqrt of vector count)
+            iterations: k-means iterations
+            seed: Random seed for the initial centroids
+
+        Returns:
+            Index statistics
+        """
+        if np is None:
+            raise ImportError("numpy is required for the IVF index")
+
+        self._ensure_loaded()
+        matrix = self.store.matrix()
+        if not len(matrix):
+            raise ValueError("Vector store is empty")
+
+        data = self._unit(np.asarray(matrix, dtype=np.float32))
+        nlist = min(len(data), nlist or max(1, int(math.sqrt(len(data)))))
+
+        with TimedOperation(self.logger, f"Building IVF index ({nlist} lists, {len(data)} vectors)"):
+            rng = np.random.default_rng(seed)
+            centroids = data[rng.choice(len(data), nlist, replace=False)].copy()
+
+            for _ in range(iterations):
+                assignments = self._assign(data, centroids)
+                for c in range(nlist):
+                    members = data[assignments == c]
+                    if len(members):
+                        centroids[c] = members.mean(axis=0)
+                centroids = self._unit(centroids)
+
+            assignments = self._assign(data, centroids)
+
+        self._ivf = {
+            "centroids": centroids,
+            "assignments": assignments,
+            "generation": self.store.generation
+        }
+        self._save_ivf()
+
+        return {"lists": nlist, "vectors": len(data)}
+
+    @staticmethod
+    def _row_norms(matrix, chunk_size: int = 65536):
+        """Row norms computed in float32 (a float16 store is upcast chunk by chunk)"""
+        norms = np.empty(len(matrix), dtype=np.float32)
+        for start in range(0, len(matrix), chunk_size):
+            chunk = np.asarray(matrix[start:start + chunk_size], dtype=np.float32)
+            norms[start:start + chunk_size] = np.linalg.norm(chunk, axis=1)
+        return norms
+
+    @staticmethod
+    def _unit(vectors):
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    @staticmethod
+    def _assign(data, centroids, chunk_size: int = 4096):
+        """Nearest centroid (by cosine) of every row"""
+        out = np.empty(len(data), dtype=np.int32)
+        for start in range(0, len(data), chunk_size):
+            out[start:start + chunk_size] = np.argmax(data[start:start + chunk_size] @ centroids.T, axis=1)
+        return out
+
+    def _save_ivf(self):
+        np.savez(
+            self.ivf_file,
+            centroids=self._ivf["centroids"],
+            assignments=self._ivf["assignments"],
+            generation=np.int64(self._ivf["generation"])
+        )
+
+    def _load_ivf(self) -> Optional[Dict]:
+        """Load the IVF index, assigning vectors added since it was built"""
+        if np is None or not self.ivf_file.exists():
+            return None
+
+        with np.load(self.ivf_file) as data:
+            ivf = {
+                "centroids": data["centroids"],
+                "assignments": data["assignments"],
+                "generation": int(data["generation"])
+            }
+
+        indexed = len(ivf["assignments"])
+        if ivf["generation"] != self.store.generation or indexed > self.store.rows:
+            # Rows were renumbered by compaction
+            self.logger.info("Vector store was compacted; IVF index needs a rebuild")
+            return None
+
+        if indexed < self.store.rows:
+            new_rows = self._unit(np.asarray(self.store.matrix()[indexed:], dtype=np.float32))
+            ivf["assignments"] = np.concatenate([ivf["assignments"], self._assign(new_rows, ivf["centroids"])])
+            self._ivf = ivf
+            self._save_ivf()
+            self.logger.info(f"IVF index: assigned {len(new_rows)} new vector(s)")
+
+        return ivf
+
+    # ---- Search ----------------------------------------------------------
+
+    def search(self, query: str, k: int = 10, by_note: bool = False, nprobe: int = 8) -> List[Dict]:
+        """
+        Top-k chunks (or notes) most similar to a query string
+
+        Args:
+            query: Free-text query
+            k: Number of results
+            by_note: Collapse chunks to one result per note (best chunk wins)
+            nprobe: IVF lists to scan when an IVF index exists
+
+        Returns:
+            [{"key", "path", "lines", "score"}] sorted by score
+        """
+        return self.search_vector(self.embed_query(query), k=k, by_note=by_note, nprobe=nprobe)
+
+    def search_vector(self, vector: List[float], k: int = 10, by_note: bool = False,
+                      nprobe: int = 8) -> List[Dict]:
+        """Top-k results for an already embedded query"""
+        self._ensure_loaded()
+
+        if not self._keys:
+            return []
+        if self.store.dim is not None and len(vector) != self.store.dim:
+            raise ValueError(f"Query dimension {len(vector)} != store dimension {self.store.dim}")
+
+        if np is None:
+            scored = self._score_python(vector)
+        else:
+            scored = self._score_numpy(np.asarray(vector, dtype=np.float32), nprobe)
+
+        results = []
+        seen_paths = set()
+        for score, key in scored:
+            entry = self.store.entries[key]
+            if by_note:
+                if entry["path"] in seen_paths:
+                    continue
+                seen_paths.add(entry["path"])
+
+            results.append({
+                "key": key,
+                "path": entry["path"],
+                "lines": entry["lines"],
+                "score": round(float(score), 4)
+            })
+            if len(results) >= k:
+                break
+
+        return results
+
+    def _score_numpy(self, query, nprobe: int):
+        """(score, key) pairs, best first, from the memory-mapped matrix"""
+        matrix = self.store.matrix()
+        query = query / (np.linalg.norm(query) or 1.0)
+        positions = np.arange(len(self._keys))
+
+        if self._ivf is not None:
+            # Live positions whose row falls in the nprobe closest lists
+            probe = np.argsort(-(self._ivf["centroids"] @ query))[:nprobe]
+            in_probe = np.isin(self._ivf["assignments"][self._rows], probe)
+            positions = positions[in_probe]
+
+        rows = self._rows[positions]
+        norms = self._norms[rows]
+        norms[norms == 0] = 1.0
+        scores = (np.asarray(matrix[rows], dtype=np.float32) @ query) / norms
+
+        order = np.argsort(-scores, kind="stable")
+        return ((scores[i], self._keys[positions[i]]) for i in order)
+
+    def _score_python(self, vector: List[float]):
+        """Exact cosine scores without numpy"""
+        q_norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+        scored = []
+
+        for key in self._keys:
+            other = self.store.get(key)
+            norm = math.sqrt(sum(x * x for x in other)) or 1.0
+            scored.append((sum(a * b for a, b in zip(vector, other)) / (q_norm * norm), key))
+
+        scored.sort(key=lambda x: (-x[0], x[1]))
+        return scored
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Semantic search over embedded notes")
+    parser.add_argument("query", nargs="?", help="Search query")
+    parser.add_argument("--vault", type=str, default="C:/obsidian-memory-vault",
+                       help="Path to vault")
+    parser.add_argument("--ollama-url", type=str, default="http://localhost:11434",
+                       help="Ollama API URL for the query embedding")
+    parser.add_argument("--limit", type=int, default=10,
+                       help="Number of results")
+    parser.add_argument("--notes", action="store_true",
+                       help="Return one result per note instead of per chunk")
+    parser.add_argument("--build-ivf", action="store_true",
+                       help="(Re)build the IVF index (requires numpy)")
+    parser.add_argument("--nlist", type=int, default=None,
+                       help="IVF lists (default: sqrt of vector count)")
+    parser.add_argument("--nprobe", type=int, default=8,
+                       help="IVF lists scanned per query")
+    parser.add_argument("--json", action="store_true",
+                       help="Output as JSON")
+
+    args = parser.parse_args()
+
+    search = SemanticSearch(Path(args.vault), ollama_url=args.ollama_url)
+
+    if args.build_ivf:
+        stats = search.build_ivf(nlist=args.nlist)
+        print(f"\n[OK] IVF Index Built")
+        print(f"   Lists: {stats['lists']}")
+        print(f"   Vectors: {stats['vectors']}")
+        print(f"   File: {search.ivf_file}\n")
+
+    if not args.query:
+        if not args.build_ivf:
+            parser.error("a query is required unless --build-ivf is given")
+        return
+
+    results = search.search(args.query, k=args.limit, by_note=args.notes, nprobe=args.nprobe)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"\n[OK] Semantic Search: {args.query}")
+        for result in results:
+            print(f"\n   {result['path']} (lines {result['lines'][0]}-{result['lines'][1]})")
+            print(f"      Score: {result['score']}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
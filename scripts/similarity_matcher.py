@@ -4,11 +4,200 @@ Similarity Matcher
 Find similar entities based on co-occurrence patterns and shared contexts
 """
 
-import re
+import hashlib
+import json
+import os
 from pathlib import Path
 from typing import Dict, List, Tuple, Set
 from collections import defaultdict
+from datetime import datetime
 from logger_setup import get_logger, TimedOperation
+from vault_index import VaultIndex
+from minhash_lsh import MinHashLSHIndex
+
+# Optional: vectorized sparse similarity engine
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:
+    np = None
+    sparse = None
+
+
+class CooccurrenceIndex:
+    """Inverted entity <-> conversation index built once per run"""
+
+    def __init__(self, conversation_entities: Dict[str, List[str]]):
+        # conversation -> entity list (order and duplicates preserved)
+        self.conversation_entities = conversation_entities
+
+        # entity -> sorted conversation IDs
+        entity_conversations = defaultdict(set)
+        for conv_id, entities in conversation_entities.items():
+            for entity in entities:
+                entity_conversations[entity].add(conv_id)
+
+        self.entity_conversations = {
+            entity: sorted(convs) for entity, convs in entity_conversations.items()
+        }
+        self._entity_sets = {
+            entity: frozenset(convs) for entity, convs in entity_conversations.items()
+        }
+
+    @classmethod
+    def from_conversations(cls, conversations: List[Dict]) -> "CooccurrenceIndex":
+        """Build from vault index conversation records"""
+        return cls({conv["path"].name: conv["entities"] for conv in conversations})
+
+    @classmethod
+    def load(cls, index_file: Path) -> "CooccurrenceIndex":
+        """Load a previously saved index"""
+        with open(index_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(data["conversation_entities"])
+
+    def save(self, index_file: Path):
+        """Save index as JSON"""
+        data = {
+            "generated_at": datetime.now().isoformat(),
+            "total_entities": len(self.entity_conversations),
+            "total_conversations": len(self.conversation_entities),
+            "entity_conversations": self.entity_conversations,
+            "conversation_entities": self.conversation_entities
+        }
+
+        with open(index_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+
+    def conversations_for(self, entity: str) -> Set[str]:
+        """Conversation IDs mentioning an entity"""
+        return self._entity_sets.get(entity, frozenset())
+
+    def entities_for(self, conv_id: str) -> List[str]:
+        """Entities mentioned in a conversation"""
+        return self.conversation_entities.get(conv_id, [])
+
+
+class SparseCooccurrenceEngine:
+    """
+    Vectorized co-occurrence and Jaccard scoring over a sparse
+    entity x conversation incidence matrix (requires numpy + scipy)
+    """
+
+    def __init__(self, cooccurrence: CooccurrenceIndex):
+        if sparse is None:
+            raise ImportError("Sparse similarity engine requires numpy and scipy (pip install numpy scipy)")
+
+        self.entities = sorted(cooccurrence.entity_conversations)
+        self.entity_ids = {entity: i for i, entity in enumerate(self.entities)}
+        self.conversations = sorted(cooccurrence.conversation_entities)
+
+        # counts[e, c] = times entity e is listed in conversation c
+        rows, cols = [], []
+        for c, conv_id in enumerate(self.conversations):
+            for entity in cooccurrence.entities_for(conv_id):
+                rows.append(self.entity_ids[entity])
+                cols.append(c)
+
+        shape = (len(self.entities), len(self.conversations))
+        self.counts = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.float64), (rows, cols)), shape=shape
+        )
+        self.counts.sum_duplicates()
+
+        self.incidence = self.counts.copy()
+        self.incidence.data[:] = 1.0
+        self.sizes = np.asarray(self.incidence.sum(axis=1)).ravel()
+
+    def top_k(self, targets: List[str], k: int = 5, chunk_size: int = 1024) -> Dict[str, List[Dict]]:
+        """
+        Top-k similar entities for each target, same scoring as
+        SimilarityMatcher.find_similar_entities
+        """
+        results = {t: [] for t in targets}
+        known = [(t, self.entity_ids[t]) for t in targets if t in self.entity_ids]
+
+        for chunk_start in range(0, len(known), chunk_size):
+            chunk = known[chunk_start:chunk_start + chunk_size]
+            selected = self.incidence[[row for _, row in chunk]]
+
+            # One sparse product per statistic; both share the same sparsity pattern
+            shared = (selected @ self.incidence.T).tocsr()
+            cooc = (selected @ self.counts.T).tocsr()
+            shared.sort_indices()
+            cooc.sort_indices()
+
+            for i, (target, row) in enumerate(chunk):
+                start, end = shared.indptr[i], shared.indptr[i + 1]
+                cols = shared.indices[start:end]
+                shared_vals = shared.data[start:end]
+                cooc_vals = cooc.data[start:end]
+
+                keep = cols != row
+                cols, shared_vals, cooc_vals = cols[keep], shared_vals[keep], cooc_vals[keep]
+                if len(cols) == 0:
+                    continue
+
+                totals = self.sizes[row] + self.sizes[cols] - shared_vals
+                jaccard = shared_vals / totals
+                scores = cooc_vals * 10 + jaccard * 100
+
+                if len(cols) > k:
+                    # Partial selection, widened by the rounding step so ties survive
+                    cutoff = np.partition(scores, len(scores) - k)[len(scores) - k]
+                    candidates = np.nonzero(scores >= cutoff - 0.01)[0]
+                else:
+                    candidates = np.arange(len(cols))
+
+                ranked = sorted(
+                    candidates,
+                    key=lambda j: (-round(float(scores[j]), 2), self.entities[cols[j]])
+                )[:k]
+
+                results[target] = [
+                    {
+                        "entity": self.entities[cols[j]],
+                        "similarity_score": round(float(scores[j]), 2),
+                        "co_occurrences": int(cooc_vals[j]),
+                        "jaccard_similarity": round(float(jaccard[j]), 3),
+                        "shared_conversations": int(shared_vals[j])
+                    }
+                    for j in ranked
+                ]
+
+        return results
+
+    def cross_domain(self, entity_roots: List[Tuple[str, str]], limit: int = 20) -> List[Dict]:
+        """
+        Entity pairs from different root domains that share conversations,
+        same ordering as SimilarityMatcher.find_cross_domain_similarities
+        """
+        rows = [self.entity_ids.get(entity) for entity, _ in entity_roots]
+        present = [i for i, r in enumerate(rows) if r is not None]
+        if not present:
+            return []
+
+        selected = self.incidence[[rows[i] for i in present]]
+        shared = (selected @ selected.T).tocoo()
+
+        roots = [entity_roots[i][1] for i in present]
+        pairs = [
+            (int(v), i, j)
+            for i, j, v in zip(shared.row, shared.col, shared.data)
+            if roots[i] < roots[j]
+        ]
+        pairs.sort(key=lambda p: (-p[0], p[1], p[2]))
+
+        return [
+            {
+                "entity1": entity_roots[present[i]][0],
+                "domain1": roots[i],
+                "entity2": entity_roots[present[j]][0],
+                "domain2": roots[j],
+                "shared_conversations": v
+            }
+            for v, i, j in pairs[:limit]
+        ]
 
 
 class SimilarityMatcher:
@@ -17,6 +206,84 @@ class SimilarityMatcher:
     def __init__(self, vault_path: Path):
         self.vault_path = Path(vault_path)
         self.logger = get_logger(__name__, str(vault_path))
+        self.index = VaultIndex(self.vault_path)
+        self.index_file = self.vault_path / "_system" / "entity-conversation-index.json"
+        self._cooccurrence = None
+        self._lsh = None
+
+    @property
+    def cooccurrence(self) -> CooccurrenceIndex:
+        """Inverted entity/conversation index, built on first use"""
+        if self._cooccurrence is None:
+            with TimedOperation(self.logger, "Building entity-conversation index"):
+                self._cooccurrence = CooccurrenceIndex.from_conversations(self.index.conversations())
+        return self._cooccurrence
+
+    @property
+    def lsh(self) -> MinHashLSHIndex:
+        """On-disk MinHash LSH index for approximate lookups"""
+        if self._lsh is None:
+            self._lsh = MinHashLSHIndex(self.vault_path)
+        return self._lsh
+
+    def conversation_cursor(self) -> List:
+        """
+        [count, newest mtime, digest] of processed conversations - a stat-only
+        change marker
+
+        The digest covers every (name, mtime_ns) pair, so renames and files
+        swapped for ones with older timestamps (sync clients, cp -p) are seen too.
+        """
+        files = []
+        processed_dir = self.vault_path / "00-Inbox" / "processed"
+        if processed_dir.exists():
+            with os.scandir(processed_dir) as entries:
+                for entry in entries:
+                    if entry.is_file() and entry.name.endswith(".md"):
+                        files.append((entry.name, entry.stat().st_mtime_ns))
+
+        files.sort()
+        digest = hashlib.sha256()
+        for name, mtime_ns in files:
+            digest.update(f"{name}\0{mtime_ns}\n".encode('utf-8'))
+        newest = max((mtime_ns for _, mtime_ns in files), default=0)
+        return [len(files), newest, digest.hexdigest()]
+
+    def update_lsh_index(self, rebuild: bool = False) -> Dict[str, int]:
+        """
+        Fold processed conversation changes into the LSH index
+
+        Skipped (without refreshing the vault index) when the processed
+        folder's names and mtimes match the last update.
+        """
+        cursor = self.conversation_cursor()
+        if not rebuild and self.lsh.get_cursor() == cursor:
+            return {"added": 0, "removed": 0, "edited": 0, "entities_updated": 0, "rebuilt": 0}
+
+        stats = self.lsh.update(self.cooccurrence.conversation_entities, rebuild=rebuild, cursor=cursor)
+        if stats["added"] or stats["removed"] or stats["edited"]:
+            self.logger.info(
+                f"LSH index: {stats['added']} conversation(s) added, {stats['edited']} edited, "
+                f"{stats['removed']} removed, {stats['entities_updated']} entities updated"
+            )
+        return stats
+
+    def find_similar_approximate(self, entity: str, limit: int = 10) -> List[Dict]:
+        """Find near-neighbour entities from MinHash signatures (estimated Jaccard)"""
+        self.logger.info(f"Finding approximate neighbours of: {entity}")
+
+        # A stat of the processed folder; the index is only touched when it changed
+        self.update_lsh_index()
+        return self.lsh.query(entity, limit=limit)
+
+    def save_cooccurrence_index(self, output_file: Path = None) -> Path:
+        """Persist the inverted index to _system/"""
+        if output_file is None:
+            output_file = self.index_file
+
+        self.cooccurrence.save(output_file)
+        self.logger.info(f"Entity-conversation index saved to {output_file}")
+        return output_file
 
     def find_similar_entities(self, entity: str, limit: int = 10) -> List[Dict]:
         """Find entities similar to the given entity"""
@@ -62,8 +329,8 @@ class SimilarityMatcher:
                 "shared_conversations": shared
             })
 
-        # Sort by similarity
-        similarities.sort(key=lambda x: x["similarity_score"], reverse=True)
+        # Sort by similarity (ties broken by name for stable output)
+        similarities.sort(key=lambda x: (-x["similarity_score"], x["entity"]))
 
         return similarities[:limit]
 
@@ -80,75 +347,48 @@ class SimilarityMatcher:
         # Find entities with overlapping parent tags
         similarities = []
 
-        for md_file in self.vault_path.rglob("*.md"):
-            if any(part in md_file.parts for part in ["00-Inbox", "_system", ".obsidian"]):
+        for note in self.index.tag_notes():
+            other_entity = note["tag"]
+            if not other_entity or other_entity == entity:
                 continue
 
-            try:
-                with open(md_file, 'r', encoding='utf-8') as f:
-                    content = f.read(500)
-                    if 'type: tag-note' not in content:
-                        continue
-
-                tag_match = re.search(r'^tag:\s*(.+)$', content, re.MULTILINE)
-                if not tag_match:
-                    continue
+            # Get other entity's parent tags
+            other_parents = note["parent_tags"]
 
-                other_entity = tag_match.group(1).strip()
-                if other_entity == entity:
-                    continue
+            # Calculate overlap
+            shared = len(set(entity_parents) & set(other_parents))
+            total = len(set(entity_parents) | set(other_parents))
 
-                # Get other entity's parent tags
-                other_parents = self._get_parent_tags(other_entity)
+            if shared > 0:
+                similarity = shared / total if total > 0 else 0
 
-                # Calculate overlap
-                shared = len(set(entity_parents) & set(other_parents))
-                total = len(set(entity_parents) | set(other_parents))
-
-                if shared > 0:
-                    similarity = shared / total if total > 0 else 0
-
-                    similarities.append({
-                        "entity": other_entity,
-                        "similarity": round(similarity, 3),
-                        "shared_tags": shared,
-                        "total_tags": total
-                    })
-
-            except:
-                pass
+                similarities.append({
+                    "entity": other_entity,
+                    "similarity": round(similarity, 3),
+                    "shared_tags": shared,
+                    "total_tags": total
+                })
 
         similarities.sort(key=lambda x: x["similarity"], reverse=True)
 
         return similarities[:limit]
 
-    def find_cross_domain_similarities(self, limit: int = 20) -> List[Dict]:
+    def find_cross_domain_similarities(self, limit: int = 20, use_sparse: bool = False) -> List[Dict]:
         """Find surprising cross-domain similarities"""
         self.logger.info("Finding cross-domain similarities")
 
         # Get all entities by domain
         by_domain = defaultdict(list)
 
-        for md_file in self.vault_path.rglob("*.md"):
-            if any(part in md_file.parts for part in ["00-Inbox", "_system", ".obsidian"]):
-                continue
+        for note in self.index.tag_notes():
+            if note["tag"] and note["root"]:
+                by_domain[note["root"]].append(note["tag"])
 
-            try:
-                with open(md_file, 'r', encoding='utf-8') as f:
-                    content = f.read(500)
-                    if 'type: tag-note' not in content:
-                        continue
-
-                tag_match = re.search(r'^tag:\s*(.+)$', content, re.MULTILINE)
-                root_match = re.search(r'root:\s*(\w+)', content)
-
-                if tag_match and root_match:
-                    entity = tag_match.group(1).strip()
-                    root = root_match.group(1)
-                    by_domain[root].append(entity)
-
-            except:
-                pass
+        if use_sparse:
+            entity_roots = [
+                (entity, domain) for domain, entities in by_domain.items() for entity in entities
+            ]
+            return SparseCooccurrenceEngine(self.cooccurrence).cross_domain(entity_roots, limit=limit)
 
         # Find co-occurrences across domains
         cross_domain = []
@@ -156,15 +396,15 @@ class SimilarityMatcher:
         for domain1, entities1 in by_domain.items():
             for entity1 in entities1:
                 entity1_convs = self._get_entity_conversations(entity1)
+                if not entity1_convs:
+                    continue
 
                 for domain2, entities2 in by_domain.items():
                     if domain1 >= domain2:  # Avoid duplicates
                         continue
 
                     for entity2 in entities2:
-                        entity2_convs = self._get_entity_conversations(entity2)
-
-                        shared = len(entity1_convs & entity2_convs)
+                        shared = len(entity1_convs & self._get_entity_conversations(entity2))
                         if shared > 0:
                             cross_domain.append({
                                 "entity1": entity1,
@@ -179,21 +419,71 @@ class SimilarityMatcher:
 
         return cross_domain[:limit]
 
-    def build_similarity_matrix(self) -> Dict:
-        """Build full similarity matrix for all entities"""
+    def build_similarity_matrix(self, top_k: int = 5, use_sparse: bool = False) -> Dict:
+        """
+        Build full similarity matrix for all entities
+
+        Args:
+            top_k: Similar entities kept per entity
+            use_sparse: Score all pairs with one sparse matrix product (numpy + scipy)
+        """
         with TimedOperation(self.logger, "Building similarity matrix"):
             entities = self._get_all_entities()
 
-            matrix = {}
+            if use_sparse:
+                matrix = SparseCooccurrenceEngine(self.cooccurrence).top_k(entities, k=top_k)
+            else:
+                matrix = {}
 
-            for entity in entities:
-                similar = self.find_similar_entities(entity, limit=5)
-                matrix[entity] = similar
+                for entity in entities:
+                    similar = self.find_similar_entities(entity, limit=top_k)
+                    matrix[entity] = similar
 
             self.logger.info(f"Built similarity matrix for {len(entities)} entities")
 
             return matrix
 
+    def save_matrix_binary(self, matrix: Dict, output_file: Path = None) -> Path:
+        """
+        Save a similarity matrix as compressed NumPy arrays (.npz)
+
+        Rows are stored CSR-style: neighbors[indptr[i]:indptr[i+1]] are the
+        similar entities of entities[i], with per-neighbor score columns.
+        """
+        if np is None:
+            raise ImportError("Binary matrix output requires numpy (pip install numpy)")
+
+        if output_file is None:
+            output_file = self.vault_path / "_system" / "similarity-matrix.npz"
+
+        names = list(matrix)
+        ids = {name: i for i, name in enumerate(names)}
+        for similar in matrix.values():
+            for sim in similar:
+                if sim["entity"] not in ids:
+                    ids[sim["entity"]] = len(names)
+                    names.append(sim["entity"])
+
+        rows = list(matrix.values())
+        indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum([len(similar) for similar in rows])
+        flat = [sim for similar in rows for sim in similar]
+
+        np.savez_compressed(
+            output_file,
+            entities=np.array(names, dtype=str),
+            row_count=np.int64(len(rows)),
+            indptr=indptr,
+            neighbors=np.array([ids[sim["entity"]] for sim in flat], dtype=np.int32),
+            similarity_score=np.array([sim["similarity_score"] for sim in flat], dtype=np.float32),
+            co_occurrences=np.array([sim["co_occurrences"] for sim in flat], dtype=np.int32),
+            jaccard_similarity=np.array([sim["jaccard_similarity"] for sim in flat], dtype=np.float32),
+            shared_conversations=np.array([sim["shared_conversations"] for sim in flat], dtype=np.int32)
+        )
+
+        self.logger.info(f"Binary similarity matrix saved to {output_file}")
+        return output_file
+
     def suggest_connections(self, entity: str, threshold: float = 0.3) -> List[str]:
         """Suggest entities that should be connected to this one"""
         similar = self.find_similar_entities(entity, limit=20)
@@ -208,100 +498,24 @@ class SimilarityMatcher:
 
     def _get_entity_conversations(self, entity: str) -> Set[str]:
         """Get set of conversation files mentioning entity"""
-        conversations = set()
-
-        processed_dir = self.vault_path / "00-Inbox" / "processed"
-        if not processed_dir.exists():
-            return conversations
-
-        for conv_file in processed_dir.glob("*.md"):
-            try:
-                with open(conv_file, 'r', encoding='utf-8') as f:
-                    content = f.read(1000)
-
-                entities_match = re.search(r'entities:\s*\[(.*?)\]', content, re.DOTALL)
-                if entities_match:
-                    entities = [e.strip().strip('"').strip("'") for e in entities_match.group(1).split(',')]
-                    if entity in entities:
-                        conversations.add(conv_file.name)
-
-            except:
-                pass
-
-        return conversations
+        return self.cooccurrence.conversations_for(entity)
 
     def _get_conversation_entities(self, conv_file_name: str) -> List[str]:
         """Get all entities in a conversation"""
-        conv_file = self.vault_path / "00-Inbox" / "processed" / conv_file_name
-
-        if not conv_file.exists():
-            return []
-
-        try:
-            with open(conv_file, 'r', encoding='utf-8') as f:
-                content = f.read(1000)
-
-            entities_match = re.search(r'entities:\s*\[(.*?)\]', content, re.DOTALL)
-            if entities_match:
-                return [e.strip().strip('"').strip("'") for e in entities_match.group(1).split(',') if e.strip()]
-
-        except:
-            pass
-
-        return []
+        return self.cooccurrence.entities_for(conv_file_name)
 
     def _get_parent_tags(self, entity: str) -> List[str]:
         """Get parent tags for entity"""
-        for md_file in self.vault_path.rglob("*.md"):
-            if any(part in md_file.parts for part in ["00-Inbox", "_system", ".obsidian"]):
-                continue
-
-            try:
-                with open(md_file, 'r', encoding='utf-8') as f:
-                    content = f.read(500)
-                    if 'type: tag-note' not in content:
-                        continue
-
-                tag_match = re.search(r'^tag:\s*(.+)$', content, re.MULTILINE)
-                if not tag_match or tag_match.group(1).strip() != entity:
-                    continue
-
-                parent_match = re.search(r'parent_tags:\s*\[(.*?)\]', content)
-                if parent_match:
-                    return [p.strip() for p in parent_match.group(1).split(',') if p.strip()]
-
-            except:
-                pass
-
-        return []
+        note = self.index.get_tag_note(entity)
+        return note["parent_tags"] if note else []
 
     def _get_all_entities(self) -> List[str]:
         """Get list of all entities"""
-        entities = []
-
-        for md_file in self.vault_path.rglob("*.md"):
-            if any(part in md_file.parts for part in ["00-Inbox", "_system", ".obsidian"]):
-                continue
-
-            try:
-                with open(md_file, 'r', encoding='utf-8') as f:
-                    content = f.read(500)
-                    if 'type: tag-note' not in content:
-                        continue
-
-                tag_match = re.search(r'^tag:\s*(.+)$', content, re.MULTILINE)
-                if tag_match:
-                    entities.append(tag_match.group(1).strip())
-
-            except:
-                pass
-
-        return entities
+        return [note["tag"] for note in self.index.tag_notes() if note["tag"]]
 
 
 def main():
     import argparse
-    import json
 
     parser = argparse.ArgumentParser(description="Entity similarity matcher")
     parser.add_argument("--vault", type=str, default="C:/obsidian-memory-vault",
@@ -314,11 +528,28 @@ def main():
                        help="Find cross-domain similarities")
     parser.add_argument("--matrix", action="store_true",
                        help="Build full similarity matrix")
+    parser.add_argument("--save-index", action="store_true",
+                       help="Save entity-conversation index to _system/")
+    parser.add_argument("--sparse", action="store_true",
+                       help="Use vectorized sparse-matrix engine (requires numpy + scipy)")
+    parser.add_argument("--top-k", type=int, default=5,
+                       help="Similar entities kept per entity in --matrix")
+    parser.add_argument("--approximate", action="store_true",
+                       help="Use MinHash LSH index for --entity lookups")
+    parser.add_argument("--lsh-rebuild", action="store_true",
+                       help="Rebuild the MinHash LSH index from scratch")
+    parser.add_argument("--binary", action="store_true",
+                       help="Write --matrix as compact similarity-matrix.npz instead of JSON")
 
     args = parser.parse_args()
 
     matcher = SimilarityMatcher(Path(args.vault))
 
+    if (args.sparse or args.binary) and np is None:
+        print(f"\n[X] --sparse and --binary require numpy and scipy")
+        print(f"   Install with: pip install numpy scipy\n")
+        return
+
     if args.entity:
         if args.by_tags:
             similar = matcher.find_similar_by_tags(args.entity, limit=10)
@@ -328,6 +559,16 @@ def main():
                 print(f"      Similarity: {sim['similarity']}")
                 print(f"      Shared tags: {sim['shared_tags']}/{sim['total_tags']}")
 
+        elif args.approximate:
+            if args.lsh_rebuild:
+                matcher.update_lsh_index(rebuild=True)
+
+            similar = matcher.find_similar_approximate(args.entity, limit=10)
+            print(f"\n[OK] Approximate Similar Entities: {args.entity}")
+            for sim in similar:
+                print(f"\n   {sim['entity']}")
+                print(f"      Estimated Jaccard: {sim['estimated_jaccard']}")
+
         else:
             similar = matcher.find_similar_entities(args.entity, limit=10)
             print(f"\n[OK] Similar Entities: {args.entity}")
@@ -338,26 +579,43 @@ def main():
                 print(f"      Jaccard: {sim['jaccard_similarity']}")
 
     elif args.cross_domain:
-        cross = matcher.find_cross_domain_similarities(limit=20)
+        cross = matcher.find_cross_domain_similarities(limit=20, use_sparse=args.sparse)
         print(f"\n[OK] Cross-Domain Similarities")
         for c in cross:
             print(f"\n   {c['entity1']} ({c['domain1']}) <-> {c['entity2']} ({c['domain2']})")
             print(f"      Shared conversations: {c['shared_conversations']}")
 
     elif args.matrix:
-        matrix = matcher.build_similarity_matrix()
-        output_file = Path(args.vault) / "_system" / "similarity-matrix.json"
+        matrix = matcher.build_similarity_matrix(top_k=args.top_k, use_sparse=args.sparse)
+
+        if args.binary:
+            output_file = matcher.save_matrix_binary(matrix)
+        else:
+            output_file = Path(args.vault) / "_system" / "similarity-matrix.json"
 
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(matrix, f, indent=2)
+            with open(output_file, 'w', encoding='utf-8') as f:
+                json.dump(matrix, f, indent=2)
 
         print(f"\n[OK] Similarity Matrix Built")
         print(f"   Entities: {len(matrix)}")
         print(f"   Output: {output_file}")
 
-    else:
+    elif args.lsh_rebuild:
+        stats = matcher.update_lsh_index(rebuild=True)
+        print(f"\n[OK] LSH Index Rebuilt")
+        print(f"   Conversations: {stats['added']}")
+        print(f"   Entities: {stats['entities_updated']}")
+
+    elif not args.save_index:
         print(f"\n[INFO] Similarity Matcher")
-        print(f"   Use --entity, --cross-domain, or --matrix")
+        print(f"   Use --entity, --cross-domain, --matrix, or --save-index")
+
+    if args.save_index:
+        index_file = matcher.save_cooccurrence_index()
+        print(f"\n[OK] Entity-Conversation Index Saved")
+        print(f"   Entities: {len(matcher.cooccurrence.entity_conversations)}")
+        print(f"   Conversations: {len(matcher.cooccurrence.conversation_entities)}")
+        print(f"   Output: {index_file}")
 
     print()
 
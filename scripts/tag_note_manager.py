@@ -19,8 +19,12 @@ import calendar
 # Fix import to work from vault root
 try:
     from scripts.tag_path_resolver import TagPathResolver
+    from scripts.tag_note_model import TagNote
+    from scripts.atomic_write import write_text
 except ImportError:
     from tag_path_resolver import TagPathResolver
+    from tag_note_model import TagNote
+    from atomic_write import write_text
 
 
 class TagNoteManager:
@@ -137,28 +141,61 @@ class TagNoteManager:
         Returns:
             (Path to tag note file, True if created new / False if updated existing)
         """
+        return self.add_entries(tag_name, [{
+            'discussion_text': discussion_text,
+            'timestamp': timestamp,
+            'conversation_link': conversation_link,
+            'related_tags': related_tags,
+            'conversation_duration_minutes': conversation_duration_minutes
+        }])
+
+    def add_entries(self, tag_name: str, entries: List[Dict]) -> Tuple[Path, bool]:
+        """
+        Add many conversation entries to one tag note in a single read and write
+
+        Entries are inserted oldest first into their month sections, counters
+        are updated once for the whole batch and the note is replaced
+        atomically.
+
+        Args:
+            tag_name: Tag name (e.g., "Python")
+            entries: Dicts with the create_or_update_tag_note arguments
+                (discussion_text, timestamp, conversation_link, related_tags,
+                conversation_duration_minutes)
+
+        Returns:
+            (Path to tag note file, True if created new / False if updated existing)
+        """
+        if not entries:
+            raise ValueError("add_entries needs at least one entry")
+
         tag_path = self.get_or_create_tag_path(tag_name)
+        entries = sorted(entries, key=lambda e: e['timestamp'].isoformat())
 
-        created_new = False
-
-        # Check if tag note exists
-        if not tag_path.exists():
-            # Create new tag note from template
-            self._create_new_tag_note(tag_path, tag_name, timestamp)
-            created_new = True
-
-        # Add monthly entry
-        self._add_monthly_entry(
-            tag_path,
-            discussion_text,
-            timestamp,
-            conversation_link,
-            related_tags
+        created_new = not tag_path.exists()
+        if created_new:
+            content = self._render_new_tag_note(tag_path, tag_name, entries[0]['timestamp'])
+        else:
+            content = tag_path.read_text(encoding='utf-8')
+
+        note = TagNote(content)
+        for entry in entries:
+            note.add_month_entry(entry['timestamp'], self._format_entry(
+                entry['discussion_text'],
+                entry['timestamp'],
+                entry['conversation_link'],
+                entry.get('related_tags', [])
+            ))
+
+        # Frontmatter lives in the head, so only that part is re-parsed
+        note.head = self._apply_metadata(
+            note.head,
+            entries[-1]['timestamp'],
+            sum(e.get('conversation_duration_minutes', 0) for e in entries),
+            conversations=len(entries)
         )
 
-        # Update metadata
-        self._update_metadata(tag_path, timestamp, conversation_duration_minutes)
-
+        write_text(tag_path, note.render())
         return tag_path, created_new
 
     def _create_new_tag_note(self, tag_path: Path, tag_name: str, timestamp: datetime):
@@ -170,6 +207,10 @@ class TagNoteManager:
             tag_name: Display name of tag
             timestamp: Creation timestamp
         """
+        write_text(tag_path, self._render_new_tag_note(tag_path, tag_name, timestamp))
+
+    def _render_new_tag_note(self, tag_path: Path, tag_name: str, timestamp: datetime) -> str:
+        """Content of a new, empty tag note"""
         # Normalize tag name for lookup
         normalized = tag_name.lower().replace(' ', '-').replace('_', '-')
 
@@ -239,7 +280,7 @@ class TagNoteManager:
 
 """
 
-        tag_path.write_text(content, encoding='utf-8')
+        return content
 
     def _add_monthly_entry(
         self,
@@ -260,11 +301,32 @@ class TagNoteManager:
             related_tags: Other tags from conversation
         """
         content = tag_path.read_text(encoding='utf-8')
+        content = self._insert_monthly_entry(content, discussion_text, timestamp,
+                                             conversation_link, related_tags)
+        write_text(tag_path, content)
 
-        # Month section header
-        month_header = f"## {timestamp.strftime('%B %Y')}"
-
-        # Entry format
+    def _insert_monthly_entry(
+        self,
+        content: str,
+        discussion_text: str,
+        timestamp: datetime,
+        conversation_link: str,
+        related_tags: List[str]
+    ) -> str:
+        """Tag note content with one entry added to its month section"""
+        note = TagNote(content)
+        note.add_month_entry(timestamp, self._format_entry(discussion_text, timestamp,
+                                                           conversation_link, related_tags))
+        return note.render()
+
+    @staticmethod
+    def _format_entry(
+        discussion_text: str,
+        timestamp: datetime,
+        conversation_link: str,
+        related_tags: List[str]
+    ) -> str:
+        """Timestamped monthly entry text"""
         entry_time = timestamp.strftime('%Y-%m-%d %H:%M')
         entry = f"\n### {entry_time}\n{discussion_text}\n"
 
@@ -276,46 +338,7 @@ class TagNoteManager:
         # Add source conversation link
         entry += f"**Source**: {conversation_link}\n"
 
-        # Check if month section exists
-        if month_header in content:
-            # Append to existing month section
-            # Insert after month header but before next ## header
-            lines = content.split('\n')
-            new_lines = []
-            in_current_month = False
-            inserted = False
-
-            for i, line in enumerate(lines):
-                new_lines.append(line)
-
-                # Found current month header
-                if line.strip() == month_header:
-                    in_current_month = True
-
-                # Found next section header while in current month
-                elif in_current_month and line.startswith('## ') and line.strip() != month_header:
-                    # Insert entry before this next section
-                    new_lines.insert(-1, entry)
-                    inserted = True
-                    in_current_month = False
-
-            # If we reached end without finding next section, append
-            if in_current_month and not inserted:
-                new_lines.append(entry)
-
-            content = '\n'.join(new_lines)
-        else:
-            # Create new month section
-            # Insert after frontmatter and title, before first existing month section
-            parts = content.split('## ')
-            if len(parts) > 1:
-                # Has existing sections
-                content = parts[0] + month_header + '\n' + entry + '\n\n## ' + '## '.join(parts[1:])
-            else:
-                # No sections yet, append
-                content += f'\n{month_header}\n{entry}\n'
-
-        tag_path.write_text(content, encoding='utf-8')
+        return entry
 
     def _update_metadata(self, tag_path: Path, timestamp: datetime, duration_minutes: int = 0):
         """
@@ -327,18 +350,22 @@ class TagNoteManager:
             duration_minutes: Duration of this conversation in minutes
         """
         content = tag_path.read_text(encoding='utf-8')
+        write_text(tag_path, self._apply_metadata(content, timestamp, duration_minutes))
 
+    def _apply_metadata(self, content: str, timestamp: datetime, duration_minutes: float = 0,
+                        conversations: int = 1) -> str:
+        """Tag note content with counters advanced by `conversations` and `duration_minutes`"""
         # Extract frontmatter
         match = re.match(r'^---\n(.*?)\n---', content, re.DOTALL)
         if not match:
-            return
+            return content
 
         frontmatter_text = match.group(1)
         frontmatter = yaml.safe_load(frontmatter_text)
 
         # Update fields
         frontmatter['last_updated'] = timestamp.strftime('%Y-%m-%d')
-        frontmatter['total_conversations'] = frontmatter.get('total_conversations', 0) + 1
+        frontmatter['total_conversations'] = frontmatter.get('total_conversations', 0) + conversations
         frontmatter['total_time_minutes'] = frontmatter.get('total_time_minutes', 0) + duration_minutes
 
         # Replace frontmatter
@@ -348,7 +375,7 @@ class TagNoteManager:
             f'---\n{new_frontmatter}\n---'
         )
 
-        tag_path.write_text(new_content, encoding='utf-8')
+        return new_content
 
     def should_compress_previous_month(self, current_date: datetime) -> Optional[Tuple[int, int]]:
         """
@@ -0,0 +1,179 @@
+"""
+Tag Note Model - Section-indexed representation of a living tag note
+
+A tag note is split once into its head (frontmatter, title and anything before
+the first "## " header) and its "## " sections (Hierarchy, Current
+Understanding, one per month, ...). Sections are kept as lists of text parts
+with an index by title and by (year, month), so adding an entry to a month
+appends to that section without rescanning or rebuilding the rest of the note.
+The note is joined back into text only when it is rendered.
+"""
+
+import calendar
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+SECTION_HEADER_RE = re.compile(r'^## .*$', re.MULTILINE)
+MONTH_TITLE_RE = re.compile(r'^## ({}) (\d{{4}})$'.format('|'.join(calendar.month_name[1:])))
+MONTH_NUMBERS = {name: number for number, name in enumerate(calendar.month_name) if name}
+
+
+class TagNoteSection:
+    """One "## " section: its header line plus everything up to the next header"""
+
+    __slots__ = ("title", "parts")
+
+    def __init__(self, title: str, text: str):
+        self.title = title
+        self.parts = [text]
+
+    @property
+    def text(self) -> str:
+        if len(self.parts) > 1:
+            self.parts = [''.join(self.parts)]
+        return self.parts[0]
+
+    @property
+    def body(self) -> str:
+        """Section text after the header line"""
+        text = self.text
+        newline = text.find('\n')
+        return '' if newline < 0 else text[newline + 1:]
+
+
+class TagNote:
+    """Parsed tag note with O(1) lookup of its sections"""
+
+    def __init__(self, content: str):
+        headers = [m.start() for m in SECTION_HEADER_RE.finditer(content)]
+        bounds = headers + [len(content)]
+
+        self.head = content[:headers[0]] if headers else content
+        self.sections = []
+        for start, end in zip(bounds, bounds[1:]):
+            text = content[start:end]
+            title = text.split('\n', 1)[0].strip()
+            self.sections.append(TagNoteSection(title, text))
+
+        self._reindex()
+
+    @classmethod
+    def load(cls, path: Path) -> "TagNote":
+        return cls(Path(path).read_text(encoding='utf-8'))
+
+    def _reindex(self):
+        self._titles = {}
+        self._months = {}
+        for i, section in enumerate(self.sections):
+            self._titles.setdefault(section.title, i)
+            match = MONTH_TITLE_RE.match(section.title)
+            if match:
+                self._months.setdefault((int(match.group(2)), MONTH_NUMBERS[match.group(1)]), i)
+
+    # ---- Lookup ------------------------------------------------------------
+
+    def section(self, title: str) -> Optional[TagNoteSection]:
+        """Section by its header line, e.g. "## Current Understanding" """
+        i = self._titles.get(title)
+        return None if i is None else self.sections[i]
+
+    def month_section(self, year: int, month: int) -> Optional[TagNoteSection]:
+        i = self._months.get((year, month))
+        return None if i is None else self.sections[i]
+
+    def months(self) -> List[Tuple[int, int]]:
+        """(year, month) of every month section, in note order"""
+        return sorted(self._months, key=self._months.get)
+
+    # ---- Mutation ----------------------------------------------------------
+
+    def replace_section(self, title: str, text: str):
+        """Replace a whole section (header line included)"""
+        i = self._titles[title]
+        self.sections[i] = TagNoteSection(text.split('\n', 1)[0].strip(), text)
+        self._reindex()
+
+    def add_month_entry(self, timestamp: datetime, entry: str):
+        """
+        Append an entry to the month section of `timestamp`
+
+        A missing month section is created in date order (newest month
+        first), before the first older month or after the last newer one.
+        """
+        key = (timestamp.year, timestamp.month)
+        i = self._months.get(key)
+
+        if i is not None:
+            parts = self.sections[i].parts
+            if i < len(self.sections) - 1:
+                parts.append(entry + '\n')
+            else:
+                parts.append('\n' + entry)
+            return
+
+        header = f"## {timestamp.strftime('%B %Y')}"
+        positions = sorted(self._months.items(), key=lambda item: item[1])
+        older = [idx for month, idx in positions if month < key]
+
+        if older:
+            position = older[0]
+        elif positions:
+            position = positions[-1][1] + 1
+        else:
+            position = len(self.sections)
+
+        if position < len(self.sections):
+            section = TagNoteSection(header, f"{header}\n{entry}\n\n")
+        else:
+            # Appending at the very end of the note
+            if self.sections:
+                self.sections[-1].parts.append('\n')
+            else:
+                self.head += '\n'
+            section = TagNoteSection(header, f"{header}\n{entry}\n")
+
+        self.sections.insert(position, section)
+        self._reindex()
+
+    def render(self) -> str:
+        return self.head + ''.join(section.text for section in self.sections)
+
+
+def parse_month_entries(body: str) -> List[Dict]:
+    """
+    Entries of a month section body
+
+    Returns:
+        List of entry dicts with date, discussion, related_tags, source
+    """
+    entries = []
+
+    # Individual entries (### YYYY-MM-DD HH:MM format)
+    entry_pattern = r'### (\d{4}-\d{2}-\d{2}(?: \d{2}:\d{2})?)\s*\n(.*?)(?=\n###|\Z)'
+
+    for match in re.finditer(entry_pattern, body, re.DOTALL):
+        date_str = match.group(1)
+        discussion_lines = []
+        related_tags = []
+        source = None
+
+        for line in match.group(2).strip().split('\n'):
+            if line.startswith('**Related'):
+                related_tags = re.findall(r'\[\[([^\]]+)\]\]', line)
+            elif line.startswith('**Source'):
+                source_match = re.search(r'\[\[([^\]]+)\]\]', line)
+                if source_match:
+                    source = source_match.group(1)
+            elif line.strip():
+                discussion_lines.append(line.strip())
+
+        entries.append({
+            'date': date_str,
+            'discussion': ' '.join(discussion_lines),
+            'related_tags': related_tags,
+            'source': source
+        })
+
+    return entries
@@ -2,13 +2,22 @@
 """
 Tag Path Resolver
 Resolves taxonomy paths and determines optimal file locations for tag notes
+
+Reverse lookups (children, alias, root, depth, path substring) are served from
+indexes built once when the taxonomy is loaded, so they cost O(result) instead
+of a scan of the whole taxonomy per call. Call build_indexes() after mutating
+resolver.taxonomy.
 """
 
-import yaml
-import re
+from collections import defaultdict
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+try:
+    from scripts.taxonomy_cache import load_taxonomy
+except ImportError:
+    from taxonomy_cache import load_taxonomy
+
 try:
     from scripts.logger_setup import get_logger
 except ImportError:
@@ -33,6 +42,7 @@ class TagPathResolver:
 
         self.taxonomy_path = Path(taxonomy_path)
         self.taxonomy = self._load_taxonomy()
+        self.build_indexes()
 
     def _load_taxonomy(self) -> Dict:
         """Load taxonomy from tag-taxonomy.md"""
@@ -42,23 +52,49 @@ class TagPathResolver:
             self.logger.error(f"Taxonomy file not found: {self.taxonomy_path}")
             return {}
 
-        with open(self.taxonomy_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        taxonomy = {}
-        yaml_blocks = re.findall(r'```yaml\n(.*?)\n```', content, re.DOTALL)
-
-        for block in yaml_blocks:
-            try:
-                data = yaml.safe_load(block)
-                if isinstance(data, dict):
-                    taxonomy.update(data)
-            except yaml.YAMLError as e:
-                self.logger.warning(f"Failed to parse YAML block: {e}")
+        # Compiled snapshot; re-parsed only when the markdown changed
+        taxonomy = load_taxonomy(self.taxonomy_path, logger=self.logger)
 
         self.logger.info(f"Loaded {len(taxonomy)} tags from taxonomy")
         return taxonomy
 
+    def build_indexes(self):
+        """Build the reverse indexes over self.taxonomy (taxonomy order is preserved)"""
+        self._children = defaultdict(list)
+        self._by_alias = {}
+        self._by_root = defaultdict(list)
+        self._by_depth = defaultdict(list)
+        self._by_parent_path = defaultdict(list)
+        self._paths = []
+        self._trigrams = defaultdict(set)
+
+        for tag, tax_entry in self.taxonomy.items():
+            parent_tags = tax_entry.get("parent_tags") or []
+            if isinstance(parent_tags, str):
+                parent_tags = [parent_tags]
+            for parent in dict.fromkeys(parent_tags):
+                self._children[parent].append(tag)
+
+            for alias in tax_entry.get("aliases") or []:
+                self._by_alias.setdefault(alias, tag)
+
+            self._by_root[tax_entry.get("root", "")].append(tag)
+            self._by_depth[tax_entry.get("depth", 0)].append(tag)
+
+            path = tax_entry.get("path", "") or ""
+            parts = [p.strip() for p in path.split(">")]
+            if len(parts) > 1:
+                self._by_parent_path[" > ".join(parts[:-1])].append(tag)
+
+            position = len(self._paths)
+            self._paths.append((tag, path, path.lower(), tax_entry.get("root", "Unknown")))
+            for trigram in self._trigrams_of(path.lower()):
+                self._trigrams[trigram].add(position)
+
+    @staticmethod
+    def _trigrams_of(text: str) -> set:
+        return {text[i:i + 3] for i in range(len(text) - 2)}
+
     def resolve_path(self, tag: str) -> Optional[str]:
         """Resolve full taxonomy path for a tag"""
         if tag not in self.taxonomy:
@@ -109,14 +145,7 @@ class TagPathResolver:
 
     def resolve_children_tags(self, tag: str) -> List[str]:
         """Find all children of a tag"""
-        children = []
-
-        for other_tag, tax_entry in self.taxonomy.items():
-            parent_tags = tax_entry.get("parent_tags", [])
-            if tag in parent_tags:
-                children.append(other_tag)
-
-        return children
+        return list(self._children.get(tag, []))
 
     def resolve_root(self, tag: str) -> Optional[str]:
         """Resolve root area for a tag"""
@@ -134,47 +163,44 @@ class TagPathResolver:
 
     def find_tag_by_alias(self, alias: str) -> Optional[str]:
         """Find canonical tag name by alias"""
-        for tag, tax_entry in self.taxonomy.items():
-            aliases = tax_entry.get("aliases", [])
-            if alias in aliases:
-                return tag
-
-        return None
+        return self._by_alias.get(alias)
 
     def suggest_tags_by_path(self, partial_path: str) -> List[str]:
         """Suggest tags matching a partial path"""
+        query = partial_path.lower()
+
+        # Only paths containing every trigram of the query can contain the query
+        query_trigrams = self._trigrams_of(query)
+        if query_trigrams:
+            postings = sorted((self._trigrams.get(t, set()) for t in query_trigrams), key=len)
+            candidates = sorted(set.intersection(*postings))
+        else:
+            candidates = range(len(self._paths))
+
         suggestions = []
 
-        for tag, tax_entry in self.taxonomy.items():
-            path = tax_entry.get("path", "")
-            if partial_path.lower() in path.lower():
+        for position in candidates:
+            tag, path, lowered, root = self._paths[position]
+            if query in lowered:
                 suggestions.append({
                     "tag": tag,
                     "path": path,
-                    "root": tax_entry.get("root", "Unknown")
+                    "root": root
                 })
 
         return suggestions
 
     def get_tags_by_root(self, root: str) -> List[str]:
         """Get all tags in a specific root area"""
-        tags = []
-
-        for tag, tax_entry in self.taxonomy.items():
-            if tax_entry.get("root", "") == root:
-                tags.append(tag)
-
-        return tags
+        return list(self._by_root.get(root, []))
 
     def get_tags_by_depth(self, depth: int) -> List[str]:
         """Get all tags at a specific depth"""
-        tags = []
-
-        for tag, tax_entry in self.taxonomy.items():
-            if tax_entry.get("depth", 0) == depth:
-                tags.append(tag)
+        return list(self._by_depth.get(depth, []))
 
-        return tags
+    def get_tags_by_parent_path(self, parent_path: str) -> List[str]:
+        """Get all tags whose path is parent_path plus one level"""
+        return list(self._by_parent_path.get(parent_path, []))
 
     def validate_tag_hierarchy(self) -> List[Dict]:
         """Validate taxonomy hierarchy for issues"""
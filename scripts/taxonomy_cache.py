@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Taxonomy Cache
+Compiled snapshot of tag-taxonomy.md so scripts don't re-parse it on startup.
+
+Parsing the taxonomy means regex-extracting every ```yaml block and running
+yaml.safe_load on each. The merged result is saved as JSON next to the markdown
+(_system/tag-taxonomy.cache.json) together with the markdown's mtime, size and
+SHA-256:
+
+  - mtime and size unchanged -> the snapshot is used without reading the markdown
+  - mtime changed, same hash -> the snapshot is used and re-keyed (e.g. a sync
+    client touched the file)
+  - content changed          -> the markdown is parsed again and the snapshot
+    rewritten
+
+The snapshot is plain JSON rather than pickle: _system/ is synced and tracked,
+and loading it must never be able to run code. Within one process the JSON
+bytes are also kept in memory, so building several resolvers costs one
+json.loads each. Every load returns a fresh copy, and both the cached and the
+freshly compiled taxonomy go through the same JSON round trip (YAML dates come
+back as ISO strings either way).
+"""
+
+import hashlib
+import json
+import logging
+import re
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import yaml
+
+try:
+    from scripts.atomic_write import write_bytes
+except ImportError:
+    from atomic_write import write_bytes
+
+CACHE_VERSION = 2
+YAML_BLOCK_RE = re.compile(r'```yaml\n(.*?)\n```', re.DOTALL)
+
+# taxonomy path -> (mtime_ns, size, JSON snapshot bytes)
+_memory = {}
+
+
+def cache_path_for(taxonomy_path: Path) -> Path:
+    taxonomy_path = Path(taxonomy_path)
+    return taxonomy_path.with_name(f"{taxonomy_path.stem}.cache.json")
+
+
+def parse_taxonomy(content: str) -> Tuple[Dict, List[str]]:
+    """
+    Merge every ```yaml block of the taxonomy markdown
+
+    Returns:
+        (taxonomy, warnings) - one warning per block that failed to parse
+    """
+    taxonomy = {}
+    warnings = []
+
+    for block in YAML_BLOCK_RE.findall(content):
+        try:
+            data = yaml.safe_load(block)
+            if isinstance(data, dict):
+                taxonomy.update(data)
+        except yaml.YAMLError as e:
+            warnings.append(f"Failed to parse YAML block: {e}")
+
+    return taxonomy, warnings
+
+
+def _read_snapshot(cache_file: Path):
+    try:
+        with open(cache_file, 'rb') as f:
+            blob = f.read()
+        snapshot = json.loads(blob)
+    except (OSError, ValueError):
+        return None, None
+
+    if not isinstance(snapshot, dict) or snapshot.get("version") != CACHE_VERSION:
+        return None, None
+    return snapshot, blob
+
+
+def _write_snapshot(cache_file: Path, snapshot: Dict, logger) -> bytes:
+    blob = json.dumps(snapshot, ensure_ascii=False, default=str).encode('utf-8')
+    try:
+        write_bytes(cache_file, blob)
+    except OSError as e:
+        # A read-only vault still works, just without the cache
+        logger.warning(f"Could not write taxonomy cache {cache_file}: {e}")
+    return blob
+
+
+def load_taxonomy(taxonomy_path: Path, cache_path: Path = None, logger=None) -> Dict:
+    """
+    Load the taxonomy, from the compiled snapshot when it is current
+
+    Args:
+        taxonomy_path: tag-taxonomy.md
+        cache_path: Snapshot file (default: next to the markdown)
+        logger: Logger for parse warnings (default: this module's)
+
+    Returns:
+        Tag name -> taxonomy entry (raises OSError if the markdown is missing)
+    """
+    logger = logger or logging.getLogger(__name__)
+    taxonomy_path = Path(taxonomy_path)
+    cache_file = Path(cache_path) if cache_path else cache_path_for(taxonomy_path)
+
+    st = taxonomy_path.stat()
+    key = str(taxonomy_path.resolve())
+
+    remembered = _memory.get(key)
+    if remembered and remembered[:2] == (st.st_mtime_ns, st.st_size):
+        return json.loads(remembered[2])["taxonomy"]
+
+    snapshot, blob = _read_snapshot(cache_file)
+    if snapshot and (snapshot.get("mtime_ns"), snapshot.get("size")) == (st.st_mtime_ns, st.st_size):
+        _memory[key] = (st.st_mtime_ns, st.st_size, blob)
+        for warning in snapshot["warnings"]:
+            logger.warning(warning)
+        return snapshot["taxonomy"]
+
+    with open(taxonomy_path, 'rb') as f:
+        raw = f.read()
+    digest = hashlib.sha256(raw).hexdigest()
+
+    if snapshot and snapshot.get("sha256") == digest:
+        # Touched but unchanged: keep the compiled taxonomy, refresh the key
+        logger.debug(f"Taxonomy unchanged since last compile, re-keying {cache_file}")
+    else:
+        # Same newline handling as reading the markdown in text mode
+        content = raw.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+        taxonomy, warnings = parse_taxonomy(content)
+        snapshot = {"taxonomy": taxonomy, "warnings": warnings, "sha256": digest}
+        logger.info(f"Compiled taxonomy snapshot: {len(taxonomy)} tags")
+
+    snapshot.update(version=CACHE_VERSION, mtime_ns=st.st_mtime_ns, size=st.st_size)
+    blob = _write_snapshot(cache_file, snapshot, logger)
+    _memory[key] = (st.st_mtime_ns, st.st_size, blob)
+
+    for warning in snapshot["warnings"]:
+        logger.warning(warning)
+
+    return json.loads(blob)["taxonomy"]
+
+
+def clear_memory_cache():
+    """Forget in-process snapshots (the file cache is kept)"""
+    _memory.clear()
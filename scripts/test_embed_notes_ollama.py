@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Test Ollama Embedder Against a Stub Server
+
+Runs OllamaEmbedder against a local stub of the Ollama HTTP API (no Ollama or
+model needed) and checks:
+  - /api/embed batching (no request exceeds batch_size, every chunk embedded once)
+  - the concurrency limit (requests in flight never exceed `concurrency`,
+    also when a whole folder is embedded)
+  - fallback to /api/embeddings when /api/embed returns 404
+  - retry of 5xx responses
+
+Usage:
+    python scripts/test_embed_notes_ollama.py
+    python -m pytest scripts/test_embed_notes_ollama.py
+"""
+
+import hashlib
+import json
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from embed_notes_ollama import OllamaEmbedder
+
+DIM = 8
+
+
+def stub_vector(text: str):
+    digest = hashlib.sha256(text.encode('utf-8')).digest()
+    return [b / 255 for b in digest[:DIM]]
+
+
+class StubOllama:
+    """Threaded stub of /api/embed and /api/embeddings that records traffic"""
+
+    def __init__(self, legacy: bool = False, failures: int = 0, delay: float = 0.02):
+        self.legacy = legacy          # /api/embed answers 404 (Ollama < 0.2)
+        self.failures = failures      # first N requests answer 503
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.requests = []            # (endpoint, number of inputs, status)
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with stub.lock:
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                    fail = stub.failures > 0
+                    if fail:
+                        stub.failures -= 1
+                try:
+                    time.sleep(stub.delay)
+                    status, payload = stub.respond(self.path, body, fail)
+                finally:
+                    with stub.lock:
+                        stub.in_flight -= 1
+
+                data = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def respond(self, path: str, body: dict, fail: bool):
+        inputs = body.get("input") if path == "/api/embed" else [body.get("prompt")]
+        if fail:
+            status, payload = 503, {"error": "overloaded"}
+        elif path == "/api/embed" and not self.legacy:
+            status, payload = 200, {"embeddings": [stub_vector(t) for t in inputs]}
+        elif path == "/api/embeddings":
+            status, payload = 200, {"embedding": stub_vector(inputs[0])}
+        else:
+            status, payload = 404, {"error": "not found"}
+
+        with self.lock:
+            self.requests.append((path, len(inputs), status))
+        return status, payload
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def make_vault(files: int = 6, paragraphs: int = 12) -> Path:
+    """Temporary vault with notes long enough to split into several chunks"""
+    vault = Path(tempfile.mkdtemp(prefix="embed-stub-"))
+    notes = vault / "notes"
+    notes.mkdir()
+    for n in range(files):
+        text = "\n\n".join(
+            f"Paragraph {p} of note {n}. " + "Some words about embeddings and vaults. " * 6
+            for p in range(paragraphs)
+        )
+        (notes / f"note-{n}.md").write_text(text, encoding='utf-8')
+    return vault
+
+
+def run_folder(stub: StubOllama, batch_size: int = 4, concurrency: int = 3):
+    vault = make_vault()
+    embedder = OllamaEmbedder(str(vault), stub.url, batch_size=batch_size,
+                              concurrency=concurrency, output="binary", retry_backoff=0.01)
+    try:
+        stats = embedder.embed_folder(vault / "notes")
+        chunks = sum(
+            len(embedder.chunk_text(f.read_text(encoding='utf-8'), str(f)))
+            for f in (vault / "notes").glob("*.md")
+        )
+        return embedder, stats, chunks
+    finally:
+        embedder.close()
+        shutil.rmtree(vault, ignore_errors=True)
+
+
+def test_batching():
+    with StubOllama() as stub:
+        embedder, stats, chunks = run_folder(stub, batch_size=4)
+
+    sizes = [n for path, n, status in stub.requests if path == "/api/embed"]
+    assert all(path == "/api/embed" for path, _, _ in stub.requests)
+    assert max(sizes) <= 4
+    assert sum(sizes) == chunks
+    assert stats["chunks_embedded"] == chunks
+    assert len(embedder.store.entries) == chunks
+
+
+def test_concurrency_limit():
+    with StubOllama(delay=0.05) as stub:
+        run_folder(stub, batch_size=2, concurrency=3)
+
+    assert stub.max_in_flight <= 3, stub.max_in_flight
+    assert stub.max_in_flight >= 2, "requests were not pipelined"
+
+
+def test_legacy_fallback():
+    with StubOllama(legacy=True) as stub:
+        _, stats, chunks = run_folder(stub)
+
+    embed_calls = [r for r in stub.requests if r[0] == "/api/embed"]
+    legacy_calls = [r for r in stub.requests if r[0] == "/api/embeddings"]
+    assert len(embed_calls) <= 3  # probed until the first 404 is seen
+    assert len(legacy_calls) == chunks
+    assert stats["chunks_embedded"] == chunks
+
+
+def test_retry():
+    with StubOllama(failures=2) as stub:
+        _, stats, chunks = run_folder(stub)
+
+    assert sum(1 for r in stub.requests if r[2] == 503) == 2
+    assert stats["chunks_embedded"] == chunks
+    assert stats["files_failed"] == 0
+
+
+def main():
+    tests = [test_batching, test_concurrency_limit, test_legacy_fallback, test_retry]
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            print(f"[OK] {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"[X] {test.__name__}: {e}")
+
+    print(f"\n{len(tests) - failed}/{len(tests)} passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
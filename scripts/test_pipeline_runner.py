@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test Pipeline Runner Metric Updates
+
+Drains a one-conversation queue in a temporary vault and checks that the
+run's result moves the conversation metrics (count, conversation days, recent
+activity) in the metric aggregates, not only the tag note counters.
+
+Usage:
+    python scripts/test_pipeline_runner.py
+    python -m pytest scripts/test_pipeline_runner.py
+"""
+
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from metric_aggregates import MetricAggregates
+from pipeline_runner import PipelineRunner
+
+REPO = Path(__file__).parent.parent
+KEY = "conversation_20990101_runner.md"
+
+RAW = """---
+created: 2099-01-01
+topics: ['Python', 'Redis']
+---
+
+10:00 I used Python for the ingestion pipeline and Python handled the load well in testing.
+
+10:20 I used Redis for the ingestion pipeline and Redis handled the load well in testing.
+"""
+
+NODE = """---
+type: conversation
+title: Runner test
+created: 2099-01-01
+tags: [python, redis]
+---
+
+# Runner test
+"""
+
+
+def make_vault() -> Path:
+    vault = Path(tempfile.mkdtemp(prefix="pipeline-runner-"))
+    (vault / "_system").mkdir()
+    shutil.copy(REPO / "_system" / "tag-taxonomy.md", vault / "_system" / "tag-taxonomy.md")
+    (vault / "00-Inbox" / "raw-conversations").mkdir(parents=True)
+    (vault / "00-Inbox" / "processed").mkdir(parents=True)
+    return vault
+
+
+def test_queue_drain_updates_conversation_metrics():
+    vault = make_vault()
+    try:
+        aggregates = MetricAggregates(vault)
+        aggregates.rebuild()
+        assert aggregates.total("conversations") == 0
+        aggregates.close()
+
+        # The agent has written the conversation note; the runner finishes the raw file
+        (vault / "00-Inbox" / "processed" / KEY).write_text(NODE, encoding='utf-8')
+        raw = vault / "00-Inbox" / "raw-conversations" / f"processing_{KEY}"
+        raw.write_text(RAW, encoding='utf-8')
+
+        summary = PipelineRunner(vault, workers=1).run([raw], journal=False)
+        assert summary["completed"] == 1, summary
+
+        aggregates = MetricAggregates(vault)
+        try:
+            assert aggregates.total("conversations") == 1
+            assert aggregates.expand("conversation_day") == [("2099-01-01", 1)]
+            assert [row["title"] for row in aggregates.recent_conversations(5)] == ["Runner test"]
+            assert aggregates.total("tag_notes") == 2
+        finally:
+            aggregates.close()
+    finally:
+        shutil.rmtree(vault, ignore_errors=True)
+
+
+def main():
+    tests = [test_queue_drain_updates_conversation_metrics]
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            print(f"[OK] {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"[X] {test.__name__}: {e}")
+
+    print(f"\n{len(tests) - failed}/{len(tests)} passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
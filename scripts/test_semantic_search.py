@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test Semantic Search Over float32 and float16 Stores
+
+Writes the same seeded random vectors into a float32 and a float16 vector
+store and checks that SemanticSearch (query embedder stubbed, no Ollama):
+  - opens each store in the precision recorded in vectors.json
+  - returns the same top hits from both, per chunk and per note
+
+Usage:
+    python scripts/test_semantic_search.py
+    python -m pytest scripts/test_semantic_search.py
+"""
+
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from semantic_search import SemanticSearch, np
+from vector_store import VectorStore
+
+DIM = 64
+NOTES = 40
+CHUNKS = 5
+MODEL = "stub-embed"
+
+
+def make_vectors(seed: int = 7):
+    """{key: (path, lines, vector)} with one random vector per chunk"""
+    rng = np.random.default_rng(seed)
+    vectors = {}
+    for n in range(NOTES):
+        for c in range(CHUNKS):
+            key = f"note-{n}.md#{c}"
+            vectors[key] = (f"notes/note-{n}.md", [c * 10 + 1, c * 10 + 10],
+                            rng.standard_normal(DIM).tolist())
+    return vectors
+
+
+def make_search(vault: Path, dtype: str, vectors) -> SemanticSearch:
+    store_dir = vault / dtype
+    store = VectorStore(store_dir, MODEL, dtype=dtype)
+    for key, (path, lines, vector) in vectors.items():
+        store.add(key, path, lines, vector)
+    store.flush()
+    return SemanticSearch(vault, embed_fn=lambda text: None, model=MODEL, store_dir=store_dir)
+
+
+def queries(vectors, count: int = 10, seed: int = 11):
+    """Stored vectors plus a little noise, so each query has a clear best hit"""
+    rng = np.random.default_rng(seed)
+    keys = sorted(vectors)
+    for i in rng.choice(len(keys), count, replace=False):
+        vector = np.asarray(vectors[keys[i]][2]) + 0.3 * rng.standard_normal(DIM)
+        yield keys[i], vector.tolist()
+
+
+def with_stores(check):
+    vault = Path(tempfile.mkdtemp(prefix="semantic-search-"))
+    try:
+        vectors = make_vectors()
+        check(vectors, make_search(vault, "float32", vectors), make_search(vault, "float16", vectors))
+    finally:
+        shutil.rmtree(vault, ignore_errors=True)
+
+
+def test_float16_store_loads():
+    def check(vectors, full, half):
+        half.load()
+        assert half.store.dtype == "float16", half.store.dtype
+        assert len(half.store.entries) == len(vectors)
+        assert VectorStore.stored_dtype(full.store_dir) == "float32"
+
+    with_stores(check)
+
+
+def test_same_top_hits():
+    def check(vectors, full, half):
+        for expected, vector in queries(vectors):
+            hits32 = full.search_vector(vector, k=5)
+            hits16 = half.search_vector(vector, k=5)
+            assert hits32[0]["key"] == expected
+            assert [h["key"] for h in hits16] == [h["key"] for h in hits32], expected
+            for a, b in zip(hits16, hits32):
+                assert abs(a["score"] - b["score"]) < 1e-2
+
+    with_stores(check)
+
+
+def test_same_top_notes():
+    def check(vectors, full, half):
+        for _, vector in queries(vectors):
+            notes32 = [h["path"] for h in full.search_vector(vector, k=5, by_note=True)]
+            notes16 = [h["path"] for h in half.search_vector(vector, k=5, by_note=True)]
+            assert notes16 == notes32
+
+    with_stores(check)
+
+
+def main():
+    tests = [test_float16_store_loads, test_same_top_hits, test_same_top_notes]
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            print(f"[OK] {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"[X] {test.__name__}: {e}")
+
+    print(f"\n{len(tests) - failed}/{len(tests)} passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
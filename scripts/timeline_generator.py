@@ -4,12 +4,12 @@ Timeline Generator
 Generates chronological timelines of conversations and knowledge growth
 """
 
-import re
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple
 from collections import defaultdict
 from logger_setup import get_logger, TimedOperation
+from vault_index import VaultIndex
 
 
 class TimelineGenerator:
@@ -18,6 +18,7 @@ class TimelineGenerator:
     def __init__(self, vault_path: Path):
         self.vault_path = Path(vault_path)
         self.logger = get_logger(__name__, str(vault_path))
+        self.index = VaultIndex(self.vault_path)
 
     def generate_full_timeline(self, output_file: Path = None) -> str:
         """Generate complete timeline of all conversations"""
@@ -257,85 +258,29 @@ class TimelineGenerator:
     def _collect_conversations(self) -> List[Dict]:
         """Collect all conversations with metadata"""
         conversations = []
-        processed_dir = self.vault_path / "00-Inbox" / "processed"
-
-        if not processed_dir.exists():
-            return []
-
-        for conv_file in processed_dir.glob("*.md"):
-            try:
-                with open(conv_file, 'r', encoding='utf-8') as f:
-                    content = f.read(1500)
-
-                # Extract frontmatter
-                fm_match = re.match(r'^---\n(.*?)\n---', content, re.DOTALL)
-                if not fm_match:
-                    continue
-
-                frontmatter = fm_match.group(1)
-
-                # Extract fields
-                title_match = re.search(r'^title:\s*"?(.+?)"?$', frontmatter, re.MULTILINE)
-                date_match = re.search(r'created:\s*(\d{4}-\d{2}-\d{2})', frontmatter)
-                entities_match = re.search(r'entities:\s*\[(.*?)\]', frontmatter, re.DOTALL)
-                tags_match = re.search(r'tags:\s*\[(.*?)\]', frontmatter)
-
-                if not date_match:
-                    continue
-
-                # Parse entities
-                entities = []
-                if entities_match:
-                    entity_str = entities_match.group(1)
-                    entities = [e.strip().strip('"').strip("'") for e in entity_str.split(',') if e.strip()]
-
-                # Parse tags
-                tags = []
-                if tags_match:
-                    tag_str = tags_match.group(1)
-                    tags = [t.strip().strip('"').strip("'") for t in tag_str.split(',') if t.strip()]
-
-                conversations.append({
-                    "title": title_match.group(1) if title_match else conv_file.stem,
-                    "date": datetime.strptime(date_match.group(1), "%Y-%m-%d"),
-                    "entities": entities,
-                    "tags": tags,
-                    "file_name": conv_file.name,
-                    "file_path": str(conv_file.relative_to(self.vault_path))
-                })
-
-            except Exception as e:
-                self.logger.warning(f"Failed to parse {conv_file.name}: {e}")
 
-        return conversations
-
-    def _get_entities_by_area(self, area: str) -> List[str]:
-        """Get all entity names in a specific area"""
-        entities = []
-
-        for md_file in self.vault_path.rglob("*.md"):
-            if any(part in md_file.parts for part in ["00-Inbox", "_system", ".obsidian"]):
+        for conv in self.index.conversations():
+            if not conv["created"]:
                 continue
 
-            try:
-                with open(md_file, 'r', encoding='utf-8') as f:
-                    content = f.read(500)
-
-                    if 'type: tag-note' not in content:
-                        continue
+            conv_file = conv["path"]
+            conversations.append({
+                "title": conv["title"],
+                "date": datetime.strptime(conv["created"], "%Y-%m-%d"),
+                "entities": conv["entities"],
+                "tags": conv["tags"],
+                "file_name": conv_file.name,
+                "file_path": str(conv_file.relative_to(self.vault_path))
+            })
 
-                    root_match = re.search(r'root:\s*(\w+)', content)
-                    if not root_match or root_match.group(1) != area:
-                        continue
-
-                    tag_match = re.search(r'^tag:\s*(.+)$', content, re.MULTILINE)
-                    if tag_match:
-                        entities.append(tag_match.group(1).strip())
-
-            except:
-                pass
+        return conversations
 
-        return entities
+    def _get_entities_by_area(self, area: str) -> List[str]:
+        """Get all entity names in a specific area"""
+        return [
+            note["tag"] for note in self.index.tag_notes()
+            if note["root"] == area and note["tag"]
+        ]
 
 
 def main():
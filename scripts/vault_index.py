@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Vault Index
+Persistent metadata index of tag notes and conversations backed by SQLite.
+
+Every analytics script used to walk the vault and regex-grep the head of each
+markdown file. The index stores parsed frontmatter keyed by (path, mtime, size)
+in _system/vault-index.db so only new or changed files are re-read.
+"""
+
+import os
+import json
+import re
+import sqlite3
+from pathlib import Path
+from datetime import date, datetime
+from typing import Dict, List, Optional
+
+try:
+    from scripts.logger_setup import get_logger, TimedOperation
+    from scripts.frontmatter_parser import read_header
+except ImportError:
+    from logger_setup import get_logger, TimedOperation
+    from frontmatter_parser import read_header
+
+
+SKIP_DIRS = ["00-Inbox", "_system", ".obsidian"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    frontmatter TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_files_kind ON files(kind);
+"""
+
+
+def _to_json(value):
+    """JSON fallback for YAML scalars (dates, datetimes)"""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+def _as_list(value) -> List[str]:
+    """Normalize a scalar/list frontmatter value to a list of strings"""
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple, set)):
+        return [str(v).strip() for v in value if v is not None and str(v).strip()]
+    return [v.strip().strip('"').strip("'") for v in str(value).split(',') if v.strip()]
+
+
+def _as_date(value) -> Optional[str]:
+    """Normalize a frontmatter date to YYYY-MM-DD"""
+    if isinstance(value, (date, datetime)):
+        return value.strftime("%Y-%m-%d")
+    if value:
+        match = re.match(r'\s*(\d{4}-\d{2}-\d{2})', str(value))
+        if match:
+            return match.group(1)
+    return None
+
+
+def _as_number(value, cast, default):
+    try:
+        return cast(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def build_record(path: Path, kind: str, frontmatter: Dict) -> Dict:
+    """Build the normalized record exposed to analytics scripts"""
+    title = frontmatter.get("title")
+    depth = frontmatter.get("depth")
+
+    return {
+        "path": path,
+        "kind": kind,
+        "frontmatter": frontmatter,
+        "tag": str(frontmatter["tag"]).strip() if frontmatter.get("tag") is not None else None,
+        "root": str(frontmatter["root"]).strip() if frontmatter.get("root") else None,
+        "depth": _as_number(depth, int, None) if depth is not None else None,
+        "created": _as_date(frontmatter.get("created")),
+        "total_conversations": _as_number(frontmatter.get("total_conversations"), int, 0),
+        "total_time_minutes": _as_number(frontmatter.get("total_time_minutes"), float, 0.0),
+        "parent_tags": _as_list(frontmatter.get("parent_tags")),
+        "entities": _as_list(frontmatter.get("entities")),
+        "tags": _as_list(frontmatter.get("tags")),
+        "title": str(title) if title else path.stem,
+    }
+
+
+class VaultIndex:
+    """Incrementally maintained index of vault frontmatter"""
+
+    def __init__(self, vault_path: Path, db_path: Path = None):
+        self.vault_path = Path(vault_path)
+        self.logger = get_logger(__name__, str(vault_path))
+        self.processed_dir = self.vault_path / "00-Inbox" / "processed"
+
+        if db_path is None:
+            db_path = self.vault_path / "_system" / "vault-index.db"
+
+        self.db_path = Path(db_path)
+        self._records = None
+        self._by_tag = {}
+
+    def _connect(self) -> sqlite3.Connection:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.db_path))
+        conn.executescript(SCHEMA)
+        return conn
+
+    def walk(self) -> Dict[str, tuple]:
+        """Stat every markdown file of interest without opening it"""
+        found = {}
+
+        for dirpath, dirnames, filenames in os.walk(self.vault_path):
+            dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+            for name in filenames:
+                if name.endswith(".md"):
+                    full = os.path.join(dirpath, name)
+                    found[full] = ("note", os.stat(full))
+
+        if self.processed_dir.exists():
+            with os.scandir(self.processed_dir) as entries:
+                for entry in entries:
+                    if entry.is_file() and entry.name.endswith(".md"):
+                        found[entry.path] = ("conversation", entry.stat())
+
+        return found
+
+    def refresh(self, rebuild: bool = False) -> Dict[str, int]:
+        """
+        Bring the index up to date with the vault
+
+        Args:
+            rebuild: Drop all cached rows and re-parse every file
+
+        Returns:
+            Counts of scanned, parsed and removed files
+        """
+        stats = {"scanned": 0, "parsed": 0, "removed": 0}
+
+        with TimedOperation(self.logger, "Refreshing vault index"):
+            conn = self._connect()
+            try:
+                if rebuild:
+                    conn.execute("DELETE FROM files")
+
+                known = {
+                    row[0]: (row[1], row[2])
+                    for row in conn.execute("SELECT path, mtime, size FROM files")
+                }
+                found = self.walk()
+                stats["scanned"] = len(found)
+
+                updates = []
+                for full, (kind, st) in found.items():
+                    if known.get(full) == (st.st_mtime, st.st_size):
+                        continue
+
+                    try:
+                        header = read_header(Path(full))
+                        frontmatter = header.data
+                        if header.error:
+                            self.logger.warning(f"Failed to parse {full}: {header.error}")
+                    except (OSError, UnicodeDecodeError) as e:
+                        self.logger.warning(f"Failed to parse {full}: {e}")
+                        frontmatter = {}
+
+                    if kind == "note" and frontmatter.get("type") == "tag-note":
+                        kind = "tag-note"
+
+                    updates.append((
+                        full, kind, st.st_mtime, st.st_size,
+                        json.dumps(frontmatter, default=_to_json)
+                    ))
+
+                removed = [(p,) for p in known if p not in found]
+
+                conn.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)", updates)
+                conn.executemany("DELETE FROM files WHERE path = ?", removed)
+                conn.commit()
+
+                stats["parsed"] = len(updates)
+                stats["removed"] = len(removed)
+
+                self._records = {"tag-note": [], "conversation": []}
+                for path, kind, fm_json in conn.execute(
+                    "SELECT path, kind, frontmatter FROM files "
+                    "WHERE kind IN ('tag-note', 'conversation') ORDER BY path"
+                ):
+                    self._records[kind].append(build_record(Path(path), kind, json.loads(fm_json)))
+
+                self._by_tag = {}
+                for record in self._records["tag-note"]:
+                    if record["tag"] is not None:
+                        self._by_tag.setdefault(record["tag"], record)
+            finally:
+                conn.close()
+
+        self.logger.info(
+            f"Vault index: {stats['scanned']} scanned, {stats['parsed']} parsed, "
+            f"{stats['removed']} removed"
+        )
+        return stats
+
+    def _ensure_fresh(self):
+        if self._records is None:
+            self.refresh()
+
+    def tag_notes(self) -> List[Dict]:
+        """All tag note records"""
+        self._ensure_fresh()
+        return self._records["tag-note"]
+
+    def conversations(self) -> List[Dict]:
+        """All processed conversation records"""
+        self._ensure_fresh()
+        return self._records["conversation"]
+
+    def get_tag_note(self, tag: str) -> Optional[Dict]:
+        """Tag note record for a tag name"""
+        self._ensure_fresh()
+        return self._by_tag.get(tag)
+
+    def find_tag_note(self, tag: str) -> Optional[Path]:
+        """Tag note file for a tag name"""
+        record = self.get_tag_note(tag)
+        return record["path"] if record else None
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Vault metadata index")
+    parser.add_argument("--vault", type=str, default="C:/obsidian-memory-vault",
+                       help="Path to vault")
+    parser.add_argument("--rebuild", action="store_true",
+                       help="Discard cached rows and re-parse every file")
+
+    args = parser.parse_args()
+
+    index = VaultIndex(Path(args.vault))
+    stats = index.refresh(rebuild=args.rebuild)
+
+    print(f"\n[OK] Vault Index Refreshed")
+    print(f"   Scanned: {stats['scanned']}")
+    print(f"   Parsed: {stats['parsed']}")
+    print(f"   Removed: {stats['removed']}")
+    print(f"   Tag notes: {len(index.tag_notes())}")
+    print(f"   Conversations: {len(index.conversations())}")
+    print(f"   Database: {index.db_path}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Vector Store
+Compact binary store for note embeddings.
+
+Vectors are appended as raw little-endian float32 (or float16) rows to
+vectors.bin; vectors.json maps each Smart Connections key to its row, note
+path and line span. Readers memory-map vectors.bin instead of parsing one
+.ajson file per chunk. Rows of replaced chunks stay in the file until the
+next compaction.
+"""
+
+import json
+import struct
+import threading
+from pathlib import Path
+from typing import List, Optional
+
+try:
+    from scripts.atomic_write import atomic_open, write_json
+except ImportError:
+    from atomic_write import atomic_open, write_json
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+DTYPES = {"float32": "f", "float16": "e"}
+
+
+class VectorStore:
+    """Append-only memory-mappable embedding matrix with a key/row table"""
+
+    def __init__(self, store_dir: Path, model: str, dtype: str = "float32"):
+        if dtype not in DTYPES:
+            raise ValueError(f"Unsupported dtype: {dtype} (expected one of {sorted(DTYPES)})")
+
+        self.store_dir = Path(store_dir)
+        self.model = model
+        self.dtype = dtype
+        self.data_file = self.store_dir / "vectors.bin"
+        self.table_file = self.store_dir / "vectors.json"
+
+        self._format = "<{}" + DTYPES[dtype]
+        self._itemsize = struct.calcsize("<" + DTYPES[dtype])
+        self._lock = threading.RLock()
+        self._dirty = False
+
+        self.dim = None
+        self.rows = 0
+        self.generation = 0  # bumped whenever compaction renumbers rows
+        self.entries = {}
+
+        self._load()
+
+    @staticmethod
+    def stored_dtype(store_dir: Path, default: str = "float32") -> str:
+        """Precision recorded in an existing store's vectors.json (default if none)"""
+        table_file = Path(store_dir) / "vectors.json"
+        try:
+            with open(table_file, 'r', encoding='utf-8') as f:
+                dtype = json.load(f).get("dtype")
+        except (OSError, ValueError):
+            return default
+        return dtype if dtype in DTYPES else default
+
+    @classmethod
+    def open(cls, store_dir: Path, model: str) -> "VectorStore":
+        """Open an existing store for reading in whatever precision it was written"""
+        return cls(store_dir, model, dtype=cls.stored_dtype(store_dir))
+
+    def _load(self):
+        """Read the key table; a model or dtype change starts a fresh store"""
+        if not self.table_file.exists():
+            return
+
+        with open(self.table_file, 'r', encoding='utf-8') as f:
+            table = json.load(f)
+
+        if table.get("model") != self.model or table.get("dtype") != self.dtype:
+            return
+
+        self.dim = table.get("dim")
+        self.rows = table.get("rows", 0)
+        self.generation = table.get("generation", 0)
+        self.entries = table.get("entries", {})
+
+        # Drop rows appended after the last flush (e.g. an interrupted run)
+        expected = self.rows * (self.dim or 0) * self._itemsize
+        if self.data_file.exists() and self.data_file.stat().st_size > expected:
+            with open(self.data_file, 'r+b') as f:
+                f.truncate(expected)
+
+    @property
+    def row_bytes(self) -> int:
+        return self.dim * self._itemsize
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def add(self, key: str, path: str, lines: List[int], vector: List[float]):
+        """Append a vector (replaces any earlier vector for the key)"""
+        with self._lock:
+            if self.dim is None:
+                self.dim = len(vector)
+                if self.data_file.exists() and not self.entries:
+                    self.data_file.unlink()
+            elif len(vector) != self.dim:
+                raise ValueError(f"Vector dimension {len(vector)} != store dimension {self.dim}")
+
+            self.store_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.data_file, 'ab') as f:
+                f.write(struct.pack(self._format.format(self.dim), *vector))
+
+            self.entries[key] = {"row": self.rows, "path": path, "lines": lines}
+            self.rows += 1
+            self._dirty = True
+
+    def retain_path(self, path: str, keys) -> int:
+        """
+        Forget rows of a note that are not in `keys` (chunks that changed)
+
+        Returns:
+            Number of entries removed
+        """
+        keys = set(keys)
+        with self._lock:
+            stale = [k for k, e in self.entries.items() if e["path"] == path and k not in keys]
+            for k in stale:
+                del self.entries[k]
+            if stale:
+                self._dirty = True
+            return len(stale)
+
+    def flush(self):
+        """Persist the key table, compacting when most rows are dead"""
+        with self._lock:
+            if not self._dirty:
+                return
+
+            if self.rows > 2 * len(self.entries):
+                self._compact()
+
+            table = {
+                "model": self.model,
+                "dtype": self.dtype,
+                "dim": self.dim,
+                "rows": self.rows,
+                "generation": self.generation,
+                "entries": self.entries
+            }
+
+            self.store_dir.mkdir(parents=True, exist_ok=True)
+            write_json(self.table_file, table, separators=(",", ":"))
+            self._dirty = False
+
+    def _compact(self):
+        """Rewrite vectors.bin with live rows only"""
+        ordered = sorted(self.entries.items(), key=lambda item: item[1]["row"])
+        new_rows = {}
+
+        # The source is closed before the temp file replaces it (Windows)
+        with atomic_open(self.data_file) as dst:
+            with open(self.data_file, 'rb') as src:
+                for new_row, (key, entry) in enumerate(ordered):
+                    src.seek(entry["row"] * self.row_bytes)
+                    dst.write(src.read(self.row_bytes))
+                    new_rows[key] = new_row
+
+        # Renumber only once the compacted file is in place
+        for key, new_row in new_rows.items():
+            self.entries[key]["row"] = new_row
+        self.rows = len(ordered)
+        self.generation += 1
+
+    def get(self, key: str) -> Optional[List[float]]:
+        """Vector for one key"""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+
+        with open(self.data_file, 'rb') as f:
+            f.seek(entry["row"] * self.row_bytes)
+            return list(struct.unpack(self._format.format(self.dim), f.read(self.row_bytes)))
+
+    def matrix(self):
+        """
+        Zero-copy view of every stored row (requires numpy)
+
+        Index it with entries[key]["row"]; rows not referenced by any entry
+        are stale.
+        """
+        if np is None:
+            raise ImportError("numpy is required for VectorStore.matrix()")
+
+        if not self.rows or not self.data_file.exists():
+            return np.zeros((0, self.dim or 0), dtype=self.dtype)
+
+        return np.memmap(self.data_file, dtype=np.dtype(self.dtype).newbyteorder("<"),
+                         mode='r', shape=(self.rows, self.dim))